@@ -0,0 +1,139 @@
+"""Archival of past and soft-deleted reservations.
+
+The job moves reservations that ended more than 'ARCHIVE_AFTER_DAYS'
+days ago and reservations soft-deleted more than
+'ARCHIVE_DELETED_AFTER_DAYS' days ago from 'reservations' into
+'reservations_archive'. Each batch is a single 'DELETE ... RETURNING'
+feeding an 'INSERT ... SELECT' in its own transaction, so the hot table,
+its indexes and the overlap constraint only hold current reservations.
+
+With 'ARCHIVE_ENABLED' the read paths consult the archive as well:
+single lookups fall back to it, and list queries add it whenever the
+requested range can contain archived rows (see 'list_needs_archive').
+Run the job with 'flask --app run archive-reservations', e.g. as a
+Kubernetes CronJob.
+"""
+
+from datetime import date, timedelta
+from typing import Optional
+
+import click
+from flask import Flask
+from sqlalchemy import delete, insert, literal, or_, select
+
+from .config import Config
+from .helpers import Helpers
+from .models import Reservation, ReservationArchive, db
+
+
+def archive_cutoff(today: Optional[date] = None) -> date:
+    """Return the date before which ended reservations are archived."""
+    return (today or date.today()) - timedelta(days=Config.ARCHIVE_AFTER_DAYS)
+
+
+def list_needs_archive(include_deleted: bool, after: Optional[date]) -> bool:
+    """Return whether a list query can match archived rows.
+
+    Archived active reservations ended before the cutoff of their run,
+    which is never later than today's cutoff. They cannot match a query
+    with 'after' at or beyond today's cutoff. Archived soft-deleted rows
+    only matter with 'include_deleted'.
+    """
+    if not Config.ARCHIVE_ENABLED:
+        return False
+    return include_deleted or after is None or after < archive_cutoff()
+
+
+def unarchive(archived: ReservationArchive) -> Reservation:
+    """Return a new 'Reservation' with the columns of the archived row.
+
+    Used to restore archived soft-deleted reservations: the caller deletes
+    'archived' and adds the result in the same transaction, so the row is
+    moved back into 'reservations' (and under the overlap constraint).
+    """
+    return Reservation(
+        id=archived.id, room_id=archived.room_id, start_date=archived.start_date,
+        end_date=archived.end_date, deleted_at=archived.deleted_at,
+    )
+
+
+def archive_batch(batch_size: int) -> int:
+    """Move one batch of archivable reservations and commit.
+
+    Rows locked by concurrent requests are skipped ('SKIP LOCKED') and
+    picked up by a later run. The batch runs without the request
+    'statement_timeout' (see 'Helpers.set_maintenance_timeout').
+
+    Returns:
+        int: The number of moved reservations.
+    """
+    deleted_cutoff = Helpers.get_current_time() - timedelta(days=Config.ARCHIVE_DELETED_AFTER_DAYS)
+    candidates = (
+        select(Reservation.id)
+        .where(or_(
+            Reservation.end_date <= archive_cutoff(),
+            Reservation.deleted_at < deleted_cutoff,
+        ))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(Reservation)
+        .where(Reservation.id.in_(candidates.scalar_subquery()))
+        .returning(
+            Reservation.id, Reservation.room_id, Reservation.start_date,
+            Reservation.end_date, Reservation.deleted_at,
+        )
+        .cte("moved")
+    )
+    stmt = insert(ReservationArchive).from_select(
+        ["id", "room_id", "from", "to", "deleted_at", "archived_at"],
+        select(
+            moved.c.id, moved.c.room_id, moved.c.start_date, moved.c.end_date, moved.c.deleted_at,
+            literal(Helpers.get_current_time(), ReservationArchive.archived_at.type),
+        ),
+    )
+    Helpers.set_maintenance_timeout()
+    count = db.session.execute(stmt).rowcount
+    db.session.commit()
+    return count
+
+
+def archive_reservations(batch_size: int, max_batches: Optional[int] = None) -> int:
+    """Run 'archive_batch' until nothing is left (or 'max_batches' ran).
+
+    Returns:
+        int: The total number of moved reservations.
+    """
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        count = archive_batch(batch_size)
+        total += count
+        batches += 1
+        if count < batch_size:
+            break
+    return total
+
+
+def init_app(app: Flask) -> None:
+    """Register the 'archive-reservations' CLI command.
+
+    Args:
+        app: The Flask application.
+    """
+
+    @app.cli.command("archive-reservations")
+    @click.option("--batch-size", type=int, default=None, help="Rows per transaction (default: ARCHIVE_BATCH_SIZE).")
+    @click.option("--max-batches", type=int, default=None, help="Stop after this many batches.")
+    def archive_reservations_command(batch_size: Optional[int], max_batches: Optional[int]) -> None:
+        """Move past and soft-deleted reservations into the archive."""
+        if not Config.ARCHIVE_ENABLED:
+            raise click.ClickException("ARCHIVE_ENABLED is not set; reads would not find archived reservations.")
+        moved = archive_reservations(batch_size or Config.ARCHIVE_BATCH_SIZE, max_batches)
+        app.logger.info("Reservations archived", extra={
+            "event.action": "archive_reservations",
+            "archive.moved": moved,
+            "service.name": "reservations-api"
+        })
+        click.echo(f"Archived {moved} reservations")
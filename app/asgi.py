@@ -0,0 +1,641 @@
+"""Asynchronous (ASGI) entrypoint.
+
+'create_asgi_app()' builds a Starlette application that serves the
+health endpoints and the reservation CRUD endpoints with async route
+handlers on SQLAlchemy's asyncio extension (psycopg async driver), so a
+request waiting for Postgres does not hold a worker thread. All other
+paths (batch, availability, diagnostics, metrics, CORS preflights) are
+passed to the Flask application through a WSGI adapter.
+
+The handlers run inside a Flask application context and build their
+responses with the same helpers as 'app.routes' ('error_resp', the JSON
+provider, ETags, the reservation cache), so both entrypoints answer
+byte-identically. Run it with 'SERVER_MODE=asgi' or
+'uvicorn --factory app.asgi:create_asgi_app'.
+"""
+
+import asyncio
+import itertools
+import time
+import uuid
+from datetime import date
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from a2wsgi import WSGIMiddleware
+from flask import Flask, current_app, jsonify, make_response
+from flask import Response as FlaskResponse
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.http import parse_etags
+
+from . import create_app, queries
+from .archive import list_needs_archive, unarchive
+from .auth import verify_token
+from .cache import get_reservation_cache
+from .config import Config
+from .etags import collection_etag, page_etag, reservation_etag
+from .events import record_event_async
+from .helpers import Helpers
+from .metrics import AUTH_DURATION, HTTP_REQUEST_DURATION, instrument_engine
+from .models import Reservation, ReservationArchive
+from .replicas import WRITE_METHODS, is_sticky, mark_written
+from .routes import error_resp, get_liveness, get_status, validation_error_resp
+from .serialization import reservation_row
+from .validation import LIST_QUERY, RESERVATION_PROTOTYPE, ValidationError
+
+RESERVATIONS = "/api/v3/reservations/reservations"
+
+_replica_counter = itertools.count()
+
+
+class AsyncDatabaseHealth:
+    """Database check for the async entrypoint.
+
+    Instead of a background thread the check runs on demand, at most once
+    per 'interval' seconds. Probes arriving while the result is stale wait
+    for a single running check and share its result.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: float) -> None:
+        self.engine = engine
+        self.interval = interval
+        self._result: Optional[Tuple[bool, str, float]] = None
+        self._lock = asyncio.Lock()
+
+    def _is_stale(self, result: Optional[Tuple[bool, str, float]]) -> bool:
+        return result is None or time.monotonic() - result[2] > self.interval
+
+    async def database_status(self) -> Tuple[bool, str]:
+        """Return '(ready, message)' of the last database check."""
+        result = self._result
+        if self._is_stale(result):
+            async with self._lock:
+                # Ein anderer Probe hat den Check evtl. schon ausgeführt
+                result = self._result
+                if self._is_stale(result):
+                    result = await self.check()
+        return result[0], result[1]
+
+    async def readiness(self) -> Tuple[bool, str]:
+        """Return '(ready, message)' including pool saturation."""
+        ready, message = await self.database_status()
+        if not ready:
+            return ready, message
+        if self.pool_saturated():
+            return False, "Connection pool saturated"
+        return True, ""
+
+    def pool_saturated(self) -> bool:
+        threshold = Config.HEALTH_POOL_SATURATION_THRESHOLD
+        if threshold <= 0:
+            return False
+        stats = Helpers.get_pool_stats(self.engine.pool)
+        capacity = stats["size"] + max(stats["max_overflow"], 0)
+        return capacity > 0 and stats["checked_out"] / capacity >= threshold
+
+    async def check(self) -> Tuple[bool, str, float]:
+        """Run the database check now and cache its result."""
+        try:
+            async with self.engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+            ready, message = True, ""
+        except Exception as e:
+            ready, message = False, str(e)
+        self._result = (ready, message, time.monotonic())
+        return self._result
+
+
+# --- HELPER ---
+
+def _to_asgi(request: Request, resp: FlaskResponse) -> Response:
+    """Convert a Flask response into a Starlette response.
+
+    The async routes bypass Flask-CORS, so the 'Access-Control-Allow-Origin'
+    header it would add for cross-origin requests is set here.
+    """
+    headers = dict(resp.headers)
+    if "origin" in request.headers:
+        headers["Access-Control-Allow-Origin"] = "*"
+    return Response(resp.get_data(), status_code=resp.status_code, headers=headers)
+
+
+def _route(rule: str, path: str, methods: list) -> Callable[..., Route]:
+    """Register an async handler for 'path' running in the Flask app context.
+
+    The handler returns a Flask response (or a Starlette response for
+    streams). The request duration is recorded under the Flask 'rule',
+    so '/metrics' uses the same labels for both entrypoints.
+    """
+    def decorator(handler: Callable[[Request], Awaitable[Any]]) -> Route:
+        @wraps(handler)
+        async def endpoint(request: Request) -> Response:
+            start = time.perf_counter()
+            with request.app.state.flask_app.app_context():
+                resp = await handler(request)
+                if isinstance(resp, FlaskResponse):
+                    if request.method in WRITE_METHODS and resp.status_code < 400:
+                        mark_written(resp)
+                    resp = _to_asgi(request, resp)
+            HTTP_REQUEST_DURATION.observe((request.method, rule, resp.status_code), time.perf_counter() - start)
+            return resp
+
+        return Route(path, endpoint, methods=methods)
+
+    return decorator
+
+
+def _log_error(message: str, action: str, error: Exception) -> uuid.UUID:
+    """Log 'error' with a new trace id like the synchronous routes do."""
+    logUUID = uuid.uuid4()
+    current_app.logger.error(message, extra={
+        "event.action": action,
+        "error.message": str(error),
+        "trace.id": logUUID,
+        "service.name": "reservations-api"
+    })
+    return logUUID
+
+
+def _not_modified(etag: str) -> FlaskResponse:
+    resp = make_response("", 304)
+    resp.set_etag(etag)
+    return resp
+
+
+def _cached_response(request: Request, entry: Dict[str, str]) -> FlaskResponse:
+    """Build a response (or '304') from a cached body and ETag."""
+    if parse_etags(request.headers.get("if-none-match")).contains_weak(entry["etag"]):
+        return _not_modified(entry["etag"])
+    resp = current_app.response_class(entry["body"], mimetype="application/json")
+    resp.set_etag(entry["etag"])
+    return resp
+
+
+def _check_if_match(request: Request, res: Any) -> Optional[FlaskResponse]:
+    if_match = parse_etags(request.headers.get("if-match"))
+    if if_match and not if_match.contains(reservation_etag(res)):
+        return error_resp("precondition_failed", "Precondition failed", str(uuid.uuid4()), 412, "The reservation has been modified (ETag mismatch).")
+    return None
+
+
+def _is_pinned(request: Request) -> bool:
+    """Async variant of 'replicas.is_pinned': skip the cache after own writes."""
+    return bool(request.app.state.replica_sessionmakers) and is_sticky(request.cookies)
+
+
+def _read_sessionmaker(request: Request) -> async_sessionmaker:
+    """Return the session factory for read-only queries (see 'app.replicas')."""
+    replicas = request.app.state.replica_sessionmakers
+    if not replicas or is_sticky(request.cookies):
+        return request.app.state.sessionmaker
+    return replicas[next(_replica_counter) % len(replicas)]
+
+
+async def _json_body(request: Request) -> Any:
+    """Return the parsed JSON body, or 'None' if it is missing or invalid."""
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+async def _authenticate(request: Request) -> Tuple[Optional[str], Optional[FlaskResponse]]:
+    """Verify the bearer token like 'require_auth'.
+
+    Signature checks and JWKS fetches block, so they run in the thread pool.
+
+    Returns:
+        The user id, or the 401 response to return.
+    """
+    token = request.headers.get("Authorization", "").replace("Bearer ", "")
+    flask_app = request.app.state.flask_app
+
+    def verify() -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+        with flask_app.app_context():
+            return verify_token(token)
+
+    start = time.perf_counter()
+    outcome, payload, error = await run_in_threadpool(verify)
+    AUTH_DURATION.observe((outcome,), time.perf_counter() - start)
+    if error is not None:
+        return None, make_response(jsonify({"errors": [{"code": "not_authorized", "message": error}]}), 401)
+    return payload.get("sub") or payload.get("preferred_username"), None
+
+
+async def _commit_or_overlap(session: AsyncSession, action: str, res: Any) -> Optional[FlaskResponse]:
+    """Record the change feed event, commit and map overlap violations to the "Overlap detected" error."""
+    try:
+        await record_event_async(session, action, res)
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if not Helpers.is_overlap_violation(e):
+            raise
+        return error_resp("bad_request", "Overlap detected", str(uuid.uuid4()), 400, "The requested reservation overlaps with an existing reservation.")
+    return None
+
+
+async def _get_archived(session: AsyncSession, res_id: uuid.UUID) -> Optional[Any]:
+    """Return the archived reservation 'res_id' if archiving is enabled."""
+    if not Config.ARCHIVE_ENABLED:
+        return None
+    return await session.get(ReservationArchive, res_id)
+
+
+def _parse_prototype(data: Any) -> Tuple[Optional[Tuple[uuid.UUID, Any, Any]], Optional[FlaskResponse]]:
+    """Validate a reservation prototype ('room_id', 'from', 'to')."""
+    try:
+        prototype = RESERVATION_PROTOTYPE.validate(data)
+    except ValidationError as e:
+        return None, validation_error_resp(e)
+    return (prototype["room_id"], prototype["from"], prototype["to"]), None
+
+
+# --- STATUS AND HEALTHCHECK ENDPOINTS ---
+
+@_route("/api/v3/reservations/status", "/api/v3/reservations/status", ["GET"])
+async def status(request: Request) -> FlaskResponse:
+    return get_status()
+
+
+@_route("/api/v3/reservations/health/live", "/api/v3/reservations/health/live", ["GET"])
+async def liveness(request: Request) -> FlaskResponse:
+    return get_liveness()
+
+
+@_route("/api/v3/reservations/health", "/api/v3/reservations/health", ["GET"])
+async def health(request: Request) -> FlaskResponse:
+    try:
+        readyness, db_error = await request.app.state.health.database_status()
+        if readyness:
+            return jsonify({"live": True, "ready": True, "databases": {"reservations": {"connected": True}}})
+        raise Exception("Database not reachable: " + db_error)
+    except Exception as e:
+        logUUID = _log_error("Health check failed", "health_check", e)
+        return error_resp("service_unavailable", "Database check failed", logUUID, 503, str(e))
+
+
+@_route("/api/v3/reservations/health/ready", "/api/v3/reservations/health/ready", ["GET"])
+async def readiness(request: Request) -> FlaskResponse:
+    try:
+        readyness, db_error = await request.app.state.health.readiness()
+        if readyness:
+            return jsonify({"ready": True})
+        raise Exception("Database not ready: " + db_error)
+    except Exception as e:
+        logUUID = _log_error("Readiness check failed", "health_check", e)
+        return error_resp("service_unavailable", "Readiness check failed", logUUID, 503, str(e))
+
+
+# --- RESERVATIONS ENDPOINTS ---
+
+@_route(RESERVATIONS, RESERVATIONS, ["GET"])
+async def list_reservations(request: Request) -> Any:
+    """Async variant of 'routes.get_reservations' (same parameters and responses)."""
+    args = request.query_params
+    try:
+        try:
+            filters = LIST_QUERY.validate(args)
+        except ValidationError as e:
+            return validation_error_resp(e)
+        include_deleted = filters["include_deleted"]
+        limit = args.get("limit")
+        cursor = args.get("cursor")
+        stream = args.get("stream", "false").lower() == "true"
+        if_none_match = parse_etags(request.headers.get("if-none-match"))
+
+        try:
+            if limit is not None:
+                limit = int(limit)
+                if not 1 <= limit <= Config.RESERVATIONS_PAGE_MAX_LIMIT:
+                    raise ValueError(f"limit must be between 1 and {Config.RESERVATIONS_PAGE_MAX_LIMIT}")
+            elif cursor and not stream:
+                limit = Config.RESERVATIONS_PAGE_DEFAULT_LIMIT
+            cursor_pos = Helpers.decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return error_resp("bad_request", "Invalid pagination parameters", str(uuid.uuid4()), 400, str(e))
+
+        # Vorab gebautes Statement je Filterkombination (app/queries.py)
+        params, shape, by_id = queries.list_params(filters)
+        with_archive = list_needs_archive(include_deleted, filters["after"])
+
+        sessionmaker = _read_sessionmaker(request)
+        from_replica = sessionmaker is not request.app.state.sessionmaker
+        async with sessionmaker() as session:
+            if limit is None and cursor_pos is None and not stream:
+                cache = get_reservation_cache()
+                room_ids = params.get("room_ids")
+                cache_room = room_ids[0] if room_ids and len(room_ids) == 1 and not by_id else None
+                # Key (Generation des Raums) vor der Abfrage bestimmen
+                cache_key = cache.room_list_key(cache_room, (include_deleted, filters["before"], filters["after"])) if cache_room else None
+                if cache_key and not _is_pinned(request):
+                    cached = cache.get_room_list(cache_key)
+                    if cached:
+                        return _cached_response(request, cached)
+
+                if if_none_match:
+                    watermark = await session.scalar(queries.reservation_list_watermark(*shape, with_archive=with_archive, by_id=by_id), params)
+                    if if_none_match.contains_weak(watermark):
+                        return _not_modified(watermark)
+
+                rows = (await session.execute(queries.reservation_list(*shape, with_archive=with_archive, by_id=by_id), params)).all()
+                resp = jsonify({"reservations": [reservation_row(r) for r in rows]})
+                etag = collection_etag(rows)
+                resp.set_etag(etag)
+                if cache_key and not from_replica:
+                    cache.set_room_list(cache_key, resp.get_data(as_text=True), etag)
+                return resp
+
+            query = queries.reservation_list(*shape, keyset=True, with_archive=with_archive, by_id=by_id)
+            params["cursor_from"], params["cursor_id"] = cursor_pos or (date.min, uuid.UUID(int=0))
+
+            if stream:
+                params["limit"] = limit
+                return StreamingResponse(
+                    _stream_reservations(request, query, params, current_app.json.dumps),
+                    media_type="application/json",
+                )
+
+            params["limit"] = limit + 1
+            page = (await session.execute(query, params)).all()
+            # ETag nur über die ausgelieferten Zeilen, nicht über die Zeile limit + 1
+            etag = page_etag(page[:limit], len(page) > limit)
+            if if_none_match.contains_weak(etag):
+                return _not_modified(etag)
+
+            body: Dict[str, Any] = {"reservations": [reservation_row(r) for r in page[:limit]]}
+            if len(page) > limit:
+                last = page[limit - 1]
+                body["next_cursor"] = Helpers.encode_cursor(last.start_date, last.id)
+            resp = jsonify(body)
+            resp.set_etag(etag)
+            return resp
+
+    except Exception as e:
+        logUUID = _log_error("Error fetching reservations", "get_reservations", e)
+        return error_resp("internal_error", "Error fetching reservations", logUUID, 500, str(e))
+
+
+async def _stream_reservations(request: Request, query: Any, params: Dict[str, Any], dumps: Callable[[Any], str]) -> AsyncIterator[str]:
+    """Async variant of 'routes._stream_reservations' using a server-side cursor."""
+    chunk_size = Config.RESERVATIONS_STREAM_CHUNK_SIZE
+    yield '{"reservations":['
+    separator = ""
+    async with _read_sessionmaker(request)() as session:
+        result = await session.stream(query, params, execution_options={"yield_per": chunk_size})
+        async for partition in result.partitions():
+            yield separator + ",".join(dumps(reservation_row(r)) for r in partition)
+            separator = ","
+    yield ']}'
+
+
+@_route(RESERVATIONS, RESERVATIONS, ["POST"])
+async def create_reservation(request: Request) -> FlaskResponse:
+    prototype, error = _parse_prototype(await _json_body(request))
+    if error is not None:
+        return error
+    async with request.app.state.sessionmaker() as session:
+        return await _create(session, prototype)
+
+
+async def _create(session: AsyncSession, prototype: Tuple[uuid.UUID, Any, Any]) -> FlaskResponse:
+    room_id, req_from, req_to = prototype
+
+    new_res = Reservation(room_id=room_id, start_date=req_from, end_date=req_to)
+    session.add(new_res)
+
+    overlap_resp = await _commit_or_overlap(session, "create", new_res)
+    if overlap_resp is not None:
+        return overlap_resp
+
+    get_reservation_cache().invalidate([new_res.id], [room_id])
+
+    current_app.logger.info("Reservation created", extra={
+        "event.action": "create",
+        "resource.type": "reservation",
+        "resource.id": str(new_res.id),
+        "service.name": "reservations-api"
+    })
+
+    resp = make_response(jsonify(new_res.to_dict()), 201)
+    resp.headers['Location'] = f"{RESERVATIONS}/{new_res.id}"
+    resp.set_etag(reservation_etag(new_res))
+    return resp
+
+
+@_route(RESERVATIONS + "/<string:res_id>", RESERVATIONS + "/{res_id}", ["GET"])
+async def get_reservation(request: Request) -> FlaskResponse:
+    try:
+        valid_uuid = uuid.UUID(request.path_params["res_id"])
+    except ValueError:
+        return error_resp("bad_request", "Not found", str(uuid.uuid4()), 404)
+
+    cache = get_reservation_cache()
+    cached = None if _is_pinned(request) else cache.get_reservation(valid_uuid)
+    if cached:
+        return _cached_response(request, cached)
+
+    sessionmaker = _read_sessionmaker(request)
+    from_replica = sessionmaker is not request.app.state.sessionmaker
+    async with sessionmaker() as session:
+        res = await session.get(Reservation, valid_uuid) or await _get_archived(session, valid_uuid)
+    if not res and from_replica:
+        # Die Replica kennt eine gerade angelegte Reservierung evtl. noch nicht
+        async with request.app.state.sessionmaker() as session:
+            res = await session.get(Reservation, valid_uuid) or await _get_archived(session, valid_uuid)
+        from_replica = False
+
+    if not res:
+        return error_resp("bad_request", "Not found", str(uuid.uuid4()), 404)
+
+    etag = reservation_etag(res)
+    if parse_etags(request.headers.get("if-none-match")).contains_weak(etag):
+        return _not_modified(etag)
+
+    resp = jsonify(res.to_dict())
+    resp.set_etag(etag)
+    if not from_replica:
+        cache.set_reservation(valid_uuid, resp.get_data(as_text=True), etag)
+    return resp
+
+
+@_route(RESERVATIONS + "/<string:res_id>", RESERVATIONS + "/{res_id}", ["PUT"])
+async def update_reservation(request: Request) -> FlaskResponse:
+    data = await _json_body(request)
+    try:
+        valid_uuid = uuid.UUID(request.path_params["res_id"])
+    except ValueError:
+        return error_resp("not_found", "Invalid reservation UUID", str(uuid.uuid4()), 400)
+
+    # Eingabe vor DB-Zugriff und Authentifizierung validieren
+    wants_restore = isinstance(data, dict) and "deleted_at" in data and data["deleted_at"] is None
+    prototype, error = _parse_prototype(data)
+    if error is not None:
+        if wants_restore and any(k not in data for k in ("room_id", "from", "to")):
+            return error_resp("bad_request", "Prototype required to restore (room_id, from, to)", str(uuid.uuid4()), 400)
+        return error
+
+    async with request.app.state.sessionmaker() as session:
+        existing = await session.get(Reservation, valid_uuid)
+        archived = None
+
+        # Neue Reservation erstellen, wenn nicht existent
+        if not existing:
+            archived = await _get_archived(session, valid_uuid)
+            if archived and wants_restore and archived.deleted_at:
+                # Archivierte gelöschte Reservierung beim Restore zurückverschieben
+                existing = unarchive(archived)
+            elif archived:
+                return error_resp("not_found", "Not found", str(uuid.uuid4()), 400, "Reservation is archived and can no longer be modified.")
+            elif parse_etags(request.headers.get("if-match")):
+                return error_resp("precondition_failed", "Precondition failed", str(uuid.uuid4()), 412, "The reservation does not exist.")
+            else:
+                return await _create(session, prototype)
+
+        user_id, auth_resp = await _authenticate(request)
+        if auth_resp is not None:
+            return auth_resp
+
+        precondition_resp = _check_if_match(request, existing)
+        if precondition_resp is not None:
+            return precondition_resp
+
+        if existing.deleted_at and not wants_restore:
+            return error_resp("not_found", "Not found", str(uuid.uuid4()), 400, "Reservation does not exist or is deleted.")
+
+        room_id, req_from, req_to = prototype
+
+        old_room_id = existing.room_id
+        existing.room_id = room_id
+        existing.start_date = req_from
+        existing.end_date = req_to
+        if wants_restore:
+            existing.deleted_at = None
+        if archived is not None:
+            await session.delete(archived)
+            session.add(existing)
+
+        overlap_resp = await _commit_or_overlap(session, "restore" if wants_restore else "update", existing)
+        if overlap_resp is not None:
+            return overlap_resp
+
+    get_reservation_cache().invalidate([existing.id], [old_room_id, room_id])
+
+    action = "RESTORE" if wants_restore else "UPDATE"
+    current_app.logger.info(f"Reservation {action.lower()}d", extra={
+        "event.action": action,
+        "resource.type": "reservation",
+        "resource.id": str(existing.id),
+        "user.id": user_id,
+        "service.name": "reservations-api"
+    })
+
+    resp = make_response(jsonify(existing.to_dict()), 200)
+    resp.set_etag(reservation_etag(existing))
+    return resp
+
+
+@_route(RESERVATIONS + "/<string:res_id>", RESERVATIONS + "/{res_id}", ["DELETE"])
+async def delete_reservation(request: Request) -> FlaskResponse:
+    user_id, auth_resp = await _authenticate(request)
+    if auth_resp is not None:
+        return auth_resp
+
+    res_id = request.path_params["res_id"]
+    permanent = request.query_params.get("permanent", "false").lower() == "true"
+    try:
+        uuid_res_id = uuid.UUID(res_id)
+    except (ValueError, AttributeError):
+        return error_resp("invalid_id", "Reservation ID is not a valid UUID", str(uuid.uuid4()), 400)
+
+    async with request.app.state.sessionmaker() as session:
+        res = await session.get(Reservation, uuid_res_id)
+        if not res and permanent:
+            res = await _get_archived(session, uuid_res_id)
+
+        if not res or (res.deleted_at and not permanent):
+            return error_resp("not_found", "Not found", str(uuid.uuid4()), 404)
+
+        precondition_resp = _check_if_match(request, res)
+        if precondition_resp is not None:
+            return precondition_resp
+
+        room_id = res.room_id
+        if permanent:
+            await session.delete(res)
+            action = "DELETE_PERMANENT"
+        else:
+            res.deleted_at = Helpers.get_current_time()
+            action = "SOFT_DELETE"
+
+        await record_event_async(session, action.lower(), res)
+        await session.commit()
+
+    get_reservation_cache().invalidate([uuid_res_id], [room_id])
+
+    current_app.logger.info("Reservation deleted", extra={
+        "event.action": action,
+        "resource.type": "reservation",
+        "resource.id": str(res_id),
+        "user.id": user_id,
+        "service.name": "reservations-api"
+    })
+
+    return make_response("", 204)
+
+
+ROUTES = [
+    status, liveness, health, readiness,
+    list_reservations, create_reservation,
+    get_reservation, update_reservation, delete_reservation,
+]
+
+
+def create_async_db_engine(url: Optional[str] = None) -> AsyncEngine:
+    """Create the async engine with the pool settings of the sync engine.
+
+    Args:
+        url: Database URL; defaults to the primary.
+    """
+    engine = create_async_engine(url or Config.SQLALCHEMY_DATABASE_URI, **Config.SQLALCHEMY_ENGINE_OPTIONS)
+    # Statement-Dauer auch für die async Engine in /metrics
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+def create_asgi_app(flask_app: Optional[Flask] = None) -> Starlette:
+    """Create the ASGI application.
+
+    Args:
+        flask_app: Flask application for shared state and the WSGI
+            fallback; a new one is created if omitted.
+
+    Returns:
+        Starlette: The ASGI application.
+    """
+    flask_app = flask_app or create_app()
+    engine = create_async_db_engine()
+    replica_engines = [create_async_db_engine(url) for url in Config.DB_REPLICA_URLS]
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        yield
+        for e in (engine, *replica_engines):
+            await e.dispose()
+
+    routes = ROUTES + [Mount("/", app=WSGIMiddleware(flask_app, workers=Config.SERVER_THREADS))]
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.flask_app = flask_app
+    app.state.engine = engine
+    app.state.sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    app.state.replica_sessionmakers = [async_sessionmaker(e, expire_on_commit=False) for e in replica_engines]
+    app.state.health = AsyncDatabaseHealth(engine, Config.HEALTH_CHECK_INTERVAL)
+    return app
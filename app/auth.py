@@ -1,76 +1,284 @@
 """Authentication helpers using Keycloak JWKS.
 
-This module provides a cached JWKS loader and a decorator
-('require_auth') that verifies incoming JWTs using the JWKS
-published by Keycloak.
+This module provides a JWKS key store, a cache of already verified
+tokens and a decorator ('require_auth') that verifies incoming JWTs
+using the JWKS published by Keycloak.
 """
 
 import jwt
-import json
+import hashlib
+import logging
+import threading
+import time
 import requests
-from functools import wraps, lru_cache
-from typing import Optional, Dict, Any, Callable
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional, Dict, Any, Callable, Tuple
 from flask import request, jsonify, current_app
 from .config import Config
+from .metrics import AUTH_DURATION
 
 from jwt.algorithms import RSAAlgorithm
 
+logger = logging.getLogger(__name__)
+
 
-@lru_cache(maxsize=1)
 def get_jwks_client() -> Optional[Dict[str, Any]]:
     """Fetch the JWKS from Keycloak.
 
-    The result is cached (LRU cache) to avoid repeated network calls.
+    The result is not cached here; caching happens in 'JWKSKeyStore'.
 
     Returns:
         A dictionary parsed from the JWKS JSON on success, or 'None' on error.
     """
     try:
         url = Config.KEYCLOAK_CERTS_URL
-        return requests.get(url, timeout=3).json()
+        return requests.get(url, timeout=Config.JWKS_FETCH_TIMEOUT).json()
     except Exception as e:
-        current_app.logger.error(f"Could not load JWKS: {e}")
+        logger.error(f"Could not load JWKS: {e}")
         return None
 
 
+class JWKSKeyStore:
+    """Public keys from the Keycloak JWKS, indexed by 'kid'.
+
+    Keys are parsed into public key objects once per fetch. After
+    'ttl' seconds the keys are refreshed in a background thread while the
+    current keys keep being served. An unknown 'kid' triggers an immediate
+    refetch. Background and immediate fetches together start at most once
+    per 'min_refetch_interval' seconds, also while fetches fail. Failed
+    fetches are never cached; the previous keys stay in use.
+    """
+
+    def __init__(self, ttl: float, min_refetch_interval: float) -> None:
+        self.ttl = ttl
+        self.min_refetch_interval = min_refetch_interval
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at: Optional[float] = None
+        self._last_attempt: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def get_key(self, kid: Optional[str]) -> Optional[Any]:
+        """Return the public key for 'kid', or 'None' if it is unknown.
+
+        Args:
+            kid: Key ID from the (unverified) token header.
+        """
+        now = time.monotonic()
+        key = self._keys.get(kid)
+        if key is None and self._claim_fetch(now):
+            self.refresh()
+            key = self._keys.get(kid)
+        elif self._fetched_at is not None and now - self._fetched_at > self.ttl:
+            self._refresh_in_background(now)
+        if key is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return key
+
+    def refresh(self) -> bool:
+        """Fetch the JWKS and replace the cached keys.
+
+        Returns:
+            bool: 'True' if the keys were updated.
+        """
+        self._last_attempt = time.monotonic()
+        jwks = get_jwks_client()
+        if not jwks or "keys" not in jwks:
+            self.refresh_failures += 1
+            return False
+
+        keys: Dict[str, Any] = {}
+        for jwk in jwks["keys"]:
+            if jwk.get("kty") != "RSA" or "kid" not in jwk:
+                continue
+            try:
+                keys[jwk["kid"]] = RSAAlgorithm.from_jwk(jwk)
+            except Exception as e:
+                logger.error(f"Could not parse JWK {jwk.get('kid')}: {e}")
+
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        self.refreshes += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Return lookup and refresh counters and the number of keys."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "size": len(self._keys),
+        }
+
+    def _may_fetch(self, now: float) -> bool:
+        return self._last_attempt is None or now - self._last_attempt >= self.min_refetch_interval
+
+    def _claim_fetch(self, now: float) -> bool:
+        """Reserve the next fetch; only one caller per interval gets it."""
+        with self._lock:
+            if not self._may_fetch(now):
+                return False
+            self._last_attempt = now
+            return True
+
+    def _refresh_in_background(self, now: float) -> None:
+        with self._lock:
+            if self._refreshing or not self._may_fetch(now):
+                return
+            self._refreshing = True
+            self._last_attempt = now
+
+        def run() -> None:
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
+
+
+def get_key_store() -> JWKSKeyStore:
+    """Return the JWKS key store of the current application."""
+    store = current_app.extensions.get("jwks_store")
+    if store is None:
+        store = current_app.extensions.setdefault("jwks_store", JWKSKeyStore(
+            ttl=Config.JWKS_CACHE_TTL,
+            min_refetch_interval=Config.JWKS_MIN_REFETCH_INTERVAL,
+        ))
+    return store
+
+
+class VerifiedTokenCache:
+    """Bounded LRU cache from token digest to verified claims.
+
+    Entries expire after 'ttl' seconds, but never later than the token's
+    own 'exp' claim, so a cache hit is only returned for a token that
+    would still pass verification. Tokens are stored as SHA-256 digests.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the cached claims for 'token' or 'None' on a miss."""
+        if self.max_entries <= 0:
+            return None
+        digest = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[digest]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        """Store verified 'claims' for 'token'."""
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, claims["exp"])
+        digest = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            self._entries[digest] = (expires_at, claims)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current number of entries."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    """Return the verified-token cache of the current application."""
+    cache = current_app.extensions.get("token_cache")
+    if cache is None:
+        cache = current_app.extensions.setdefault("token_cache", VerifiedTokenCache(
+            max_entries=Config.TOKEN_CACHE_MAX_ENTRIES,
+            ttl=Config.TOKEN_CACHE_TTL,
+        ))
+    return cache
+
+
 def require_auth(f: Callable[..., Any]) -> Callable[..., Any]:
     """Decorator that enforces JWT authentication on Flask routes.
 
-    The decorator reads the 'Authorization' header, locates the
-    corresponding JWK by 'kid' from the Keycloak JWKS, and verifies the
-    token signature. On success it attaches 'user_id' to the Flask
+    The decorator reads the 'Authorization' header, looks up the public
+    key for the token's 'kid' in the JWKS key store, and verifies the
+    token signature. Tokens found in the verified-token cache skip the
+    signature check. On success it attaches 'user_id' to the Flask
     'request' object (using the token 'sub' or 'preferred_username').
     """
     @wraps(f)
     def decorated(*args: Any, **kwargs: Any) -> Any:
-        token = request.headers.get("Authorization", "").replace("Bearer ", "")
-        if not token:
-            return jsonify({"errors": [{"code": "not_authorized", "message": "No token"}]}), 401
+        start = time.perf_counter()
+        result = _authenticate()
+        AUTH_DURATION.observe((result[0],), time.perf_counter() - start)
+        if result[1] is not None:
+            return result[1]
+
+        return f(*args, **kwargs)
+
+    return decorated
+
+
+def verify_token(token: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """Verify a bearer token against the cached claims or the JWKS.
+
+    Must be called inside an application context. Used by 'require_auth'
+    and by the asynchronous entrypoint ('app.asgi').
+
+    Args:
+        token: The raw token without the 'Bearer ' prefix.
 
-        try:
+    Returns:
+        Tuple of the outcome ('cached', 'verified' or 'rejected'), the
+        token claims and the error message (one of the last two is 'None').
+    """
+    if not token:
+        return "rejected", None, "No token"
+
+    outcome = "cached"
+    try:
+        # 0. Bereits verifizierte Tokens ohne erneute Signaturprüfung
+        token_cache = get_token_cache()
+        payload = token_cache.get(token)
+
+        if payload is None:
+            outcome = "verified"
             # 1. Wir lesen den Header des Tokens UNVERIFIZIERT, um die Key-ID (kid) zu finden
             unverified_header = jwt.get_unverified_header(token)
-            rsa_key = None
-            
-            # 2. Wir laden die aktuellen Keys von Keycloak
-            jwks = get_jwks_client()
-
-            if jwks and "keys" in jwks:
-                # 3. Wir suchen den Key, der zur ID im Token passt
-                for key in jwks["keys"]:
-                    if key["kid"] == unverified_header.get("kid"):
-                        # 4. Umwandlung in ein RSA Key Objekt
-                        rsa_key = RSAAlgorithm.from_jwk(json.dumps(key))
-                        break
+
+            # 2. Vorab geparsten Key zur ID im Token aus dem Key Store holen
+            rsa_key = get_key_store().get_key(unverified_header.get("kid"))
 
             if rsa_key:
-                # 5. Erfolgreiche Prüfung mit dem korrekten Key Objekt
+                # 3. Erfolgreiche Prüfung mit dem korrekten Key Objekt
                 payload = jwt.decode(
                     token,
                     rsa_key,
                     algorithms=["RS256"],
                     options={"verify_aud": False}
                 )
+                token_cache.put(token, payload)
             else:
                 # Kein passender Key gefunden
                 current_app.logger.error({
@@ -78,16 +286,28 @@ def require_auth(f: Callable[..., Any]) -> Callable[..., Any]:
                     "event.message": "No matching JWK found"
                 })
 
-                return jsonify({"errors": [{"code": "not_authorized", "message": "Invalid token"}]}), 401
+                return "rejected", None, "Invalid token"
 
-            request.user_id = payload.get("sub") or payload.get("preferred_username")
+    except jwt.ExpiredSignatureError:
+        return "rejected", None, "Token expired"
+    except Exception as e:
+        current_app.logger.error({"event.message": f"Auth Error: {e}"})
+        return "rejected", None, "Invalid token"
 
-        except jwt.ExpiredSignatureError:
-            return jsonify({"errors": [{"code": "not_authorized", "message": "Token expired"}]}), 401
-        except Exception as e:
-            current_app.logger.error({"event.message": f"Auth Error: {e}"})
-            return jsonify({"errors": [{"code": "not_authorized", "message": "Invalid token"}]}), 401
+    return outcome, payload, None
 
-        return f(*args, **kwargs)
 
-    return decorated
\ No newline at end of file
+def _authenticate() -> Tuple[str, Optional[Any]]:
+    """Verify the bearer token of the current request.
+
+    Returns:
+        Tuple of the outcome ('cached', 'verified' or 'rejected') and the
+        error response to return, or 'None' if the request is authorized.
+    """
+    token = request.headers.get("Authorization", "").replace("Bearer ", "")
+    outcome, payload, error = verify_token(token)
+    if error is not None:
+        return outcome, (jsonify({"errors": [{"code": "not_authorized", "message": error}]}), 401)
+
+    request.user_id = payload.get("sub") or payload.get("preferred_username")
+    return outcome, None
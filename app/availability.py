@@ -0,0 +1,69 @@
+"""Free-slot computation for rooms.
+
+Reservations are half-open date ranges '[from, to)'. The free intervals
+of a room within a window are the gaps left by its active reservations,
+found with one ordered query and a single sort-and-sweep pass.
+"""
+
+import uuid
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+from .queries import BOOKED_INTERVALS
+from .replicas import read_session
+
+
+def free_intervals(booked: Iterable[Tuple[date, date]], window_from: date, window_to: date) -> List[Tuple[date, date]]:
+    """Return the gaps between booked intervals inside the window.
+
+    Args:
+        booked: '(from, to)' intervals sorted by 'from'.
+        window_from: Start of the window (inclusive).
+        window_to: End of the window (exclusive).
+
+    Returns:
+        list: Free '(from, to)' intervals in ascending order.
+    """
+    free = []
+    cursor = window_from
+    for start, end in booked:
+        if start > cursor:
+            free.append((cursor, min(start, window_to)))
+        cursor = max(cursor, end)
+        if cursor >= window_to:
+            break
+    if cursor < window_to:
+        free.append((cursor, window_to))
+    return free
+
+
+def get_availability(room_ids: List[uuid.UUID], window_from: date, window_to: date) -> List[Dict[str, object]]:
+    """Compute the free intervals of several rooms in one query.
+
+    Only reservations intersecting the window are read, so the cost
+    scales with the reservations in the window, not the whole table. The
+    query may be served by a read replica (see 'app.replicas').
+
+    Args:
+        room_ids: Rooms to check.
+        window_from: Start of the window (inclusive).
+        window_to: End of the window (exclusive).
+
+    Returns:
+        list: One '{"room_id", "free"}' entry per room, in input order.
+    """
+    booked: Dict[uuid.UUID, List[Tuple[date, date]]] = {room_id: [] for room_id in room_ids}
+    params = {"room_ids": room_ids, "window_from": window_from, "window_to": window_to}
+    for room_id, start, end in read_session().execute(BOOKED_INTERVALS, params):
+        booked[room_id].append((start, end))
+
+    return [
+        {
+            "room_id": str(room_id),
+            "free": [
+                {"from": start.isoformat(), "to": end.isoformat()}
+                for start, end in free_intervals(booked[room_id], window_from, window_to)
+            ],
+        }
+        for room_id in booked
+    ]
@@ -0,0 +1,248 @@
+"""Bulk creation and upsert of reservations.
+
+This module validates a batch of reservation prototypes, checks them for
+overlaps set-wise (against the database with a single query and against
+each other within the batch) and writes all accepted items with
+multi-row 'INSERT ... ON CONFLICT' statements in one transaction.
+"""
+
+import bisect
+import json
+import uuid
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+
+from .cache import get_reservation_cache
+from .config import Config
+from .events import record_events
+from .helpers import Helpers
+from .models import Reservation, db
+from .queries import BATCH_OVERLAP_CANDIDATES, KNOWN_ARCHIVED_IDS, KNOWN_IDS
+from .validation import BATCH_ITEM, ValidationError
+
+Item = Dict[str, Any]
+
+
+def _item_error(code: str, msg: str, more_info: str = "not provided") -> Dict[str, Any]:
+    return {"code": code, "message": msg, "more_info": more_info}
+
+
+def iter_ndjson(lines: Iterable[bytes]) -> Iterator[Any]:
+    """Yield one parsed JSON value per non-empty line.
+
+    Lines that are not valid JSON are yielded as 'None' so that they show
+    up as failed items with their position in the batch.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def parse_items(raw_items: Iterable[Any]) -> Tuple[List[Item], Dict[int, Dict[str, Any]]]:
+    """Validate reservation prototypes.
+
+    Args:
+        raw_items: Decoded JSON objects with 'room_id', 'from', 'to' and an
+            optional 'id'.
+
+    Returns:
+        Tuple of the valid items (with 'index', 'id', 'room_id', 'from',
+        'to') and a mapping from item index to its error.
+    """
+    items: List[Item] = []
+    errors: Dict[int, Dict[str, Any]] = {}
+    seen_ids = set()
+    for index, data in enumerate(raw_items):
+        try:
+            item = BATCH_ITEM.validate(data)
+        except ValidationError as e:
+            errors[index] = _item_error("bad_request", e.message, e.more_info)
+            continue
+
+        res_id = item["id"]
+        if res_id is not None and res_id in seen_ids:
+            errors[index] = _item_error("bad_request", "Duplicate id in batch", str(res_id))
+            continue
+        seen_ids.add(res_id)
+
+        item["index"] = index
+        items.append(item)
+    return items, errors
+
+
+def check_overlaps(items: List[Item], existing: Iterable[Tuple[uuid.UUID, uuid.UUID, date, date]]) -> Dict[int, Dict[str, Any]]:
+    """Find items that overlap an existing reservation or an earlier item.
+
+    Per room the occupied intervals are kept sorted by start date. Since
+    they never overlap each other, a new interval only has to be compared
+    with its direct neighbours. Items are accepted in batch order, like
+    the rows of the 'INSERT' are checked by the exclusion constraint: an
+    update item frees the current interval of its own reservation only
+    if it is accepted, a rejected update keeps it occupied.
+
+    Args:
+        items: Valid items from 'parse_items'.
+        existing: '(id, room_id, from, to)' of the active reservations,
+            including those updated by the batch.
+
+    Returns:
+        dict: Item index mapped to its overlap error.
+    """
+    # room_id -> sortierte Liste von (from, to, owner); owner = Item-Index
+    # (int) oder ID der Reservierung in der DB
+    occupied: Dict[uuid.UUID, List[Tuple[date, date, Any]]] = {}
+    stored: Dict[uuid.UUID, Tuple[uuid.UUID, Tuple[date, date, Any]]] = {}
+    for res_id, room_id, start, end in existing:
+        interval = (start, end, res_id)
+        occupied.setdefault(room_id, []).append(interval)
+        stored[res_id] = (room_id, interval)
+    for intervals in occupied.values():
+        intervals.sort(key=lambda iv: iv[0])
+
+    errors: Dict[int, Dict[str, Any]] = {}
+    for item in items:
+        # Die bisherige Zeile des Items selbst ist kein Konflikt
+        own = stored.pop(item["id"], None)
+        if own is not None:
+            occupied[own[0]].remove(own[1])
+        intervals = occupied.setdefault(item["room_id"], [])
+        pos = bisect.bisect_left(intervals, item["from"], key=lambda iv: iv[0])
+        for neighbour in intervals[max(pos - 1, 0):pos + 1]:
+            if neighbour[0] < item["to"] and neighbour[1] > item["from"]:
+                if isinstance(neighbour[2], int):
+                    more_info = f"The requested reservation overlaps with item {neighbour[2]} of the batch."
+                else:
+                    more_info = "The requested reservation overlaps with an existing reservation."
+                errors[item["index"]] = _item_error("bad_request", "Overlap detected", more_info)
+                if own is not None:
+                    bisect.insort(occupied[own[0]], own[1], key=lambda iv: iv[0])
+                break
+        else:
+            intervals.insert(pos, (item["from"], item["to"], item["index"]))
+    return errors
+
+
+def _reservation_dict(item: Item, known: Dict[uuid.UUID, Any]) -> Dict[str, Any]:
+    """Return the stored reservation of an accepted item ('Reservation.to_dict' format)."""
+    reservation = {
+        "id": str(item["id"]),
+        "room_id": str(item["room_id"]),
+        "from": item["from"].isoformat(),
+        "to": item["to"].isoformat(),
+    }
+    if known.get(item["id"]) is not None:
+        reservation["deleted_at"] = known[item["id"]].isoformat()
+    return reservation
+
+
+def upsert_reservations(raw_items: Iterable[Any]) -> Dict[str, Any]:
+    """Validate, overlap-check and write a batch of reservations.
+
+    Items with an 'id' of an existing reservation update it (its
+    'deleted_at' is kept), all others are created. Items with the 'id' of
+    an archived reservation are rejected. Rejected items do not
+    prevent the others from being written.
+
+    Args:
+        raw_items: Decoded JSON prototypes.
+
+    Returns:
+        dict: 'results' with one entry per input item (in order) plus the
+            'created', 'updated' and 'failed' counts.
+
+    Raises:
+        sqlalchemy.exc.IntegrityError: If a concurrent write introduced an
+            overlap after the check (the transaction is rolled back).
+    """
+    items, errors = parse_items(raw_items)
+    count = len(items) + len(errors)
+
+    # Bestehende Reservierungen der Batch-IDs (Create vs. Update)
+    batch_ids = [item["id"] for item in items if item["id"] is not None]
+    known: Dict[uuid.UUID, Any] = {}
+    old_rooms: Dict[uuid.UUID, uuid.UUID] = {}
+    if batch_ids:
+        rows = db.session.execute(KNOWN_IDS, {"ids": batch_ids})
+        for res_id, room_id, deleted_at in rows:
+            known[res_id] = deleted_at
+            old_rooms[res_id] = room_id
+        if Config.ARCHIVE_ENABLED:
+            # Archivierte Reservierungen sind schreibgeschützt (wie bei PUT)
+            archived = {res_id for res_id, in db.session.execute(KNOWN_ARCHIVED_IDS, {"ids": batch_ids})}
+            for item in items:
+                if item["id"] in archived:
+                    errors[item["index"]] = _item_error("not_found", "Not found", "Reservation is archived and can no longer be modified.")
+            items = [item for item in items if item["index"] not in errors]
+
+    # Ein Overlap-Query für alle Räume und den gesamten Zeitraum der Batch
+    active = [item for item in items if known.get(item["id"]) is None]
+    existing: List[Tuple[uuid.UUID, uuid.UUID, date, date]] = []
+    if active:
+        existing = list(db.session.execute(BATCH_OVERLAP_CANDIDATES, {
+            "room_ids": list({item["room_id"] for item in active}),
+            "window_from": min(item["from"] for item in active),
+            "window_to": max(item["to"] for item in active),
+        }))
+    errors.update(check_overlaps(active, existing))
+
+    accepted = [item for item in items if item["index"] not in errors]
+    for item in accepted:
+        if item["id"] is None:
+            item["id"] = uuid.uuid4()
+
+    table = Reservation.__table__
+    chunk_size = Config.BULK_INSERT_CHUNK_SIZE
+    for start in range(0, len(accepted), chunk_size):
+        chunk = accepted[start:start + chunk_size]
+        stmt = insert(table).values([
+            {"id": item["id"], "room_id": item["room_id"], "from": item["from"], "to": item["to"]}
+            for item in chunk
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={
+                "room_id": stmt.excluded.room_id,
+                "from": stmt.excluded["from"],
+                "to": stmt.excluded["to"],
+            },
+        )
+        db.session.execute(stmt)
+    record_events([
+        {
+            "reservation_id": item["id"],
+            "room_id": item["room_id"],
+            "action": "update" if item["id"] in known else "create",
+            "payload": _reservation_dict(item, known),
+            "created_at": Helpers.get_current_time(),
+        }
+        for item in accepted
+    ])
+    db.session.commit()
+
+    get_reservation_cache().invalidate(
+        [item["id"] for item in accepted],
+        [item["room_id"] for item in accepted] + [old_rooms[item["id"]] for item in accepted if item["id"] in old_rooms],
+    )
+
+    results: List[Dict[str, Any]] = [None] * count
+    for index, error in errors.items():
+        results[index] = {"index": index, "status": 400, "errors": [error]}
+    created = updated = 0
+    for item in accepted:
+        is_update = item["id"] in known
+        updated += is_update
+        created += not is_update
+        results[item["index"]] = {
+            "index": item["index"],
+            "status": 200 if is_update else 201,
+            "reservation": _reservation_dict(item, known),
+        }
+
+    return {"results": results, "created": created, "updated": updated, "failed": len(errors)}
@@ -0,0 +1,156 @@
+"""Read-through cache for reservation lookups.
+
+Cached are the serialized response bodies (plus ETag) of single
+reservations, keyed by id, and of per-room list queries, keyed by
+room_id and the filter tuple. Writes invalidate precisely: the
+reservation's own key is deleted and the generation token of each
+affected room is replaced, which makes all cached lists of that room
+unreachable. Readers resolve the list key (with the room's generation)
+before running the query, so a list read before a concurrent write is
+stored under the old generation and never served after it.
+
+The storage backend is pluggable: 'InMemoryCache' (per process, LRU
+with TTL, also used in tests), 'RedisCache' (shared between workers and
+pods, requires the 'redis' package) or 'NullCache' (disabled).
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from flask import current_app
+
+from .config import Config
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+CacheEntry = Dict[str, str]
+
+
+class NullCache:
+    """Backend that stores nothing."""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+
+class InMemoryCache(NullCache):
+    """Thread-safe, size-bounded LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class RedisCache(NullCache):
+    """Backend storing JSON values in Redis, shared by all workers."""
+
+    def __init__(self, url: str, prefix: str = "reservations:") -> None:
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._client.get(self._prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(self._prefix + key, json.dumps(value), ex=max(int(ttl), 1))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self._client.delete(*(self._prefix + key for key in keys))
+
+
+class ReservationCache:
+    """Reservation-specific cache keys and invalidation on top of a backend."""
+
+    def __init__(self, backend: NullCache, ttl: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    def get_reservation(self, res_id: uuid.UUID) -> Optional[CacheEntry]:
+        return self.backend.get(f"res:{res_id}")
+
+    def set_reservation(self, res_id: uuid.UUID, body: str, etag: str) -> None:
+        self.backend.set(f"res:{res_id}", {"body": body, "etag": etag}, self.ttl)
+
+    def get_room_list(self, key: str) -> Optional[CacheEntry]:
+        return self.backend.get(key)
+
+    def set_room_list(self, key: str, body: str, etag: str) -> None:
+        """Store a list under 'key', resolved by 'room_list_key' before the query."""
+        self.backend.set(key, {"body": body, "etag": etag}, self.ttl)
+
+    def invalidate(self, res_ids: Iterable[uuid.UUID], room_ids: Iterable[uuid.UUID]) -> None:
+        """Drop the cached reservations and all cached lists of the rooms."""
+        self.backend.delete(*(f"res:{res_id}" for res_id in res_ids))
+        for room_id in set(room_ids):
+            # Neue Generation: alte Listen-Keys sind nicht mehr erreichbar
+            self.backend.set(f"room-gen:{room_id}", uuid.uuid4().hex, self.ttl)
+
+    def room_list_key(self, room_id: uuid.UUID, filters: tuple) -> str:
+        """Return the key of a room list in the room's current generation."""
+        generation = self.backend.get(f"room-gen:{room_id}")
+        if generation is None:
+            # Fehlende (z.B. verdrängte) Generation: neue anlegen, damit
+            # keine Listen einer früheren Generation gelesen werden
+            generation = uuid.uuid4().hex
+            self.backend.set(f"room-gen:{room_id}", generation, self.ttl)
+        return f"room:{room_id}:{generation}:" + ":".join(str(f) for f in filters)
+
+
+def create_backend() -> NullCache:
+    """Create the backend selected by 'Config.CACHE_BACKEND'."""
+    if Config.CACHE_BACKEND == "memory":
+        return InMemoryCache(Config.CACHE_MAX_ENTRIES)
+    if Config.CACHE_BACKEND == "redis":
+        return RedisCache(Config.CACHE_REDIS_URL)
+    return NullCache()
+
+
+def get_reservation_cache() -> ReservationCache:
+    """Return the reservation cache of the current application."""
+    cache = current_app.extensions.get("reservation_cache")
+    if cache is None:
+        cache = current_app.extensions.setdefault(
+            "reservation_cache", ReservationCache(create_backend(), Config.CACHE_TTL)
+        )
+    return cache
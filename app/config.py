@@ -7,7 +7,7 @@ these constants (suitable for Flask app configuration).
 """
 
 import os
-from typing import ClassVar
+from typing import ClassVar, Optional
 
 
 class Config:
@@ -40,8 +40,130 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS: ClassVar[bool] = False
 
+    # Read Replicas (kommagetrennte URLs, siehe app/replicas.py)
+    DB_REPLICA_URLS: ClassVar[list] = [
+        url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    # Nach einem Schreibzugriff liest der Client so lange vom Primary
+    DB_REPLICA_STICKY_SECONDS: ClassVar[float] = float(os.getenv("DB_REPLICA_STICKY_SECONDS", 5))
+
+    # Connection Pool (eine Engine pro Prozess, genutzt von Routen und Health-Checks)
+    DB_POOL_SIZE: ClassVar[int] = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: ClassVar[int] = int(os.getenv("DB_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT: ClassVar[int] = int(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_POOL_RECYCLE: ClassVar[int] = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: ClassVar[bool] = os.getenv("DB_POOL_PRE_PING", "True").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+    DB_CONNECT_TIMEOUT: ClassVar[int] = int(os.getenv("DB_CONNECT_TIMEOUT", 2))
+    # 0 = kein Statement Timeout
+    DB_STATEMENT_TIMEOUT_MS: ClassVar[int] = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 5000))
+    # Timeout für Schema-Bootstrap, Archivierung und Event-Pruning (0 = keiner)
+    DB_MAINTENANCE_STATEMENT_TIMEOUT_MS: ClassVar[int] = int(os.getenv("DB_MAINTENANCE_STATEMENT_TIMEOUT_MS", 0))
+    # psycopg: Statement wird ab der n-ten Ausführung pro Verbindung serverseitig
+    # vorbereitet (0 = sofort, "none" = nie, z.B. hinter PgBouncer im Transaction Mode)
+    DB_PREPARE_THRESHOLD: ClassVar[Optional[int]] = (
+        None if os.getenv("DB_PREPARE_THRESHOLD", "5").strip().lower() in ("none", "")
+        else int(os.getenv("DB_PREPARE_THRESHOLD", "5"))
+    )
+
+    SQLALCHEMY_ENGINE_OPTIONS: ClassVar[dict] = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "connect_args": {
+            "connect_timeout": DB_CONNECT_TIMEOUT,
+            "prepare_threshold": DB_PREPARE_THRESHOLD,
+            **({"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"} if DB_STATEMENT_TIMEOUT_MS > 0 else {}),
+        },
+    }
+
+    # Health Monitor: DB-Check im Hintergrund statt pro Probe
+    HEALTH_CHECK_INTERVAL: ClassVar[float] = float(os.getenv("HEALTH_CHECK_INTERVAL", 5))
+    HEALTH_MAX_STALENESS: ClassVar[float] = float(os.getenv("HEALTH_MAX_STALENESS", 15))
+    # Anteil ausgeliehener Verbindungen, ab dem Readiness fehlschlägt (0 = aus)
+    HEALTH_POOL_SATURATION_THRESHOLD: ClassVar[float] = float(
+        os.getenv("HEALTH_POOL_SATURATION_THRESHOLD", 1.0)
+    )
+
+    # Tabellen und Indizes beim Start anlegen (siehe app/schema.py)
+    DB_BOOTSTRAP_ON_START: ClassVar[bool] = os.getenv(
+        "DB_BOOTSTRAP_ON_START", "False"
+    ).lower() in ("true", "1", "t")
+
+    # Cache für Reservierungs-Lookups: "none", "memory" (pro Prozess) oder "redis"
+    CACHE_BACKEND: ClassVar[str] = os.getenv("CACHE_BACKEND", "none").strip().lower()
+    CACHE_REDIS_URL: ClassVar[str] = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES: ClassVar[int] = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+    CACHE_TTL: ClassVar[int] = int(os.getenv("CACHE_TTL", 30))
+
+    # Profiling einzelner Requests (siehe app/profiling.py)
+    PROFILING_ENABLED: ClassVar[bool] = os.getenv("PROFILING_ENABLED", "False").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+    # Wert des Headers "X-Profile", der ein Profiling auslöst (leer = aus)
+    PROFILING_TOKEN: ClassVar[str] = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_SAMPLE_RATE: ClassVar[float] = float(os.getenv("PROFILING_SAMPLE_RATE", 0))
+    PROFILING_DIR: ClassVar[str] = os.getenv("PROFILING_DIR", "/tmp/reservations-profiles")
+    PROFILING_MAX_FILES: ClassVar[int] = int(os.getenv("PROFILING_MAX_FILES", 50))
+
+    # Archivierung vergangener und gelöschter Reservierungen (siehe app/archive.py)
+    ARCHIVE_ENABLED: ClassVar[bool] = os.getenv("ARCHIVE_ENABLED", "False").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+    ARCHIVE_AFTER_DAYS: ClassVar[int] = int(os.getenv("ARCHIVE_AFTER_DAYS", 365))
+    ARCHIVE_DELETED_AFTER_DAYS: ClassVar[int] = int(os.getenv("ARCHIVE_DELETED_AFTER_DAYS", 30))
+    ARCHIVE_BATCH_SIZE: ClassVar[int] = int(os.getenv("ARCHIVE_BATCH_SIZE", 1000))
+
+    # Change Feed über die Outbox-Tabelle reservation_events (siehe app/events.py)
+    EVENTS_ENABLED: ClassVar[bool] = os.getenv("EVENTS_ENABLED", "False").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+    # LISTEN/NOTIFY nutzen (aus z.B. hinter PgBouncer im Transaction Mode)
+    EVENTS_LISTEN: ClassVar[bool] = os.getenv("EVENTS_LISTEN", "True").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+    EVENTS_POLL_INTERVAL: ClassVar[float] = float(os.getenv("EVENTS_POLL_INTERVAL", 2))
+    EVENTS_BATCH_SIZE: ClassVar[int] = int(os.getenv("EVENTS_BATCH_SIZE", 500))
+    EVENTS_HEARTBEAT_INTERVAL: ClassVar[float] = float(os.getenv("EVENTS_HEARTBEAT_INTERVAL", 15))
+    EVENTS_STREAM_MAX_SECONDS: ClassVar[float] = float(os.getenv("EVENTS_STREAM_MAX_SECONDS", 300))
+    EVENTS_LONG_POLL_TIMEOUT: ClassVar[float] = float(os.getenv("EVENTS_LONG_POLL_TIMEOUT", 25))
+    EVENTS_RETENTION_DAYS: ClassVar[int] = int(os.getenv("EVENTS_RETENTION_DAYS", 7))
+
+    # Maximale Anzahl Werte mehrfacher Parameter (z.B. id, room_id)
+    REQUEST_MAX_VALUES: ClassVar[int] = int(os.getenv("REQUEST_MAX_VALUES", 1000))
+
+    # Längstes Fenster von GET /api/v3/reservations/statistics
+    STATISTICS_MAX_DAYS: ClassVar[int] = int(os.getenv("STATISTICS_MAX_DAYS", 731))
+
+    # JSON Provider: "orjson" (Fallback auf stdlib, falls nicht installiert) oder "stdlib"
+    JSON_PROVIDER: ClassVar[str] = os.getenv("JSON_PROVIDER", "orjson").strip().lower()
+
     LOG_LEVEL: ClassVar[str] = os.getenv("LOG_LEVEL", "INFO").strip().upper()
 
+    # Asynchrones Logging über Queue und Listener-Thread
+    LOG_ASYNC: ClassVar[bool] = os.getenv("LOG_ASYNC", "False").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+    LOG_QUEUE_SIZE: ClassVar[int] = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    # "drop": sofort verwerfen, "block": bis LOG_QUEUE_BLOCK_TIMEOUT warten
+    LOG_QUEUE_POLICY: ClassVar[str] = os.getenv("LOG_QUEUE_POLICY", "drop").strip().lower()
+    LOG_QUEUE_BLOCK_TIMEOUT: ClassVar[float] = float(os.getenv("LOG_QUEUE_BLOCK_TIMEOUT", 0.05))
+
     DEBUG_SERVER: ClassVar[bool] = os.getenv("DEBUG_SERVER", "False").lower() in (
         "true",
         "1",
@@ -50,6 +172,35 @@ class Config:
 
     SERVER_PORT: ClassVar[int] = int(os.getenv("SERVER_PORT", 9099))
 
+    # Server-Modus: "development" (Flask Dev-Server), "production" (gunicorn) oder "asgi" (uvicorn)
+    SERVER_MODE: ClassVar[str] = os.getenv("SERVER_MODE", "development").strip().lower()
+    # 0 = 2 * CPU-Kerne + 1
+    SERVER_WORKERS: ClassVar[int] = int(os.getenv("SERVER_WORKERS", 0))
+    SERVER_THREADS: ClassVar[int] = int(os.getenv("SERVER_THREADS", 4))
+    SERVER_KEEPALIVE: ClassVar[int] = int(os.getenv("SERVER_KEEPALIVE", 5))
+    SERVER_TIMEOUT: ClassVar[int] = int(os.getenv("SERVER_TIMEOUT", 30))
+    SERVER_GRACEFUL_TIMEOUT: ClassVar[int] = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", 30))
+    SERVER_MAX_REQUESTS: ClassVar[int] = int(os.getenv("SERVER_MAX_REQUESTS", 0))
+    SERVER_MAX_REQUESTS_JITTER: ClassVar[int] = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", 0))
+
+    # Pagination / Streaming der Reservierungsliste
+    RESERVATIONS_PAGE_DEFAULT_LIMIT: ClassVar[int] = int(
+        os.getenv("RESERVATIONS_PAGE_DEFAULT_LIMIT", 100)
+    )
+    RESERVATIONS_PAGE_MAX_LIMIT: ClassVar[int] = int(
+        os.getenv("RESERVATIONS_PAGE_MAX_LIMIT", 1000)
+    )
+    RESERVATIONS_STREAM_CHUNK_SIZE: ClassVar[int] = int(
+        os.getenv("RESERVATIONS_STREAM_CHUNK_SIZE", 500)
+    )
+
+    # Maximale Fensterlänge der Verfügbarkeitsabfrage in Tagen
+    AVAILABILITY_MAX_DAYS: ClassVar[int] = int(os.getenv("AVAILABILITY_MAX_DAYS", 366))
+
+    # Batch-Import (POST /reservations/batch)
+    BULK_MAX_ITEMS: ClassVar[int] = int(os.getenv("BULK_MAX_ITEMS", 50000))
+    BULK_INSERT_CHUNK_SIZE: ClassVar[int] = int(os.getenv("BULK_INSERT_CHUNK_SIZE", 1000))
+
     # Keycloak Konfiguration
     KEYCLOAK_HOST: ClassVar[str] = os.getenv("KEYCLOAK_HOST", "localhost:9090")
     KEYCLOAK_REALM: ClassVar[str] = os.getenv("KEYCLOAK_REALM", "biletado")
@@ -57,4 +208,13 @@ class Config:
     KEYCLOAK_URL: ClassVar[str] = f"http://{KEYCLOAK_HOST}/auth/realms/{KEYCLOAK_REALM}"
     KEYCLOAK_CERTS_URL: ClassVar[str] = (
         f"http://{KEYCLOAK_HOST}/auth/realms/{KEYCLOAK_REALM}/protocol/openid-connect/certs"
-    )
\ No newline at end of file
+    )
+
+    # JWKS Key Store (siehe app/auth.py)
+    JWKS_CACHE_TTL: ClassVar[int] = int(os.getenv("JWKS_CACHE_TTL", 300))
+    JWKS_MIN_REFETCH_INTERVAL: ClassVar[int] = int(os.getenv("JWKS_MIN_REFETCH_INTERVAL", 30))
+    JWKS_FETCH_TIMEOUT: ClassVar[int] = int(os.getenv("JWKS_FETCH_TIMEOUT", 3))
+
+    # Cache verifizierter Tokens (0 Einträge = deaktiviert)
+    TOKEN_CACHE_MAX_ENTRIES: ClassVar[int] = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", 1024))
+    TOKEN_CACHE_TTL: ClassVar[int] = int(os.getenv("TOKEN_CACHE_TTL", 60))
@@ -0,0 +1,63 @@
+"""Entity tags for conditional requests.
+
+A reservation's ETag is a hash of '(id, from, to, deleted_at)'. The ETag
+of a list is a hash over the fingerprints of all rows ordered by id. The
+same value can be computed by Postgres ('watermark_expression'), so an
+unchanged list poll costs one aggregate query and no response body.
+"""
+
+import hashlib
+from typing import Any, Iterable
+
+from sqlalchemy import Text, cast, func, literal
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from .models import Reservation
+
+# Gleiche Formatierung wie in der SQL-Variante (to_char ... 'US')
+_DELETED_AT_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def _fingerprint(row: Any) -> str:
+    deleted_at = row.deleted_at.strftime(_DELETED_AT_FORMAT) if row.deleted_at else ""
+    return f"{row.id}|{row.start_date.isoformat()}|{row.end_date.isoformat()}|{deleted_at}"
+
+
+def reservation_etag(row: Any) -> str:
+    """Return the (unquoted) ETag of a single reservation row or object."""
+    return hashlib.md5(_fingerprint(row).encode()).hexdigest()
+
+
+def collection_etag(rows: Iterable[Any]) -> str:
+    """Return the (unquoted) ETag of a list of reservation rows."""
+    ordered = sorted(rows, key=lambda row: str(row.id))
+    return hashlib.md5(",".join(_fingerprint(row) for row in ordered).encode()).hexdigest()
+
+
+def page_etag(rows: Iterable[Any], has_next: bool) -> str:
+    """Return the (unquoted) ETag of one keyset page.
+
+    Only the returned rows count; whether a 'next_cursor' is sent is part
+    of the body as well, so it is appended as a marker.
+    """
+    etag = collection_etag(rows)
+    return f"{etag}-next" if has_next else etag
+
+
+def watermark_expression(source: Any = Reservation) -> Any:
+    """Return the SQL expression computing 'collection_etag' over the selected rows.
+
+    Args:
+        source: Provides the 'id', 'start_date', 'end_date' and 'deleted_at'
+            columns, e.g. the model or the columns of a subquery.
+    """
+    fingerprint = func.concat_ws(
+        "|",
+        cast(source.id, Text),
+        cast(source.start_date, Text),
+        cast(source.end_date, Text),
+        func.coalesce(func.to_char(source.deleted_at, 'YYYY-MM-DD"T"HH24:MI:SS.US'), ""),
+    )
+    aggregate = func.string_agg(fingerprint, aggregate_order_by(literal(","), source.id))
+    return func.md5(func.coalesce(aggregate, ""))
+
@@ -0,0 +1,244 @@
+"""Change feed of reservation changes.
+
+Every write path records its changes in the outbox table
+'reservation_events' in the same transaction as the change itself
+('record_event', 'record_events'), so an event exists exactly for every
+committed change. Writers take a transaction-level advisory lock before
+inserting their events; the lock is held until commit, so event ids
+become visible in ascending order and a reader that has seen id 'n' can
+never later see an id below 'n'. The id is therefore a resumable cursor.
+
+A statement-level trigger (see 'app.schema') sends 'NOTIFY
+reservation_events' on insert. Each worker keeps one dedicated
+connection that listens on the channel ('EventNotifier') and wakes the
+waiting feed requests; without a listener (e.g. behind PgBouncer in
+transaction mode) the feed polls every 'EVENTS_POLL_INTERVAL' seconds.
+"""
+
+import json
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import click
+from flask import Flask, current_app
+from sqlalchemy import bindparam, delete, func, insert, make_url, select
+from sqlalchemy.dialects.postgresql import UUID
+
+from .config import Config
+from .helpers import Helpers
+from .models import ReservationEvent, db
+
+CHANNEL = "reservation_events"
+
+# Beliebiger, aber fester Schlüssel für pg_advisory_xact_lock
+EVENTS_LOCK_KEY = 7_330_021
+
+EVENT_LOCK = select(func.pg_advisory_xact_lock(EVENTS_LOCK_KEY))
+
+_EVENT_COLUMNS = (
+    ReservationEvent.id, ReservationEvent.reservation_id, ReservationEvent.room_id,
+    ReservationEvent.action, ReservationEvent.payload, ReservationEvent.created_at,
+)
+
+EVENTS_AFTER = (
+    select(*_EVENT_COLUMNS)
+    .where(ReservationEvent.id > bindparam("after"))
+    .order_by(ReservationEvent.id)
+    .limit(bindparam("limit"))
+)
+
+EVENTS_AFTER_FOR_ROOM = EVENTS_AFTER.where(
+    ReservationEvent.room_id == bindparam("room_id", type_=UUID(as_uuid=True))
+)
+
+LATEST_EVENT_ID = select(func.coalesce(func.max(ReservationEvent.id), 0))
+
+
+def event_values(action: str, reservation: Any) -> Dict[str, Any]:
+    """Return the outbox row for 'action' on a reservation model instance."""
+    return {
+        "reservation_id": reservation.id,
+        "room_id": reservation.room_id,
+        "action": action,
+        "payload": reservation.to_dict(),
+        "created_at": Helpers.get_current_time(),
+    }
+
+
+def record_event(action: str, reservation: Any) -> None:
+    """Add the event for a change of 'reservation' to the current transaction.
+
+    Must be called right before the commit. Pending changes are flushed
+    first, so errors of the change itself (e.g. overlap violations) are
+    raised here.
+    """
+    if not Config.EVENTS_ENABLED:
+        return
+    db.session.flush()
+    record_events([event_values(action, reservation)])
+
+
+def record_events(values: List[Dict[str, Any]]) -> None:
+    """Insert several outbox rows (see 'event_values') into the current transaction."""
+    if not Config.EVENTS_ENABLED or not values:
+        return
+    db.session.execute(EVENT_LOCK)
+    db.session.execute(insert(ReservationEvent), values)
+
+
+async def record_event_async(session: Any, action: str, reservation: Any) -> None:
+    """'record_event' for an 'AsyncSession' (see 'app.asgi')."""
+    if not Config.EVENTS_ENABLED:
+        return
+    await session.flush()
+    await session.execute(EVENT_LOCK)
+    await session.execute(insert(ReservationEvent), [event_values(action, reservation)])
+
+
+def event_row(row: Any) -> Dict[str, Any]:
+    """Convert a row of 'EVENTS_AFTER' into the JSON representation of an event."""
+    return {
+        "id": row.id,
+        "action": row.action,
+        "reservation_id": str(row.reservation_id),
+        "room_id": str(row.room_id),
+        "reservation": row.payload,
+        "created_at": row.created_at.isoformat(),
+    }
+
+
+def fetch_events(after: int, room_id: Optional[Any] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Return up to 'limit' events with an id greater than 'after', oldest first."""
+    params = {"after": after, "limit": limit or Config.EVENTS_BATCH_SIZE}
+    stmt = EVENTS_AFTER
+    if room_id is not None:
+        stmt = EVENTS_AFTER_FOR_ROOM
+        params["room_id"] = room_id
+    return [event_row(r) for r in db.session.execute(stmt, params)]
+
+
+def latest_event_id() -> int:
+    """Return the id of the newest event (0 if there is none)."""
+    return db.session.execute(LATEST_EVENT_ID).scalar()
+
+
+def format_sse(event: Dict[str, Any], dumps: Any = json.dumps) -> str:
+    """Format an event as a server-sent event message."""
+    return f"id: {event['id']}\nevent: {event['action']}\ndata: {dumps(event)}\n\n"
+
+
+class EventNotifier:
+    """Listens for 'NOTIFY reservation_events' and wakes waiting feed requests.
+
+    One daemon thread per worker process holds a dedicated autocommit
+    connection (outside the pool). Waiters compare the notification
+    counter ('version') they saw before their last query with the current
+    one, so no notification between query and wait is lost.
+    """
+
+    def __init__(self, conninfo: Optional[str], poll_interval: float, retry_interval: float = 5.0) -> None:
+        self.conninfo = conninfo
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self.version = 0
+        self.listening = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def wait(self, version: int, timeout: float) -> int:
+        """Block until a notification newer than 'version' or 'timeout' seconds.
+
+        Without an active listener the wait is capped at the poll interval.
+
+        Returns:
+            int: The current notification counter.
+        """
+        self._ensure_started()
+        if not self.listening:
+            timeout = min(timeout, self.poll_interval)
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def notify(self) -> None:
+        with self._cond:
+            self.version += 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"listening": self.listening, "notifications": self.version}
+
+    def _ensure_started(self) -> None:
+        if self.conninfo is None or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="event-listener", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        import psycopg
+
+        while True:
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True, connect_timeout=Config.DB_CONNECT_TIMEOUT) as conn:
+                    conn.execute(f"LISTEN {CHANNEL}")
+                    self.listening = True
+                    # Während der Verbindungspause verpasste Events nachholen
+                    self.notify()
+                    for _ in conn.notifies():
+                        self.notify()
+            except Exception:
+                # Erneut verbinden; bis dahin pollen die Feeds
+                pass
+            self.listening = False
+            time.sleep(self.retry_interval)
+
+
+def get_event_notifier() -> EventNotifier:
+    """Return the change feed notifier of the current application."""
+    notifier = current_app.extensions.get("event_notifier")
+    if notifier is None:
+        conninfo = None
+        if Config.EVENTS_LISTEN:
+            url = make_url(current_app.config["SQLALCHEMY_DATABASE_URI"]).set(drivername="postgresql")
+            conninfo = url.render_as_string(hide_password=False)
+        notifier = current_app.extensions.setdefault("event_notifier", EventNotifier(
+            conninfo, poll_interval=Config.EVENTS_POLL_INTERVAL,
+        ))
+    return notifier
+
+
+def prune_events(retention_days: int) -> int:
+    """Delete events older than 'retention_days' days and commit.
+
+    Returns:
+        int: The number of deleted events.
+    """
+    cutoff = Helpers.get_current_time() - timedelta(days=retention_days)
+    Helpers.set_maintenance_timeout()
+    count = db.session.execute(delete(ReservationEvent).where(ReservationEvent.created_at < cutoff)).rowcount
+    db.session.commit()
+    return count
+
+
+def init_app(app: Flask) -> None:
+    """Register the 'prune-reservation-events' CLI command.
+
+    Args:
+        app: The Flask application.
+    """
+
+    @app.cli.command("prune-reservation-events")
+    @click.option("--retention-days", type=int, default=None, help="Keep this many days (default: EVENTS_RETENTION_DAYS).")
+    def prune_events_command(retention_days: Optional[int]) -> None:
+        """Delete old change feed events."""
+        pruned = prune_events(retention_days if retention_days is not None else Config.EVENTS_RETENTION_DAYS)
+        app.logger.info("Reservation events pruned", extra={
+            "event.action": "prune_reservation_events",
+            "events.pruned": pruned,
+            "service.name": "reservations-api"
+        })
+        click.echo(f"Pruned {pruned} events")
@@ -0,0 +1,105 @@
+"""Background database health monitor.
+
+Health and readiness probes are answered from the result of the last
+database check instead of opening a connection per probe. A daemon
+thread repeats the check every 'HEALTH_CHECK_INTERVAL' seconds; if the
+cached result is older than 'HEALTH_MAX_STALENESS' (e.g. before the
+first run) one probe checks synchronously while concurrent probes return
+the last result (or wait for it if there is none yet). Readiness additionally fails
+while the connection pool is saturated.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask, current_app
+
+from .config import Config
+from .helpers import Helpers
+
+
+class DatabaseHealthMonitor:
+    """Periodically checks the database and caches the last result."""
+
+    def __init__(self, app: Flask, interval: float, max_staleness: float) -> None:
+        self.app = app
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self._result: Optional[Tuple[bool, str, float]] = None
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def database_status(self) -> Tuple[bool, str]:
+        """Return '(ready, message)' of the last database check."""
+        self._ensure_started()
+        result = self._result
+        # Nur ein synchroner Check gleichzeitig; ohne Ergebnis wird gewartet
+        if self._is_stale(result) and self._check_lock.acquire(blocking=result is None):
+            try:
+                # Ein anderer Probe hat den Check evtl. schon ausgeführt
+                result = self._result
+                if self._is_stale(result):
+                    result = self.check()
+            finally:
+                self._check_lock.release()
+        return result[0], result[1]
+
+    def _is_stale(self, result: Optional[Tuple[bool, str, float]]) -> bool:
+        return result is None or time.monotonic() - result[2] > self.max_staleness
+
+    def readiness(self) -> Tuple[bool, str]:
+        """Return '(ready, message)' including pool saturation."""
+        ready, message = self.database_status()
+        if not ready:
+            return ready, message
+        if self.pool_saturated():
+            return False, "Connection pool saturated"
+        return True, ""
+
+    def pool_saturated(self) -> bool:
+        threshold = Config.HEALTH_POOL_SATURATION_THRESHOLD
+        if threshold <= 0:
+            return False
+        stats = Helpers.get_pool_stats()
+        capacity = stats["size"] + max(stats["max_overflow"], 0)
+        return capacity > 0 and stats["checked_out"] / capacity >= threshold
+
+    def check(self) -> Tuple[bool, str, float]:
+        """Run the database check now and cache its result."""
+        ready, message = Helpers.getDatabaseReady()
+        self._result = (ready, message, time.monotonic())
+        return self._result
+
+    def stats(self) -> Dict[str, Any]:
+        result = self._result
+        if result is None:
+            return {"checked": False}
+        return {"checked": True, "ready": result[0], "age": round(time.monotonic() - result[2], 3)}
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-health", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self.app.app_context():
+                self.check()
+
+
+def get_health_monitor() -> DatabaseHealthMonitor:
+    """Return the database health monitor of the current application."""
+    monitor = current_app.extensions.get("db_health")
+    if monitor is None:
+        monitor = current_app.extensions.setdefault("db_health", DatabaseHealthMonitor(
+            current_app._get_current_object(),
+            interval=Config.HEALTH_CHECK_INTERVAL,
+            max_staleness=Config.HEALTH_MAX_STALENESS,
+        ))
+    return monitor
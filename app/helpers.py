@@ -4,13 +4,16 @@ This module provides small helpers that e.g. verify the database
 connection is available and a central time helper.
 """
 
-from typing import Tuple
+import base64
+import json
+import uuid
+from typing import Any, Dict, Tuple
 
-from flask import current_app
 from sqlalchemy import text, select
-from datetime import datetime, timezone
+from datetime import datetime, timezone, date
 
-from .models import Reservation, db
+from .config import Config
+from .models import OVERLAP_CONSTRAINT_NAME, Reservation, db
 
 
 class Helpers:
@@ -32,7 +35,7 @@ class Helpers:
             Tuple[bool, str]: '(ready, message)' — 'message' is empty on success.
         """
         try:
-            with current_app.engine.connect().execution_options(timeout=2) as connection:
+            with db.engine.connect() as connection:
                 # Ein sicheres SQL-Statement ausführen
                 connection.execute(text("SELECT 1"))
                 connection.close()
@@ -40,6 +43,47 @@ class Helpers:
         except Exception as e:
             return False, str(e)
 
+    @staticmethod
+    def set_maintenance_timeout(connection: Any = None, local: bool = True) -> None:
+        """Lift the request 'statement_timeout' for the current transaction.
+
+        Schema changes and batch jobs legitimately run longer than a
+        request; they use 'DB_MAINTENANCE_STATEMENT_TIMEOUT_MS' (0 = no
+        limit) until the end of the transaction, like 'SET LOCAL'.
+
+        Args:
+            connection: Connection or session in the transaction, defaults
+                to 'db.session'.
+            local: 'False' sets it for the whole session (autocommit
+                connections); the caller must 'RESET statement_timeout'
+                before returning the connection to the pool.
+        """
+        (connection or db.session).execute(
+            text("SELECT set_config('statement_timeout', :timeout, :local)"),
+            {"timeout": str(Config.DB_MAINTENANCE_STATEMENT_TIMEOUT_MS), "local": local},
+        )
+
+    @staticmethod
+    def get_pool_stats(pool: Any = None) -> Dict[str, Any]:
+        """Return usage statistics of the database connection pool.
+
+        Args:
+            pool: Pool to inspect, defaults to the pool of 'db.engine'.
+
+        Returns:
+            dict: Configured size and overflow, plus the number of checked
+                in/out connections and the current overflow.
+        """
+        if pool is None:
+            pool = db.engine.pool
+        return {
+            "size": pool.size(),
+            "max_overflow": Config.DB_MAX_OVERFLOW,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+
     # def get_any_reservation():
     #     # 1. Abfrage für bis zu 4 Einträge
     #     stmt = select(Reservation).limit(4)
@@ -56,6 +100,26 @@ class Helpers:
     #     else:
     #         return {"message": "Datenbank ist leer"}
 
+    @staticmethod
+    def is_overlap_violation(error: Exception) -> bool:
+        """Check whether a database error stems from the overlap constraint.
+
+        Postgres reports violations of the 'reservations_no_overlap'
+        exclusion constraint with SQLSTATE 23P01 (exclusion_violation).
+
+        Args:
+            error: Exception raised by SQLAlchemy on flush/commit.
+
+        Returns:
+            bool: 'True' if the write was rejected because of an overlap.
+        """
+        orig = getattr(error, "orig", None)
+        if getattr(orig, "sqlstate", None) != "23P01":
+            return False
+        diag = getattr(orig, "diag", None)
+        constraint = getattr(diag, "constraint_name", None)
+        return constraint in (None, OVERLAP_CONSTRAINT_NAME)
+
     @staticmethod
     def get_current_time() -> datetime:
         """Return the current time in UTC.
@@ -63,4 +127,41 @@ class Helpers:
         Returns:
             datetime: timezone-aware 'datetime' in UTC.
         """
-        return datetime.now(timezone.utc)
\ No newline at end of file
+        return datetime.now(timezone.utc)
+
+    @staticmethod
+    def encode_cursor(start_date: date, res_id: uuid.UUID) -> str:
+        """Encode a keyset pagination position as an opaque cursor.
+
+        The cursor points at the last reservation of a page, identified by
+        its sort key '(from, id)'.
+
+        Args:
+            start_date: 'from' date of the last returned reservation.
+            res_id: UUID of the last returned reservation.
+
+        Returns:
+            str: URL-safe base64 string without padding.
+        """
+        raw = json.dumps([start_date.isoformat(), str(res_id)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[date, uuid.UUID]:
+        """Decode a cursor created by 'encode_cursor'.
+
+        Args:
+            cursor: Opaque cursor string from a previous page.
+
+        Returns:
+            Tuple[date, uuid.UUID]: The '(from, id)' position of the cursor.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            start, res_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return date.fromisoformat(start), uuid.UUID(res_id)
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
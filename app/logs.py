@@ -0,0 +1,109 @@
+"""Logging setup.
+
+Log records are written as JSON to stdout. In asynchronous mode
+('LOG_ASYNC') the request thread only puts the record into a bounded
+queue; a background listener thread formats and writes it, so a slow
+stdout consumer does not add latency to requests. When the queue is full
+records are dropped (optionally after blocking for a short time) and
+counted.
+"""
+
+import atexit
+import copy
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict
+
+from flask import Flask
+from pythonjsonlogger import jsonlogger
+
+from .config import Config
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler with a bounded queue and a drop counter.
+
+    Formatting is left to the listener; 'prepare' only merges '%'-style
+    arguments into the message so the record no longer references them.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]", block_timeout: float) -> None:
+        super().__init__(log_queue)
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.block_timeout > 0:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _json_handler() -> logging.Handler:
+    logHandler = logging.StreamHandler()
+    formatter = jsonlogger.JsonFormatter('%(asctime)s %(levelname)s %(name)s %(message)s')
+    logHandler.setFormatter(formatter)
+    return logHandler
+
+
+def init_app(app: Flask) -> None:
+    """Attach the JSON log handler (synchronous or queued) to 'app.logger'.
+
+    Args:
+        app: The Flask application.
+    """
+    stream_handler = _json_handler()
+    if Config.LOG_ASYNC:
+        block_timeout = Config.LOG_QUEUE_BLOCK_TIMEOUT if Config.LOG_QUEUE_POLICY == "block" else 0
+        handler = DroppingQueueHandler(queue.Queue(Config.LOG_QUEUE_SIZE), block_timeout)
+        app.logger.addHandler(handler)
+        app.extensions["log_queue"] = {"handler": handler, "target": stream_handler, "listener": None}
+        start_listener(app)
+        atexit.register(stop_listener, app)
+    else:
+        app.logger.addHandler(stream_handler)
+    app.logger.setLevel(Config.LOG_LEVEL)
+
+
+def start_listener(app: Flask) -> None:
+    """(Re)start the background listener of the log queue.
+
+    Threads do not survive 'fork()', so this is also called in each
+    worker process after forking. The worker gets a fresh queue.
+    """
+    state = app.extensions.get("log_queue")
+    if state is None:
+        return
+    handler: DroppingQueueHandler = state["handler"]
+    handler.queue = queue.Queue(Config.LOG_QUEUE_SIZE)
+    listener = QueueListener(handler.queue, state["target"], respect_handler_level=True)
+    listener.start()
+    state["listener"] = listener
+
+
+def stop_listener(app: Flask) -> None:
+    """Flush the queued records and stop the listener thread."""
+    state = app.extensions.get("log_queue")
+    if state and state["listener"] is not None:
+        state["listener"].stop()
+        state["listener"] = None
+
+
+def get_logging_stats(app: Flask) -> Dict[str, Any]:
+    """Return the mode, queue fill level and number of dropped records."""
+    state = app.extensions.get("log_queue")
+    if state is None:
+        return {"async": False}
+    handler: DroppingQueueHandler = state["handler"]
+    return {"async": True, "queued": handler.queue.qsize(), "dropped": handler.dropped}
@@ -0,0 +1,199 @@
+"""Prometheus-style metrics.
+
+This module keeps per-process histograms and gauges and renders them
+in the Prometheus text exposition format on '/metrics'. Instrumented
+are HTTP requests per route and status, database queries per request
+(via SQLAlchemy cursor events), time spent in 'require_auth', waiting
+for a pooled connection, and the JWKS / token cache counters.
+
+With several gunicorn workers every worker reports its own values.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import QueuePool
+
+from .models import db
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Histogram:
+    """Cumulative histogram with labels."""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[Any, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[Any, ...], value: float) -> None:
+        with self._lock:
+            values = self._values.setdefault(labels, [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    values[i] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        names = self.labels + ("le",)
+        for labels, values in sorted(self._values.items()):
+            for bound, count in zip(self.buckets, values):
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (bound,))} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(names, labels + ('+Inf',))} {values[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {values[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {values[-1]}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are collected from a callback at scrape time."""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str],
+                 collect: Callable[[], Iterable[Tuple[Tuple[Any, ...], float]]]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for labels, value in self.collect():
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status"))
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "Number of SQL statements per HTTP request.", ("route",), COUNT_BUCKETS)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds", "Time spent executing SQL per HTTP request.", ("route",))
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Duration of single SQL statements.")
+AUTH_DURATION = Histogram(
+    "auth_duration_seconds", "Time spent in require_auth.", ("result",))
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time to obtain a pooled database connection.")
+
+
+def _auth_cache_samples() -> Iterable[Tuple[Tuple[Any, ...], float]]:
+    extensions = current_app.extensions
+    if "jwks_store" in extensions:
+        for name, value in extensions["jwks_store"].stats().items():
+            yield ("jwks", name), value
+    if "token_cache" in extensions:
+        for name, value in extensions["token_cache"].stats().items():
+            yield ("token", name), value
+
+
+def _pool_samples() -> Iterable[Tuple[Tuple[Any, ...], float]]:
+    from .helpers import Helpers
+    for name, value in Helpers.get_pool_stats().items():
+        yield (name,), value
+
+
+REGISTRY = [
+    HTTP_REQUEST_DURATION,
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    DB_QUERY_DURATION,
+    AUTH_DURATION,
+    POOL_CHECKOUT_WAIT,
+    Gauge("db_pool_connections", "Connection pool usage.", ("state",), _pool_samples),
+    Gauge("auth_cache", "JWKS key store and verified-token cache counters.", ("cache", "stat"), _auth_cache_samples),
+]
+
+
+def render() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class TimedQueuePool(QueuePool):
+    """'QueuePool' that records how long a connection checkout takes."""
+
+    def connect(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_CHECKOUT_WAIT.observe((), time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    # Startzeit am Execution Context: bei fehlschlagenden Statements (kein
+    # after_cursor_execute) bleibt nichts an der gepoolten Verbindung hängen
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    elapsed = time.perf_counter() - context._metrics_start
+    DB_QUERY_DURATION.observe((), elapsed)
+    if has_request_context():
+        g.metrics_db_queries = g.get("metrics_db_queries", 0) + 1
+        g.metrics_db_time = g.get("metrics_db_time", 0.0) + elapsed
+
+
+def _route() -> str:
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+def init_app(app: Flask) -> None:
+    """Register the request hooks and the SQLAlchemy event listeners.
+
+    Must be called after 'db.init_app(app)'.
+
+    Args:
+        app: The Flask application.
+    """
+
+    @app.before_request
+    def start_timer() -> None:
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response: Any) -> Any:
+        if "metrics_start" in g:
+            route = _route()
+            HTTP_REQUEST_DURATION.observe(
+                (request.method, route, response.status_code), time.perf_counter() - g.metrics_start
+            )
+            DB_QUERIES_PER_REQUEST.observe((route,), g.get("metrics_db_queries", 0))
+            DB_TIME_PER_REQUEST.observe((route,), g.get("metrics_db_time", 0.0))
+        return response
+
+    with app.app_context():
+        # Primary und Read Replicas
+        for engine in db.engines.values():
+            instrument_engine(engine)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record the duration of every statement executed on 'engine'."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
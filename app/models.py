@@ -8,7 +8,8 @@ import uuid
 from datetime import datetime, timezone, date
 from typing import Optional, Dict, Any
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID, ExcludeConstraint
 
 db = SQLAlchemy()
 
@@ -34,6 +35,17 @@ class Reservation(db.Model):
     """
 
     __tablename__ = 'reservations'
+    __table_args__ = (
+        # Filter nach Raum und Zeitraum (auch mit include_deleted)
+        db.Index("ix_reservations_room_from_to", "room_id", "from", "to"),
+        # Standardfall: nur aktive Reservierungen (Listenabfragen)
+        db.Index(
+            "ix_reservations_active_room_from_to", "room_id", "from", "to",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Sortierschlüssel der Keyset Pagination
+        db.Index("ix_reservations_from_id", "from", "id"),
+    )
 
     id: uuid.UUID = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     room_id: uuid.UUID = db.Column(UUID(as_uuid=True), nullable=False)
@@ -60,4 +72,74 @@ class Reservation(db.Model):
         }
         if self.deleted_at:
             res["deleted_at"] = self.deleted_at.isoformat()
-        return res
\ No newline at end of file
+        return res
+
+
+# Überlappungsfreiheit aktiver Reservierungen pro Raum, durch Postgres
+# erzwungen (benötigt die Extension btree_gist für '=' auf UUID).
+# Der zugehörige GiST-Index dient zugleich den Overlap-Abfragen.
+OVERLAP_CONSTRAINT_NAME = "reservations_no_overlap"
+
+Reservation.__table__.append_constraint(ExcludeConstraint(
+    (Reservation.room_id, "="),
+    (func.daterange(Reservation.start_date, Reservation.end_date), "&&"),
+    name=OVERLAP_CONSTRAINT_NAME,
+    using="gist",
+    where=text("deleted_at IS NULL"),
+))
+
+
+class ReservationArchive(db.Model):
+    """Archived reservation (past or soft-deleted), moved out of 'reservations'.
+
+    Same columns as 'Reservation' plus 'archived_at'. Rows are written by
+    the archival job ('app.archive') and are read-only for the API.
+    """
+
+    __tablename__ = 'reservations_archive'
+    __table_args__ = (
+        db.Index("ix_reservations_archive_room_from_to", "room_id", "from", "to"),
+        db.Index("ix_reservations_archive_from_id", "from", "id"),
+    )
+
+    id: uuid.UUID = db.Column(UUID(as_uuid=True), primary_key=True)
+    room_id: uuid.UUID = db.Column(UUID(as_uuid=True), nullable=False)
+
+    start_date: date = db.Column("from", db.Date, nullable=False)
+    end_date: date = db.Column("to", db.Date, nullable=False)
+
+    deleted_at: Optional[datetime] = db.Column(db.DateTime, nullable=True)
+    archived_at: datetime = db.Column(db.DateTime, nullable=False)
+
+    to_dict = Reservation.to_dict
+
+
+class ReservationEvent(db.Model):
+    """Change of a reservation, written in the same transaction as the change.
+
+    The table is the outbox of the change feed ('app.events'); 'id' is
+    the resumable cursor of the feed.
+
+    Attributes:
+        id (int): Monotonic event id (BIGSERIAL).
+        reservation_id (UUID): The changed reservation.
+        room_id (UUID): Room of the reservation after the change.
+        action (str): 'create', 'update', 'restore', 'soft_delete' or 'delete_permanent'.
+        payload (dict): The reservation after the change (before it for 'delete_permanent').
+        created_at (datetime): Time of the change.
+    """
+
+    __tablename__ = 'reservation_events'
+    __table_args__ = (
+        # Feed eines einzelnen Raums
+        db.Index("ix_reservation_events_room_id_id", "room_id", "id"),
+        # Aufräumen alter Events
+        db.Index("ix_reservation_events_created_at", "created_at"),
+    )
+
+    id: int = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    reservation_id: uuid.UUID = db.Column(UUID(as_uuid=True), nullable=False)
+    room_id: uuid.UUID = db.Column(UUID(as_uuid=True), nullable=False)
+    action: str = db.Column(db.String(32), nullable=False)
+    payload: Dict[str, Any] = db.Column(JSONB, nullable=False)
+    created_at: datetime = db.Column(db.DateTime, nullable=False, default=get_current_time)
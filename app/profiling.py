@@ -0,0 +1,182 @@
+"""Opt-in per-request profiling.
+
+When 'PROFILING_ENABLED' is set, the WSGI app is wrapped by
+'ProfilingMiddleware'. A request is profiled if it carries the header
+'X-Profile' with the value of 'PROFILING_TOKEN', or if it is picked by
+'PROFILING_SAMPLE_RATE'. For each profiled request a cProfile dump
+('.prof', readable with 'pstats' or snakeviz) and a JSON summary
+including all SQL statements with their durations (primary and read
+replicas) are written to 'PROFILING_DIR'. Only the newest
+'PROFILING_MAX_FILES' profiles are kept. Streaming responses (the change
+feed and 'stream=true' lists) are never profiled, since the profiler
+buffers the whole body. Since Python 3.12 only one cProfile profiler can
+be active per process, so requests arriving while another one is
+profiled run unprofiled.
+"""
+
+import cProfile
+import hmac
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs
+
+from flask import Flask
+from sqlalchemy import event
+
+from .config import Config
+from .models import db
+
+_local = threading.local()
+# Ab Python 3.12 darf pro Prozess nur ein Profiler aktiv sein
+_profiler_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    if getattr(_local, "statements", None) is not None:
+        # Am Execution Context, nicht an der (gepoolten) Verbindung
+        context._profile_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    statements = getattr(_local, "statements", None)
+    start = getattr(context, "_profile_start", None)
+    if statements is not None and start is not None:
+        elapsed = time.perf_counter() - start
+        statements.append({"statement": statement, "duration": round(elapsed, 6)})
+
+
+def _is_streaming(environ: Dict[str, Any]) -> bool:
+    """Return whether the request asks for a streamed response."""
+    stream = parse_qs(environ.get("QUERY_STRING", "")).get("stream", [""])[-1].lower()
+    if environ.get("PATH_INFO", "").rstrip("/").endswith("/reservations/events"):
+        # Change Feed streamt, außer mit stream=false (Long Polling)
+        return stream != "false"
+    return stream == "true"
+
+
+class ProfilingMiddleware:
+    """WSGI middleware that profiles selected requests."""
+
+    def __init__(self, wsgi_app: Callable[..., Iterable[bytes]], directory: str, token: str,
+                 sample_rate: float, max_files: int) -> None:
+        self.wsgi_app = wsgi_app
+        self.directory = directory
+        self.token = token
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable[..., Any]) -> Iterable[bytes]:
+        if _is_streaming(environ) or not self._should_profile(environ):
+            return self.wsgi_app(environ, start_response)
+        if not _profiler_lock.acquire(blocking=False):
+            # Ein anderer Request wird gerade profiliert
+            return self.wsgi_app(environ, start_response)
+        try:
+            return self._profile(environ, start_response)
+        finally:
+            _profiler_lock.release()
+
+    def _profile(self, environ: Dict[str, Any], start_response: Callable[..., Any]) -> List[bytes]:
+        status_holder: List[str] = []
+
+        def capture_status(status: str, headers: Any, exc_info: Any = None) -> Any:
+            status_holder.append(status)
+            return start_response(status, headers, exc_info)
+
+        profiler = cProfile.Profile()
+        _local.statements = []
+        def run() -> List[bytes]:
+            iterable = self.wsgi_app(environ, capture_status)
+            try:
+                return list(iterable)
+            finally:
+                # WSGI: close() des Bodys aufrufen (call_on_close, Teardown)
+                if hasattr(iterable, "close"):
+                    iterable.close()
+
+        start = time.perf_counter()
+        try:
+            # Body innerhalb des Profilers erzeugen
+            body = profiler.runcall(run)
+        finally:
+            duration = time.perf_counter() - start
+            statements, _local.statements = _local.statements, None
+            self._dump(profiler, environ, status_holder[0] if status_holder else "", duration, statements)
+        return body
+
+    def _should_profile(self, environ: Dict[str, Any]) -> bool:
+        header = environ.get("HTTP_X_PROFILE")
+        if self.token and header and hmac.compare_digest(header, self.token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _dump(self, profiler: cProfile.Profile, environ: Dict[str, Any], status: str,
+              duration: float, statements: List[Dict[str, Any]]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = environ.get("PATH_INFO", "")
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:80]
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{environ.get('REQUEST_METHOD', '')}-{slug}-{uuid.uuid4().hex[:8]}"
+        base = os.path.join(self.directory, name)
+
+        profiler.dump_stats(base + ".prof")
+        with open(base + ".json", "w") as f:
+            json.dump({
+                "method": environ.get("REQUEST_METHOD"),
+                "path": path,
+                "query": environ.get("QUERY_STRING", ""),
+                "status": status,
+                "duration": round(duration, 6),
+                "sql": statements,
+            }, f, indent=2)
+        self._enforce_retention()
+
+    def _enforce_retention(self) -> None:
+        with self._lock:
+            profiles = sorted(
+                (entry for entry in os.scandir(self.directory) if entry.name.endswith(".prof")),
+                key=lambda entry: entry.stat().st_mtime,
+            )
+            for entry in profiles[:max(len(profiles) - self.max_files, 0)]:
+                for suffix in (".prof", ".json"):
+                    try:
+                        os.remove(entry.path[:-len(".prof")] + suffix)
+                    except FileNotFoundError:
+                        pass
+
+
+def init_app(app: Flask) -> Optional[ProfilingMiddleware]:
+    """Wrap 'app.wsgi_app' with the profiler if 'PROFILING_ENABLED' is set.
+
+    Must be called after 'db.init_app(app)'.
+
+    Args:
+        app: The Flask application.
+
+    Returns:
+        The installed middleware, or 'None' if profiling is disabled.
+    """
+    if not Config.PROFILING_ENABLED:
+        return None
+
+    with app.app_context():
+        # Primary und Read Replicas
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    middleware = ProfilingMiddleware(
+        app.wsgi_app,
+        directory=Config.PROFILING_DIR,
+        token=Config.PROFILING_TOKEN,
+        sample_rate=Config.PROFILING_SAMPLE_RATE,
+        max_files=Config.PROFILING_MAX_FILES,
+    )
+    app.wsgi_app = middleware
+    return middleware
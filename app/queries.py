@@ -0,0 +1,218 @@
+"""Pre-built statements for hot queries.
+
+The statements are constructed once with named bind parameters and
+executed with a parameter dictionary. SQLAlchemy then neither rebuilds
+the construct nor recomputes its cache key per request, and every call
+sends the same SQL text, so psycopg can turn it into a server-side
+prepared statement (see 'DB_PREPARE_THRESHOLD'). Lists of ids are bound
+as one array ('= ANY(:ids)') instead of an expanding 'IN', which would
+produce a different SQL text for every list length.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import Date, any_, bindparam, func, literal_column, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+from .etags import watermark_expression
+from .models import Reservation, ReservationArchive
+from .serialization import RESERVATION_COLUMNS
+
+
+def _uuid_array(name: str) -> Any:
+    return bindparam(name, type_=ARRAY(UUID(as_uuid=True)))
+
+
+# Belegte Intervalle mehrerer Räume in einem Zeitfenster (Availability)
+BOOKED_INTERVALS = (
+    select(Reservation.room_id, Reservation.start_date, Reservation.end_date)
+    .where(
+        Reservation.room_id == any_(_uuid_array("room_ids")),
+        Reservation.deleted_at == None,
+        Reservation.start_date < bindparam("window_to"),
+        Reservation.end_date > bindparam("window_from"),
+    )
+    .order_by(Reservation.room_id, Reservation.start_date)
+)
+
+# Bereits vorhandene IDs einer Batch (Create vs. Update)
+KNOWN_IDS = select(Reservation.id, Reservation.room_id, Reservation.deleted_at).where(
+    Reservation.id == any_(_uuid_array("ids"))
+)
+
+# Bereits archivierte IDs einer Batch (schreibgeschützt)
+KNOWN_ARCHIVED_IDS = select(ReservationArchive.id).where(
+    ReservationArchive.id == any_(_uuid_array("ids"))
+)
+
+# Aktive Reservierungen, gegen die eine Batch auf Overlaps geprüft wird
+# (inklusive der Reservierungen, die die Batch selbst aktualisiert)
+BATCH_OVERLAP_CANDIDATES = select(
+    Reservation.id, Reservation.room_id, Reservation.start_date, Reservation.end_date
+).where(
+    Reservation.room_id == any_(_uuid_array("room_ids")),
+    Reservation.deleted_at == None,
+    Reservation.start_date < bindparam("window_to"),
+    Reservation.end_date > bindparam("window_from"),
+)
+
+
+def _list_filters(stmt: Any, model: Any, include_deleted: bool, by_room: bool, after: bool, before: bool,
+                  by_id: bool) -> Any:
+    if not include_deleted:
+        stmt = stmt.where(model.deleted_at == None)
+    if by_room:
+        stmt = stmt.where(model.room_id == any_(_uuid_array("room_ids")))
+    if by_id:
+        stmt = stmt.where(model.id == any_(_uuid_array("ids")))
+    if after:
+        stmt = stmt.where(model.end_date > bindparam("after", type_=Date))
+    if before:
+        stmt = stmt.where(model.start_date < bindparam("before", type_=Date))
+    return stmt
+
+
+def _list_source(include_deleted: bool, by_room: bool, after: bool, before: bool, by_id: bool,
+                 with_archive: bool) -> Tuple[Any, Any]:
+    """Return the filtered select and the columns to order and hash by.
+
+    With 'with_archive' the filtered reservations and archive rows are
+    combined with 'UNION ALL' in a subquery.
+    """
+    filters = (include_deleted, by_room, after, before, by_id)
+    stmt = _list_filters(select(*RESERVATION_COLUMNS), Reservation, *filters)
+    if not with_archive:
+        return stmt, Reservation
+
+    def labeled(model: Any) -> Any:
+        return _list_filters(select(
+            model.id, model.room_id, model.start_date.label("start_date"),
+            model.end_date.label("end_date"), model.deleted_at,
+        ), model, *filters)
+
+    combined = union_all(labeled(Reservation), labeled(ReservationArchive)).subquery("reservations_all")
+    return select(combined), combined.c
+
+
+# Filter der Reservierungsliste -> Bind-Parameter der List-Statements
+_LIST_PARAMS = (("room_id", "room_ids"), ("id", "ids"), ("after", "after"), ("before", "before"))
+
+
+def list_params(filters: Dict[str, Any]) -> Tuple[Dict[str, Any], Tuple[bool, bool, bool, bool], bool]:
+    """Map validated 'LIST_QUERY' filters to the list statements.
+
+    Returns:
+        tuple: The bind parameters, the filter flags passed positionally
+        to 'reservation_list' / 'reservation_list_watermark' and their
+        'by_id' flag.
+    """
+    params = {param: filters[key] for key, param in _LIST_PARAMS if filters[key] is not None}
+    shape = (filters["include_deleted"], "room_ids" in params, "after" in params, "before" in params)
+    return params, shape, "ids" in params
+
+
+@lru_cache(maxsize=None)
+def reservation_list(include_deleted: bool, by_room: bool, after: bool, before: bool,
+                     keyset: bool = False, with_archive: bool = False, by_id: bool = False) -> Any:
+    """Return the list statement for one combination of filters.
+
+    Bind parameters: 'room_ids', 'after', 'before' and with 'by_id'
+    'ids' for the enabled filters ('room_ids' and 'ids' are UUID lists
+    bound as one array each, so any number of values shares the
+    statement); with 'keyset' additionally 'cursor_from', 'cursor_id' and
+    'limit' (ordered by '(from, id)'; pass '(date.min, UUID(int=0))' as
+    cursor for the first page). 'with_archive' includes archived rows.
+    """
+    stmt, source = _list_source(include_deleted, by_room, after, before, by_id, with_archive)
+    if keyset:
+        stmt = (
+            stmt.where(tuple_(source.start_date, source.id) > tuple_(
+                bindparam("cursor_from", type_=Date), bindparam("cursor_id", type_=UUID(as_uuid=True))
+            ))
+            .order_by(source.start_date, source.id)
+            .limit(bindparam("limit"))
+        )
+    return stmt
+
+
+@lru_cache(maxsize=None)
+def reservation_list_watermark(include_deleted: bool, by_room: bool, after: bool, before: bool,
+                               with_archive: bool = False, by_id: bool = False) -> Any:
+    """Return the statement computing the list ETag ('collection_etag') in Postgres for a filter combination."""
+    stmt, source = _list_source(include_deleted, by_room, after, before, by_id, with_archive)
+    return stmt.with_only_columns(watermark_expression(source))
+
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def _occupancy_source(by_room: bool, with_archive: bool) -> Any:
+    """Active reservations intersecting '[window_from, window_to)' as a subquery."""
+    def intersecting(model: Any) -> Any:
+        stmt = select(
+            model.id, model.room_id, model.start_date.label("start_date"), model.end_date.label("end_date"),
+        ).where(
+            model.deleted_at == None,
+            model.start_date < bindparam("window_to", type_=Date),
+            model.end_date > bindparam("window_from", type_=Date),
+        )
+        if by_room:
+            stmt = stmt.where(model.room_id == any_(_uuid_array("room_ids")))
+        return stmt
+
+    if with_archive:
+        return union_all(intersecting(Reservation), intersecting(ReservationArchive)).subquery("occupancy_source")
+    return intersecting(Reservation).subquery("occupancy_source")
+
+
+def _clipped(source: Any) -> Tuple[Any, Any]:
+    """Start and (exclusive) end of each reservation, clipped to the window."""
+    return (
+        func.greatest(source.c.start_date, bindparam("window_from", type_=Date)),
+        func.least(source.c.end_date, bindparam("window_to", type_=Date)),
+    )
+
+
+@lru_cache(maxsize=None)
+def occupancy_by_room(by_room: bool, with_archive: bool = False) -> Any:
+    """Reservations and occupied days per room within the window.
+
+    Bind parameters: 'window_from', 'window_to' and with 'by_room'
+    'room_ids'. Rows: '(room_id, reservations, occupied_days)'.
+    """
+    source = _occupancy_source(by_room, with_archive)
+    start, end = _clipped(source)
+    return (
+        select(
+            source.c.room_id,
+            func.count().label("reservations"),
+            # date - date ergibt in Postgres die Anzahl Tage
+            func.sum(end - start).label("occupied_days"),
+        )
+        .group_by(source.c.room_id)
+        .order_by(source.c.room_id)
+    )
+
+
+@lru_cache(maxsize=None)
+def occupancy_by_period(granularity: str, by_room: bool, with_archive: bool = False) -> Any:
+    """Reservations and occupied days per day, week or month within the window.
+
+    Each reservation is expanded into its occupied days inside the window
+    ('generate_series') and the days are grouped by the truncated period
+    (weeks start on Monday). Bind parameters as for 'occupancy_by_room'.
+    Rows: '(period, reservations, occupied_days)'.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+    source = _occupancy_source(by_room, with_archive)
+    start, end = _clipped(source)
+    day = func.generate_series(start, end - literal_column("1"), literal_column("interval '1 day'")).column_valued("day")
+    period = func.date_trunc(literal_column(f"'{granularity}'"), day).cast(Date).label("period")
+    return (
+        select(period, func.count(source.c.id.distinct()).label("reservations"), func.count().label("occupied_days"))
+        .select_from(source)
+        .group_by(period)
+        .order_by(period)
+    )
@@ -0,0 +1,137 @@
+"""Routing of read-only queries to Postgres read replicas.
+
+With 'DB_REPLICA_URLS' set, each replica becomes a Flask-SQLAlchemy bind
+('replica_0', 'replica_1', ...) with the pool settings of the primary.
+The reservation list, single reservation reads and availability queries
+use 'read_session()' / 'read_query()', which pick one replica per request
+(round robin). Everything else, in particular all writes and the
+lookups before an update or delete, stays on 'db.session' (the primary).
+
+Read-your-writes: every successful write response (any write method
+except the read-only endpoints in 'READ_ONLY_ENDPOINTS') sets the cookie
+'reservations_primary_until' for 'DB_REPLICA_STICKY_SECONDS'; requests
+carrying a valid cookie read from the primary. The cookie works across
+workers and instances, so replication lag stays invisible to the client
+that wrote. The reservation cache must not undo this: sticky requests
+skip cache reads ('is_pinned'), and responses read from a replica are
+not cached, so a stale replica row never ends up in the cache.
+"""
+
+import itertools
+import math
+import time
+from typing import Any, Dict, List, Mapping, Optional
+
+from flask import Flask, Response, current_app, g, request
+from flask.globals import app_ctx
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+from .config import Config
+from .models import db
+
+STICKY_COOKIE = "reservations_primary_until"
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# POST-Endpunkte, die nur lesen: kein Read-your-writes-Cookie
+READ_ONLY_ENDPOINTS = frozenset({"main.search_reservations"})
+
+_counter = itertools.count()
+
+
+def replica_binds() -> Dict[str, str]:
+    """Return the 'SQLALCHEMY_BINDS' entries of the configured replicas."""
+    return {f"replica_{i}": url for i, url in enumerate(Config.DB_REPLICA_URLS)}
+
+
+def is_sticky(cookies: Mapping[str, str], now: Optional[float] = None) -> bool:
+    """Return whether the client wrote recently and must read from the primary."""
+    try:
+        return float(cookies.get(STICKY_COOKIE, 0)) > (now or time.time())
+    except ValueError:
+        return False
+
+
+def mark_written(resp: Any) -> None:
+    """Set the read-your-writes cookie on a successful write response."""
+    if not Config.DB_REPLICA_URLS or Config.DB_REPLICA_STICKY_SECONDS <= 0:
+        return
+    until = time.time() + Config.DB_REPLICA_STICKY_SECONDS
+    resp.set_cookie(
+        STICKY_COOKIE, f"{until:.3f}",
+        max_age=math.ceil(Config.DB_REPLICA_STICKY_SECONDS),
+        path="/api/v3/reservations", httponly=True, samesite="Lax",
+    )
+
+
+def uses_replica() -> bool:
+    """Return whether reads of the current request go to a replica.
+
+    False if no replicas are configured or the client is within its
+    read-your-writes window.
+    """
+    return bool(current_app.extensions.get("replica_sessions")) and not is_sticky(request.cookies)
+
+
+def is_pinned() -> bool:
+    """Return whether replicas are configured and the client wrote recently.
+
+    Such requests read from the primary and must not be answered from the
+    reservation cache.
+    """
+    return bool(current_app.extensions.get("replica_sessions")) and is_sticky(request.cookies)
+
+
+def read_session() -> Any:
+    """Return the session for read-only queries of the current request."""
+    if not uses_replica():
+        return db.session
+    sessions: List[scoped_session] = current_app.extensions["replica_sessions"]
+    if "replica_index" not in g:
+        g.replica_index = next(_counter) % len(sessions)
+    return sessions[g.replica_index]
+
+
+def read_query(model: Any) -> Any:
+    """Return a query on 'model' in the 'read_session()'.
+
+    On the primary this is 'model.query', like in the routes without replicas.
+    """
+    if not uses_replica():
+        return model.query
+    return read_session().query(model)
+
+
+def init_app(app: Flask) -> None:
+    """Create the replica sessions and the read-your-writes hook.
+
+    Must be called after 'db.init_app(app)' with the replica binds in
+    'SQLALCHEMY_BINDS'.
+
+    Args:
+        app: The Flask application.
+    """
+    if not Config.DB_REPLICA_URLS:
+        return
+
+    with app.app_context():
+        engines = [db.engines[key] for key in replica_binds()]
+    # Eigene Sessions pro Replica, gebunden an den App Context wie db.session
+    app.extensions["replica_sessions"] = [
+        scoped_session(
+            sessionmaker(bind=engine, class_=Session),
+            scopefunc=lambda: id(app_ctx._get_current_object()),
+        )
+        for engine in engines
+    ]
+
+    @app.teardown_appcontext
+    def remove_replica_sessions(exc: Any) -> None:
+        for session in app.extensions["replica_sessions"]:
+            session.remove()
+
+    @app.after_request
+    def set_sticky_cookie(resp: Response) -> Response:
+        if request.method in WRITE_METHODS and request.endpoint not in READ_ONLY_ENDPOINTS and resp.status_code < 400:
+            mark_written(resp)
+        return resp
@@ -4,15 +4,33 @@ This module registers the 'main' blueprint and exposes health/status
 endpoints and CRUD endpoints for reservations.
 """
 
-from typing import Any
+import time
+from typing import Any, Dict, Iterator, Optional
 
-from flask import Blueprint, jsonify, make_response, current_app, request, Response
+from flask import Blueprint, jsonify, make_response, current_app, request, Response, stream_with_context
 import uuid
-from datetime import datetime
+from datetime import date
+from itertools import islice
+from sqlalchemy.exc import IntegrityError
 
+from . import queries
+from .config import Config
 from .helpers import Helpers
-from .models import Reservation, db
-from .auth import require_auth
+from .models import Reservation, ReservationArchive, db
+from .etags import collection_etag, page_etag, reservation_etag
+from .serialization import reservation_row
+from .auth import get_token_cache, require_auth
+from .cache import get_reservation_cache
+from .archive import list_needs_archive, unarchive
+from .availability import get_availability
+from .bulk import iter_ndjson, upsert_reservations
+from .events import fetch_events, format_sse, get_event_notifier, latest_event_id, record_event
+from .health import get_health_monitor
+from .replicas import is_pinned, read_query, read_session, uses_replica
+from .statistics import get_occupancy
+from .validation import AVAILABILITY_QUERY, LIST_QUERY, RESERVATION_PROTOTYPE, STATISTICS_QUERY, ValidationError
+from .logs import get_logging_stats
+from .metrics import render as render_metrics
 
 main_bp = Blueprint('main', __name__)
 
@@ -37,6 +55,75 @@ def error_resp(code: str, msg: str, logUUID: uuid.UUID, status: int = 400, more_
         "trace": str(logUUID)
     }), status)
 
+def validation_error_resp(e: ValidationError) -> Response:
+    """Create the standardized '400' response for invalid request input."""
+    return error_resp("bad_request", e.message, str(uuid.uuid4()), 400, e.more_info)
+
+def _commit_or_overlap(action: Optional[str] = None, res: Any = None) -> Optional[Response]:
+    """Commit the session and map overlap violations to an error response.
+
+    Overlapping reservations are rejected by the 'reservations_no_overlap'
+    exclusion constraint, so no separate overlap query is needed.
+
+    Args:
+        action: Change feed action recorded for 'res' in the same transaction.
+        res: The changed reservation.
+
+    Returns:
+        'None' on success, otherwise the "Overlap detected" error response.
+    """
+    try:
+        if action is not None:
+            record_event(action, res)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if not Helpers.is_overlap_violation(e):
+            raise
+        return error_resp("bad_request", "Overlap detected", str(uuid.uuid4()), 400, "The requested reservation overlaps with an existing reservation.")
+    return None
+
+def _not_modified(etag: str) -> Response:
+    """Create an empty '304 Not Modified' response carrying 'etag'."""
+    resp = make_response("", 304)
+    resp.set_etag(etag)
+    return resp
+
+def _check_if_match(res: Any) -> Optional[Response]:
+    """Validate the 'If-Match' header against the reservation's ETag.
+
+    Returns:
+        'None' if the header is absent or matches, otherwise a 412 error.
+    """
+    if request.if_match and not request.if_match.contains(reservation_etag(res)):
+        return error_resp("precondition_failed", "Precondition failed", str(uuid.uuid4()), 412, "The reservation has been modified (ETag mismatch).")
+    return None
+
+def _cached_response(entry: Dict[str, str]) -> Response:
+    """Build a response (or '304') from a cached body and ETag."""
+    if request.if_none_match.contains_weak(entry["etag"]):
+        return _not_modified(entry["etag"])
+    resp = current_app.response_class(entry["body"], mimetype="application/json")
+    resp.set_etag(entry["etag"])
+    return resp
+
+def _get_archived(res_id: uuid.UUID, replica: bool = False) -> Optional[Any]:
+    """Return the archived reservation 'res_id' if archiving is enabled.
+
+    With 'replica' the lookup may be served by a read replica.
+    """
+    if not Config.ARCHIVE_ENABLED:
+        return None
+    query = read_query(ReservationArchive) if replica else ReservationArchive.query
+    return query.get(res_id)
+
+def _parse_uuid(value: Optional[str]) -> Optional[uuid.UUID]:
+    """Parse 'value' as UUID, returning 'None' if it is missing or invalid."""
+    try:
+        return uuid.UUID(value) if value else None
+    except ValueError:
+        return None
+
 # --- ROUTES ---
 # --- STATUS AND HEALTHCHECK ENDPOINTS ---
 
@@ -54,12 +141,12 @@ def get_health() -> Response:
     """Perform a combined liveness/readiness check including DB.
 
     Returns a JSON object describing liveness, readiness and database
-    connectivity. On failure, logs a traceable UUID and returns a
-    standardized error response.
+    connectivity as of the last background check. On failure, logs a
+    traceable UUID and returns a standardized error response.
     """
-    # Check DB Connection
+    # Check DB Connection (letztes Ergebnis des Health Monitors)
     try:
-        readyness, db_error = Helpers.getDatabaseReady()
+        readyness, db_error = get_health_monitor().database_status()
         if readyness:
             return jsonify({
                 "live": True,
@@ -112,10 +199,11 @@ def get_readiness() -> Response:
     """Readiness probe that confirms the service can handle requests.
 
     For this service readiness includes a successful database
-    connection check.
+    connection check (served from the background health monitor) and a
+    connection pool that is not saturated.
     """
     try:
-        readyness, db_error = Helpers.getDatabaseReady()
+        readyness, db_error = get_health_monitor().readiness()
         if readyness:
             return jsonify({
                 "ready": True,
@@ -136,47 +224,161 @@ def get_readiness() -> Response:
         return error_resp("service_unavailable", "Readiness check failed",logUUID, 503, str(e))
     
 
+@main_bp.route('/api/v3/reservations/diagnostics', methods=['GET'])
+def get_diagnostics() -> Response:
+    """Return runtime statistics of this worker process.
+
+    Reports the usage of the database connection pool, the last database
+    health check, the hit/miss counters of the verified-token cache, the
+    state of the log queue and of the change feed listener.
+    """
+    return jsonify({
+        "pool": Helpers.get_pool_stats(),
+        "health": get_health_monitor().stats(),
+        "auth": {"token_cache": get_token_cache().stats()},
+        "logging": get_logging_stats(current_app),
+        "events": get_event_notifier().stats(),
+    })
+
+
+@main_bp.route('/metrics', methods=['GET'])
+def get_metrics() -> Response:
+    """Expose the metrics of this worker in Prometheus text format."""
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
 # --- RESERVATIONS ENDPOINTS ---
 
 @main_bp.route('/api/v3/reservations/reservations', methods=['GET'])
 def get_reservations() -> Response:
     """Retrieve reservations with optional query filters.
 
+    Responses carry an 'ETag'; a matching 'If-None-Match' is answered with
+    '304 Not Modified'.
+
     Supported query parameters:
       - include_deleted: if 'true', include soft-deleted reservations
-      - room_id: filter by room UUID
+      - room_id: filter by room UUID, may be given multiple times
+      - id: only these reservation UUIDs, may be given multiple times
       - before: ISO date string to filter reservations starting before this date
       - after: ISO date string to filter reservations ending after this date
+      - limit: maximum page size; enables keyset pagination ordered by '(from, id)'
+      - cursor: opaque 'next_cursor' value of the previous page
+      - stream: if 'true', stream the result as chunked JSON array
 
     Returns:
-        JSON response containing the 'reservations' list.
+        JSON response containing the 'reservations' list and, for paginated
+        requests with further results, a 'next_cursor'.
     """
-    results = []
+    # Filter vor jeder DB-Abfrage validieren
     try:
-        # Query Params
-        include_deleted = request.args.get("include_deleted", "false").lower() == "true"
-        room_id = request.args.get("room_id")
-        before = request.args.get("before")
-        after = request.args.get("after")
-        
-        query = Reservation.query
-
-        if not include_deleted:
-            query = query.filter(Reservation.deleted_at == None)
-        
-        if room_id:
-            query = query.filter(Reservation.room_id == room_id)
-
-        if after:
-            after_date = datetime.fromisoformat(after).date()
-            query = query.filter(Reservation.end_date > after_date)
+        filters = LIST_QUERY.validate(request.args)
+    except ValidationError as e:
+        return validation_error_resp(e)
+    return _list_reservations(filters)
+
+@main_bp.route('/api/v3/reservations/reservations/search', methods=['POST'])
+def search_reservations() -> Response:
+    """Retrieve reservations with the list filters given as JSON body.
+
+    Accepts the filters of 'get_reservations' as a JSON object, with
+    'room_id' and 'id' as arrays, e.g. for id lists too long for a URL.
+    'limit', 'cursor' and 'stream' are still read from the query string.
+    """
+    try:
+        filters = LIST_QUERY.validate(request.get_json(silent=True))
+    except ValidationError as e:
+        return validation_error_resp(e)
+    return _list_reservations(filters)
 
-        if before:
-            before_date = datetime.fromisoformat(before).date()
-            query = query.filter(Reservation.start_date < before_date)
+def _list_reservations(filters: Dict[str, Any]) -> Response:
+    """Answer a list request for validated 'LIST_QUERY' filters."""
+    results = []
+    try:
+        include_deleted = filters["include_deleted"]
+        room_ids = filters["room_id"]
+        ids = filters["id"]
+        after_date = filters["after"]
+        before_date = filters["before"]
 
-        results = [r.to_dict() for r in query.all()]
-        return jsonify({"reservations": results})
+        # Query Params
+        limit = request.args.get("limit")
+        cursor = request.args.get("cursor")
+        stream = request.args.get("stream", "false").lower() == "true"
+
+        # Pagination Params vor der DB-Abfrage validieren
+        try:
+            if limit is not None:
+                limit = int(limit)
+                if not 1 <= limit <= Config.RESERVATIONS_PAGE_MAX_LIMIT:
+                    raise ValueError(f"limit must be between 1 and {Config.RESERVATIONS_PAGE_MAX_LIMIT}")
+            elif cursor and not stream:
+                limit = Config.RESERVATIONS_PAGE_DEFAULT_LIMIT
+            cursor_pos = Helpers.decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return error_resp("bad_request", "Invalid pagination parameters", str(uuid.uuid4()), 400, str(e))
+
+        # Vorab gebautes Statement je Filterkombination (app/queries.py),
+        # nur lesend und daher ggf. von einer Read Replica
+        params, shape, by_id = queries.list_params(filters)
+        with_archive = list_needs_archive(include_deleted, after_date)
+        session = read_session()
+        from_replica = uses_replica()
+
+        if limit is None and cursor_pos is None and not stream:
+            # Read-through Cache für Listen genau eines Raums
+            cache = get_reservation_cache()
+            cache_room = room_ids[0] if room_ids and len(room_ids) == 1 and not ids else None
+            # Key (Generation des Raums) vor der Abfrage bestimmen, damit ein
+            # parallel geschriebener Stand nicht unter der neuen Generation landet
+            cache_key = cache.room_list_key(cache_room, (include_deleted, before_date, after_date)) if cache_room else None
+            # Nach eigenen Writes kein Cache (Read-your-writes)
+            if cache_key and not is_pinned():
+                cached = cache.get_room_list(cache_key)
+                if cached:
+                    return _cached_response(cached)
+
+            # Conditional Request: Watermark in Postgres statt kompletter Liste
+            if request.if_none_match:
+                watermark = session.execute(
+                    queries.reservation_list_watermark(*shape, with_archive=with_archive, by_id=by_id), params
+                ).scalar()
+                if request.if_none_match.contains_weak(watermark):
+                    return _not_modified(watermark)
+
+            rows = session.execute(queries.reservation_list(*shape, with_archive=with_archive, by_id=by_id), params).all()
+            results = [reservation_row(r) for r in rows]
+            resp = jsonify({"reservations": results})
+            etag = collection_etag(rows)
+            resp.set_etag(etag)
+            # Nur Ergebnisse der Primary cachen, nie evtl. veraltete der Replica
+            if cache_key and not from_replica:
+                cache.set_room_list(cache_key, resp.get_data(as_text=True), etag)
+            return resp
+
+        # Keyset Pagination über den Sortierschlüssel (from, id)
+        query = queries.reservation_list(*shape, keyset=True, with_archive=with_archive, by_id=by_id)
+        params["cursor_from"], params["cursor_id"] = cursor_pos or (date.min, uuid.UUID(int=0))
+
+        if stream:
+            params["limit"] = limit
+            return Response(stream_with_context(_stream_reservations(session, query, params)), mimetype="application/json")
+
+        params["limit"] = limit + 1
+        page = session.execute(query, params).all()
+        # ETag nur über die ausgelieferten Zeilen, nicht über die Zeile limit + 1
+        etag = page_etag(page[:limit], len(page) > limit)
+        if request.if_none_match.contains_weak(etag):
+            return _not_modified(etag)
+
+        results = [reservation_row(r) for r in page[:limit]]
+        body = {"reservations": results}
+        if len(page) > limit:
+            last = page[limit - 1]
+            body["next_cursor"] = Helpers.encode_cursor(last.start_date, last.id)
+        resp = jsonify(body)
+        resp.set_etag(etag)
+        return resp
     
     except Exception as e:
         logUUID = uuid.uuid4()
@@ -190,6 +392,125 @@ def get_reservations() -> Response:
 
         return error_resp("internal_error", "Error fetching reservations", logUUID, 500, str(e))
 
+def _stream_reservations(session: Any, query: Any, params: Dict[str, Any]) -> Iterator[str]:
+    """Yield the reservations of 'query' as chunks of one JSON document.
+
+    Rows are fetched through a server-side cursor ('yield_per') and
+    emitted in batches of 'RESERVATIONS_STREAM_CHUNK_SIZE', so memory use
+    does not grow with the size of the result.
+    """
+    chunk_size = Config.RESERVATIONS_STREAM_CHUNK_SIZE
+    yield '{"reservations":['
+    separator = ""
+    try:
+        result = session.execute(query, params, execution_options={"yield_per": chunk_size})
+        for partition in result.partitions():
+            yield separator + ",".join(current_app.json.dumps(reservation_row(r)) for r in partition)
+            separator = ","
+    except Exception as e:
+        # Header sind bereits gesendet; Abbruch nur noch loggen
+        current_app.logger.error("Error streaming reservations", extra={
+            "event.action": "get_reservations",
+            "error.message": str(e),
+            "trace.id": uuid.uuid4(),
+            "service.name": "reservations-api"
+        })
+        raise
+    yield ']}'
+
+@main_bp.route('/api/v3/reservations/events', methods=['GET'])
+def get_reservation_events() -> Response:
+    """Change feed of created, updated, restored and deleted reservations.
+
+    Events are streamed as server-sent events ('text/event-stream'), each
+    with its id as SSE 'id', the action as 'event' and the event as JSON
+    'data'. The stream ends after 'EVENTS_STREAM_MAX_SECONDS'; clients
+    reconnect with 'Last-Event-ID' and continue without gaps.
+
+    Supported query parameters:
+      - after: event id to resume after (default: the 'Last-Event-ID'
+        header; without either only new events are returned)
+      - room_id: only events of this room
+      - stream: if 'false', long-poll instead: wait up to 'timeout'
+        seconds (at most 'EVENTS_LONG_POLL_TIMEOUT') for events and
+        return them as JSON with the 'next_cursor' to pass as 'after'
+
+    Returns:
+        The event stream, or for long-polling a JSON object with 'events'
+        and 'next_cursor'.
+    """
+    if not Config.EVENTS_ENABLED:
+        return error_resp("not_found", "Not found", str(uuid.uuid4()), 404, "The change feed is disabled.")
+    try:
+        after = request.args.get("after") or request.headers.get("Last-Event-ID")
+        after = int(after) if after else None
+        if after is not None and after < 0:
+            raise ValueError("after must not be negative")
+        room_id = _parse_uuid(request.args.get("room_id"))
+        if request.args.get("room_id") and room_id is None:
+            raise ValueError("room_id is not a valid UUID")
+        timeout = float(request.args.get("timeout", Config.EVENTS_LONG_POLL_TIMEOUT))
+        timeout = min(max(timeout, 0), Config.EVENTS_LONG_POLL_TIMEOUT)
+    except ValueError as e:
+        return error_resp("bad_request", "Invalid Input", str(uuid.uuid4()), 400, str(e))
+    stream = request.args.get("stream", "true").lower() == "true"
+
+    if after is None:
+        after = latest_event_id()
+    if not stream:
+        return jsonify(_poll_events(after, room_id, timeout))
+
+    return Response(
+        stream_with_context(_stream_events(after, room_id)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _poll_events(after: int, room_id: Optional[uuid.UUID], timeout: float) -> Dict[str, Any]:
+    """Return the events after 'after', waiting up to 'timeout' seconds for some."""
+    notifier = get_event_notifier()
+    deadline = time.monotonic() + timeout
+    while True:
+        # Zähler vor der Abfrage lesen, damit kein NOTIFY verloren geht
+        version = notifier.version
+        events = fetch_events(after, room_id)
+        remaining = deadline - time.monotonic()
+        if events or remaining <= 0:
+            break
+        # Verbindung während des Wartens an den Pool zurückgeben
+        db.session.close()
+        notifier.wait(version, remaining)
+    return {"events": events, "next_cursor": events[-1]["id"] if events else after}
+
+def _stream_events(after: int, room_id: Optional[uuid.UUID]) -> Iterator[str]:
+    """Yield the events after 'after' as server-sent events until the stream expires.
+
+    Between queries no database connection is held; a comment line is
+    sent every 'EVENTS_HEARTBEAT_INTERVAL' seconds without events so
+    proxies keep the connection open.
+    """
+    notifier = get_event_notifier()
+    dumps = current_app.json.dumps
+    now = time.monotonic()
+    deadline = now + Config.EVENTS_STREAM_MAX_SECONDS
+    last_sent = now
+    # 'id' ohne 'data' setzt bei EventSource nur die Last-Event-ID
+    yield f"id: {after}\n\n"
+    while now < deadline:
+        version = notifier.version
+        events = fetch_events(after, room_id)
+        db.session.close()
+        if events:
+            after = events[-1]["id"]
+            last_sent = time.monotonic()
+            yield "".join(format_sse(e, dumps) for e in events)
+        else:
+            if time.monotonic() - last_sent >= Config.EVENTS_HEARTBEAT_INTERVAL:
+                last_sent = time.monotonic()
+                yield ": keepalive\n\n"
+            notifier.wait(version, max(min(Config.EVENTS_HEARTBEAT_INTERVAL, deadline - time.monotonic()), 0))
+        now = time.monotonic()
+
 @main_bp.route('/api/v3/reservations/reservations', methods=['POST'])
 def create_reservation() -> Response:
     """Create a new reservation from JSON request body.
@@ -205,35 +526,28 @@ def create_reservation() -> Response:
         201 Created with the reservation payload and 'Location' header on success
         or a standardized error response on failure.
     """
-    data = request.json
     try:
-        req_from = datetime.fromisoformat(data["from"]).date()
-        req_to = datetime.fromisoformat(data["to"]).date()
-        room_id = uuid.UUID(data["room_id"])
-        
-        if req_from >= req_to:
-            return error_resp("bad_request", "From must be before To", str(uuid.uuid4()), 400, "'from' date must be before 'to' date")
-    except (KeyError, ValueError, TypeError) as e:
-        return error_resp("bad_request", "Invalid Input", str(uuid.uuid4()), 400, str(e))
-
-    # Overlap Check via DB (SQLAlchemy)
-    overlap = Reservation.query.filter(
-        Reservation.room_id == room_id,
-        Reservation.deleted_at == None,
-        Reservation.start_date < req_to,
-        Reservation.end_date > req_from
-    ).first()
-
-    if overlap:
-        return error_resp("bad_request", "Overlap detected", str(uuid.uuid4()), 400, "The requested reservation overlaps with an existing reservation.")
-
+        prototype = RESERVATION_PROTOTYPE.validate(request.get_json(silent=True))
+    except ValidationError as e:
+        return validation_error_resp(e)
+    return _create_reservation(prototype)
+
+def _create_reservation(prototype: Dict[str, Any]) -> Response:
+    """Insert a validated reservation prototype (see 'RESERVATION_PROTOTYPE')."""
+    room_id = prototype["room_id"]
     new_res = Reservation(
         room_id=room_id,
-        start_date=req_from,
-        end_date=req_to
+        start_date=prototype["from"],
+        end_date=prototype["to"]
     )
     db.session.add(new_res)
-    db.session.commit()
+
+    # Overlap Check durch das Exclusion Constraint in Postgres
+    overlap_resp = _commit_or_overlap("create", new_res)
+    if overlap_resp is not None:
+        return overlap_resp
+
+    get_reservation_cache().invalidate([new_res.id], [room_id])
 
     current_app.logger.info("Reservation created", extra={
         "event.action": "create",
@@ -245,12 +559,134 @@ def create_reservation() -> Response:
 
     resp = make_response(jsonify(new_res.to_dict()), 201)
     resp.headers['Location'] = f"/api/v3/reservations/reservations/{new_res.id}"
+    resp.set_etag(reservation_etag(new_res))
     return resp
 
+@main_bp.route('/api/v3/reservations/reservations/batch', methods=['POST'])
+@require_auth
+def create_reservations_batch() -> Response:
+    """Create or update many reservations in one transaction.
+
+    The body is either a JSON array of reservation prototypes or, with
+    'Content-Type: application/x-ndjson', one prototype per line. A
+    prototype may carry an 'id'; existing reservations with that id are
+    updated, all others are created. Overlaps are checked for the whole
+    batch at once, against the database and within the batch.
+
+    Returns:
+        200 with one result per item ('status' 201, 200 or 400) and the
+        'created', 'updated' and 'failed' counts.
+    """
+    try:
+        if request.mimetype == "application/x-ndjson":
+            raw_items = iter_ndjson(request.stream)
+        else:
+            raw_items = request.get_json(silent=True)
+            if not isinstance(raw_items, list):
+                raise ValueError("Body must be a JSON array or NDJSON")
+        raw_items = list(islice(raw_items, Config.BULK_MAX_ITEMS + 1))
+    except ValueError as e:
+        return error_resp("bad_request", "Invalid Input", str(uuid.uuid4()), 400, str(e))
+
+    if len(raw_items) > Config.BULK_MAX_ITEMS:
+        return error_resp("payload_too_large", "Batch too large", str(uuid.uuid4()), 413, f"At most {Config.BULK_MAX_ITEMS} items per batch")
+
+    try:
+        result = upsert_reservations(raw_items)
+    except IntegrityError as e:
+        db.session.rollback()
+        if not Helpers.is_overlap_violation(e):
+            raise
+        # Konkurrierender Schreibzugriff nach dem Overlap-Check
+        return error_resp("bad_request", "Overlap detected", str(uuid.uuid4()), 400, "The batch overlaps with a reservation written concurrently.")
+
+    current_app.logger.info("Reservations imported", extra={
+        "event.action": "BULK_UPSERT",
+        "resource.type": "reservation",
+        "resource.count": result["created"] + result["updated"],
+        "user.id": getattr(request, 'user_id', 'anonymous'),
+        "service.name": "reservations-api"
+    })
+
+    return jsonify(result)
+
+@main_bp.route('/api/v3/reservations/availability', methods=['GET'])
+def get_room_availability() -> Response:
+    """Return the free intervals of one or more rooms in a date window.
+
+    Query parameters:
+      - room_id: room UUID, may be given multiple times
+      - from: start of the window (ISO date, inclusive)
+      - to: end of the window (ISO date, exclusive)
+
+    Returns:
+        JSON response with one 'availability' entry per room listing its
+        free '[from, to)' intervals.
+    """
+    try:
+        window = AVAILABILITY_QUERY.validate(request.args)
+        if (window["to"] - window["from"]).days > Config.AVAILABILITY_MAX_DAYS:
+            raise ValidationError(f"The window must not exceed {Config.AVAILABILITY_MAX_DAYS} days")
+    except ValidationError as e:
+        return validation_error_resp(e)
+
+    try:
+        return jsonify({"availability": get_availability(window["room_id"], window["from"], window["to"])})
+    except Exception as e:
+        logUUID = uuid.uuid4()
+
+        current_app.logger.error("Error fetching availability", extra={
+            "event.action": "get_availability",
+            "error.message": str(e),
+            "trace.id": logUUID,
+            "service.name": "reservations-api"
+        })
+
+        return error_resp("internal_error", "Error fetching availability", logUUID, 500, str(e))
+
+@main_bp.route('/api/v3/reservations/statistics', methods=['GET'])
+def get_statistics() -> Response:
+    """Return occupancy statistics of rooms in a date window.
+
+    Query parameters:
+      - from: start of the window (ISO date, inclusive)
+      - to: end of the window (ISO date, exclusive)
+      - room_id: room UUID, may be given multiple times (default: all
+        rooms with reservations in the window)
+      - granularity: 'day', 'week' or 'month' (default) for 'periods'
+
+    Returns:
+        JSON response with reservations, occupied days and utilization
+        per room ('rooms'), per period ('periods') and in total ('totals').
+    """
+    try:
+        window = STATISTICS_QUERY.validate(request.args)
+        if (window["to"] - window["from"]).days > Config.STATISTICS_MAX_DAYS:
+            raise ValidationError(f"The window must not exceed {Config.STATISTICS_MAX_DAYS} days")
+    except ValidationError as e:
+        return validation_error_resp(e)
+
+    try:
+        return jsonify(get_occupancy(window["room_id"], window["from"], window["to"], window["granularity"]))
+    except Exception as e:
+        logUUID = uuid.uuid4()
+
+        current_app.logger.error("Error computing statistics", extra={
+            "event.action": "get_statistics",
+            "error.message": str(e),
+            "trace.id": logUUID,
+            "service.name": "reservations-api"
+        })
+
+        return error_resp("internal_error", "Error computing statistics", logUUID, 500, str(e))
+
 @main_bp.route('/api/v3/reservations/reservations/<string:res_id>', methods=['GET'])
 def get_reservation(res_id: str) -> Response:
     """Return a single reservation by its UUID string.
 
+    The response carries an 'ETag'; a matching 'If-None-Match' is answered
+    with '304 Not Modified'.
+
     Args:
         res_id: Reservation ID as string (UUID format).
     """
@@ -260,84 +696,104 @@ def get_reservation(res_id: str) -> Response:
         # Ungültige UUID
         return error_resp("bad_request", "Not found", str(uuid.uuid4()), 404)
 
-    res = Reservation.query.get(valid_uuid)
-    
+    cache = get_reservation_cache()
+    # Nach eigenen Writes kein Cache (Read-your-writes)
+    cached = None if is_pinned() else cache.get_reservation(valid_uuid)
+    if cached:
+        return _cached_response(cached)
+
+    res = read_query(Reservation).get(valid_uuid) or _get_archived(valid_uuid, replica=True)
+    from_replica = uses_replica()
+    if not res and from_replica:
+        # Die Replica kennt eine gerade angelegte Reservierung evtl. noch nicht
+        res = Reservation.query.get(valid_uuid) or _get_archived(valid_uuid)
+        from_replica = False
+
     if not res:
         # Ungültige Reservation ID
         return error_resp("bad_request", "Not found", str(uuid.uuid4()), 404)
-        
-    return jsonify(res.to_dict())
+
+    etag = reservation_etag(res)
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+
+    resp = jsonify(res.to_dict())
+    resp.set_etag(etag)
+    # Nur Ergebnisse der Primary cachen, nie evtl. veraltete der Replica
+    if not from_replica:
+        cache.set_reservation(valid_uuid, resp.get_data(as_text=True), etag)
+    return resp
 
 @main_bp.route('/api/v3/reservations/reservations/<string:res_id>', methods=['PUT'])
 def update_reservation_endpoint(res_id):
-    data = request.json
+    data = request.get_json(silent=True)
     try:
         valid_uuid = uuid.UUID(res_id)
     except ValueError:
         return error_resp("not_found", "Invalid reservation UUID", str(uuid.uuid4()), 400)
-    
+
+    # Eingabe vor DB-Zugriff und Authentifizierung validieren
+    wants_restore = isinstance(data, dict) and "deleted_at" in data and data["deleted_at"] is None
+    try:
+        prototype = RESERVATION_PROTOTYPE.validate(data)
+    except ValidationError as e:
+        # Spec: Restore nur mit vollständigem Prototype
+        if wants_restore and any(k not in data for k in ("room_id", "from", "to")):
+            return error_resp("bad_request", "Prototype required to restore (room_id, from, to)", str(uuid.uuid4()), 400)
+        return validation_error_resp(e)
 
     existing = Reservation.query.get(valid_uuid)
 
     # Neue Reservation erstellen, wenn nicht existent
     if not existing:
-        return create_reservation()
-
-    return update_reservation(existing, data)
+        archived = _get_archived(valid_uuid)
+        # Archivierte gelöschte Reservierungen werden beim Restore zurückverschoben
+        if archived and wants_restore and archived.deleted_at:
+            return update_reservation(unarchive(archived), prototype, wants_restore, archived)
+        if archived:
+            return error_resp("not_found", "Not found", str(uuid.uuid4()), 400, "Reservation is archived and can no longer be modified.")
+        if request.if_match:
+            return error_resp("precondition_failed", "Precondition failed", str(uuid.uuid4()), 412, "The reservation does not exist.")
+        return _create_reservation(prototype)
+
+    return update_reservation(existing, prototype, wants_restore)
 
 @require_auth
-def update_reservation(existing, data):
+def update_reservation(existing, prototype, wants_restore, archived=None):
+
+    precondition_resp = _check_if_match(existing)
+    if precondition_resp is not None:
+        return precondition_resp
 
-    wants_restore = ("deleted_at" in data and data["deleted_at"] is None)
     if existing.deleted_at and not wants_restore:
         return error_resp("not_found", "Not found", str(uuid.uuid4()), 400, "Reservation does not exist or is deleted.")
-    
-    # Wenn restore gewünscht und Reservation existiert & ist deleted:
-    if existing.deleted_at is not None and wants_restore:
-        # Spec: Prototype muss enthalten sein
-        for k in ("room_id", "from", "to"):
-            if k not in data:
-                return error_resp("bad_request", "Prototype required to restore (room_id, from, to)", str(uuid.uuid4()), 400)
-            
-    # Die Reservierung existiert (ggf. gelöscht), aber ein Update ist gewünscht
-    try:
-        req_from = datetime.fromisoformat(data['from']).date()
-        req_to = datetime.fromisoformat(data['to']).date()
-        room_id = uuid.UUID(data['room_id'])
-        
-        if req_from >= req_to:
-            return error_resp("bad_request", "From must be before To", str(uuid.uuid4()), 400, "'from' date must be before 'to' date")
-    except (KeyError, ValueError, TypeError) as e:
-        return error_resp("bad_request", "Invalid Input", str(uuid.uuid4()), 400, str(e))
-    
-    # Overlap Check via DB (SQLAlchemy)
-    overlap = Reservation.query.filter(
-        Reservation.room_id == room_id,
-        Reservation.deleted_at == None,
-        Reservation.start_date < req_to,
-        Reservation.end_date > req_from,
-    )
-
-    # Wenn Update einer bestehenden Reservation, diese von Overlap ausschließen
-    if existing.deleted_at is None:
-        overlap = overlap.filter(Reservation.id != existing.id)
-
-    overlap = overlap.first()
-    if overlap:
-        return error_resp("bad_request", "Overlap detected", str(uuid.uuid4()), 400, "The requested reservation overlaps with an existing reservation.")
 
+    # Die Reservierung existiert (ggf. gelöscht), aber ein Update ist gewünscht
+    room_id = prototype["room_id"]
     updated_res = existing
+    old_room_id = existing.room_id
 
     # Update Felder
     updated_res.room_id = room_id
-    updated_res.start_date = req_from
-    updated_res.end_date = req_to
+    updated_res.start_date = prototype["from"]
+    updated_res.end_date = prototype["to"]
 
     # Wenn restore gewünscht
     if wants_restore:
         updated_res.deleted_at = None
 
-    db.session.commit()
+    # Aus dem Archiv zurück nach 'reservations', in derselben Transaktion
+    if archived is not None:
+        db.session.delete(archived)
+        db.session.add(updated_res)
+
+    # Overlap Check durch das Exclusion Constraint in Postgres; die
+    # Reservation selbst wird dabei automatisch nicht mit sich verglichen
+    overlap_resp = _commit_or_overlap("restore" if wants_restore else "update", updated_res)
+    if overlap_resp is not None:
+        return overlap_resp
+
+    get_reservation_cache().invalidate([updated_res.id], [old_room_id, room_id])
 
     # Antwort und Audit Log
     if wants_restore: action = "RESTORE"
@@ -351,7 +807,9 @@ def update_reservation(existing, data):
         "service.name": "reservations-api"
         })
 
-    return make_response(jsonify(updated_res.to_dict()), 200)
+    resp = make_response(jsonify(updated_res.to_dict()), 200)
+    resp.set_etag(reservation_etag(updated_res))
+    return resp
 
 @main_bp.route('/api/v3/reservations/reservations/<string:res_id>', methods=['DELETE'])
 @require_auth
@@ -360,26 +818,36 @@ def delete_reservation(res_id: str) -> Any:
 
     Query parameter 'permanent=true' will perform a permanent delete;
     otherwise the reservation is soft-deleted by setting 'deleted_at'.
+    An 'If-Match' header must match the reservation's current ETag.
     """
     permanent = request.args.get("permanent", "false").lower() == "true"
     try:
         uuid_res_id = uuid.UUID(res_id)
     except (ValueError, AttributeError):
         return error_resp("invalid_id", "Reservation ID is not a valid UUID", str(uuid.uuid4()), 400)
-    res = Reservation.query.get(uuid_res_id)
+    # Archivierte Reservierungen können nur endgültig gelöscht werden
+    res = Reservation.query.get(uuid_res_id) or (_get_archived(uuid_res_id) if permanent else None)
 
     if not res or (res.deleted_at and not permanent):
          return error_resp("not_found", "Not found", str(uuid.uuid4()), 404)
 
+    precondition_resp = _check_if_match(res)
+    if precondition_resp is not None:
+        return precondition_resp
+
+    room_id = res.room_id
     if permanent:
         db.session.delete(res)
         action = "DELETE_PERMANENT"
     else:
         res.deleted_at = Helpers.get_current_time()
         action = "SOFT_DELETE"
-    
+
+    record_event(action.lower(), res)
     db.session.commit()
 
+    get_reservation_cache().invalidate([uuid_res_id], [room_id])
+
     # Audit Log
     current_app.logger.info("Reservation deleted", extra={
         "event.action": action,
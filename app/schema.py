@@ -0,0 +1,139 @@
+"""Database schema bootstrap.
+
+This module creates the reservations table (and its archive and the change feed outbox) together with the indexes
+and the overlap exclusion constraint declared on the 'Reservation' model, and the trigger that notifies change feed
+listeners (requires Postgres 14+). It is idempotent and can be run on every start
+or explicitly via 'flask --app run bootstrap-db'.
+"""
+
+from typing import Any
+
+from flask import Flask
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import AddConstraint, CreateIndex
+
+from .config import Config
+from .events import CHANNEL
+from .helpers import Helpers
+from .models import OVERLAP_CONSTRAINT_NAME, Reservation, ReservationArchive, ReservationEvent, db
+
+# Ein NOTIFY pro Statement genügt: Listener lesen die neuen Events selbst
+NOTIFY_FUNCTION = text(f"""
+CREATE OR REPLACE FUNCTION notify_reservation_events() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{CHANNEL}', '');
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""")
+
+NOTIFY_TRIGGER = text(f"""
+CREATE OR REPLACE TRIGGER {CHANNEL}_notify
+AFTER INSERT ON {ReservationEvent.__tablename__}
+FOR EACH STATEMENT EXECUTE FUNCTION notify_reservation_events()
+""")
+
+
+# Indizes, die ein abgebrochener CONCURRENTLY-Build ungültig hinterlassen hat
+INVALID_INDEXES = text("""
+SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+WHERE NOT i.indisvalid AND c.relname = ANY(:names)
+""")
+
+
+class CreateIndexConcurrently(CreateIndex):
+    """'CREATE INDEX CONCURRENTLY' for an index declared on a model."""
+
+
+@compiles(CreateIndexConcurrently, "postgresql")
+def _compile_create_index_concurrently(element: CreateIndexConcurrently, compiler: Any, **kw: Any) -> str:
+    return compiler.visit_create_index(element, **kw).replace("INDEX ", "INDEX CONCURRENTLY ", 1)
+
+
+def bootstrap_schema(engine: Engine) -> None:
+    """Create missing tables and indexes.
+
+    'create_all' only emits the indexes and constraints together with a
+    new table, so for databases where the table already exists they are
+    added separately: the indexes without blocking writes (see
+    'create_indexes'), the overlap exclusion constraint with 'ALTER
+    TABLE', which locks the table while its GiST index is built (an
+    offline migration for large existing tables). Adding the constraint
+    fails if the table already contains overlapping active reservations.
+
+    Args:
+        engine: Engine connected to the reservations database.
+    """
+    with engine.begin() as connection:
+        Helpers.set_maintenance_timeout(connection)
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+        db.metadata.create_all(connection)
+        connection.execute(NOTIFY_FUNCTION)
+        connection.execute(NOTIFY_TRIGGER)
+
+        exists = connection.execute(
+            text("SELECT 1 FROM pg_constraint WHERE conname = :name"),
+            {"name": OVERLAP_CONSTRAINT_NAME},
+        ).first()
+        if not exists:
+            constraint = next(
+                c for c in Reservation.__table__.constraints if c.name == OVERLAP_CONSTRAINT_NAME
+            )
+            connection.execute(AddConstraint(constraint))
+
+    create_indexes(engine)
+
+
+def create_indexes(engine: Engine) -> None:
+    """Create missing indexes of existing tables with 'CONCURRENTLY'.
+
+    A plain 'CREATE INDEX' blocks all writes to the table until the build
+    finishes; 'CONCURRENTLY' does not, but cannot run inside a
+    transaction, so the indexes are built on an autocommit connection.
+    An index left invalid by an interrupted build is dropped and built
+    again.
+
+    Args:
+        engine: Engine connected to the reservations database.
+    """
+    indexes = [
+        index for model in (Reservation, ReservationArchive, ReservationEvent)
+        for index in model.__table__.indexes
+    ]
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        Helpers.set_maintenance_timeout(connection, local=False)
+        try:
+            invalid = connection.execute(INVALID_INDEXES, {"names": [index.name for index in indexes]}).scalars().all()
+            for name in invalid:
+                connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+            for index in indexes:
+                connection.execute(CreateIndexConcurrently(index, if_not_exists=True))
+        finally:
+            connection.execute(text("RESET statement_timeout"))
+
+
+def init_app(app: Flask) -> None:
+    """Register the 'bootstrap-db' CLI command and the optional startup run.
+
+    Args:
+        app: The Flask application.
+    """
+
+    @app.cli.command("bootstrap-db")
+    def bootstrap_db_command() -> None:
+        """Create the reservations table and its indexes."""
+        bootstrap_schema(db.engine)
+        app.logger.info("Database schema bootstrapped")
+
+    if Config.DB_BOOTSTRAP_ON_START:
+        with app.app_context():
+            try:
+                bootstrap_schema(db.engine)
+            except Exception as e:
+                # Start nicht verhindern; Readiness meldet die fehlende DB
+                app.logger.error("Schema bootstrap failed", extra={
+                    "event.action": "bootstrap_schema",
+                    "error.message": str(e),
+                    "service.name": "reservations-api"
+                })
@@ -0,0 +1,108 @@
+"""JSON serialization of API responses.
+
+This module provides the Flask JSON providers and the column-oriented
+serialization of reservation rows. Both providers encode 'date',
+'datetime' and 'UUID' values natively as ISO-8601 and canonical UUID
+strings, so read paths can hand raw column values to 'jsonify' instead
+of converting every field by hand.
+"""
+
+import uuid
+from datetime import date
+from typing import Any, Dict, Union
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+from .config import Config
+from .models import Reservation
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# Spalten für lesende Listenabfragen (ohne ORM-Objekte)
+RESERVATION_COLUMNS = (
+    Reservation.id,
+    Reservation.room_id,
+    Reservation.start_date,
+    Reservation.end_date,
+    Reservation.deleted_at,
+)
+
+
+class ReservationJSONProvider(DefaultJSONProvider):
+    """Standard library JSON provider with ISO-8601 dates.
+
+    Flask's default provider encodes dates as HTTP dates; this API uses
+    ISO-8601 everywhere.
+    """
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        if isinstance(o, date):
+            return o.isoformat()
+        if isinstance(o, uuid.UUID):
+            return str(o)
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson.
+
+    orjson encodes 'date', 'datetime' and 'UUID' natively with the same
+    output as 'isoformat()' and 'str()'. Responses are built from the
+    encoded bytes directly.
+    """
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=ReservationJSONProvider.default).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=ReservationJSONProvider.default),
+            mimetype=self.mimetype,
+        )
+
+
+def init_app(app: Flask) -> None:
+    """Install the JSON provider selected by 'Config.JSON_PROVIDER'.
+
+    'orjson' falls back to the standard library provider if orjson is not
+    installed.
+
+    Args:
+        app: The Flask application.
+    """
+    if Config.JSON_PROVIDER == "orjson" and orjson is not None:
+        app.json = OrjsonProvider(app)
+    else:
+        app.json = ReservationJSONProvider(app)
+
+
+def reservation_row(row: Any) -> Dict[str, Any]:
+    """Convert a row of 'RESERVATION_COLUMNS' to a response dictionary.
+
+    Values are kept as 'UUID'/'date'/'datetime' and encoded by the JSON
+    provider. The result has the same shape as 'Reservation.to_dict()'.
+
+    Args:
+        row: Result row (or object) with 'id', 'room_id', 'start_date',
+            'end_date' and 'deleted_at'.
+    """
+    res = {
+        "id": row.id,
+        "room_id": row.room_id,
+        "from": row.start_date,
+        "to": row.end_date,
+    }
+    if row.deleted_at:
+        res["deleted_at"] = row.deleted_at
+    return res
@@ -0,0 +1,106 @@
+"""Production servers.
+
+This module runs the Flask application under gunicorn, a preforking
+multi-worker server. The master process loads the application once and
+forks the configured number of workers; 'SIGHUP' reloads the workers
+gracefully. 'serve_asgi' runs the asynchronous entrypoint ('app.asgi')
+under uvicorn instead.
+"""
+
+import multiprocessing
+from typing import Any, Dict
+
+from flask import Flask
+from gunicorn.app.base import BaseApplication
+
+from .config import Config
+from .logs import start_listener
+from .models import db
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    """Reset per-process state inherited from the master process.
+
+    Connections opened before the fork (e.g. by the schema bootstrap) must
+    not be shared between processes; 'close=False' drops them from the
+    pools of the primary and the read replica engines without closing the
+    master's sockets. The log listener thread does not survive the fork
+    and is started again.
+    """
+    app: Flask = server.app.application
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    start_listener(app)
+
+
+def gunicorn_options() -> Dict[str, Any]:
+    """Build the gunicorn settings from 'Config'.
+
+    Returns:
+        dict: gunicorn setting names mapped to their values.
+    """
+    workers = Config.SERVER_WORKERS or multiprocessing.cpu_count() * 2 + 1
+    return {
+        "bind": f"0.0.0.0:{Config.SERVER_PORT}",
+        "workers": workers,
+        "threads": Config.SERVER_THREADS,
+        "worker_class": "gthread" if Config.SERVER_THREADS > 1 else "sync",
+        "keepalive": Config.SERVER_KEEPALIVE,
+        "timeout": Config.SERVER_TIMEOUT,
+        "graceful_timeout": Config.SERVER_GRACEFUL_TIMEOUT,
+        "max_requests": Config.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": Config.SERVER_MAX_REQUESTS_JITTER,
+        "accesslog": None,
+        "errorlog": "-",
+        "loglevel": Config.LOG_LEVEL.lower(),
+        "post_fork": post_fork,
+    }
+
+
+class GunicornApplication(BaseApplication):
+    """gunicorn application serving an already created Flask app."""
+
+    def __init__(self, application: Flask, options: Dict[str, Any]) -> None:
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self) -> Flask:
+        return self.application
+
+
+def serve(app: Flask) -> None:
+    """Run 'app' under gunicorn until the master process is stopped.
+
+    Args:
+        app: The Flask application to serve.
+    """
+    GunicornApplication(app, gunicorn_options()).run()
+
+
+def serve_asgi() -> None:
+    """Run the ASGI application ('app.asgi') under uvicorn.
+
+    Every worker process builds its own application through the factory,
+    so no connections are shared between processes.
+    """
+    import uvicorn
+
+    uvicorn.run(
+        "app.asgi:create_asgi_app",
+        factory=True,
+        host="0.0.0.0",
+        port=Config.SERVER_PORT,
+        workers=Config.SERVER_WORKERS or multiprocessing.cpu_count(),
+        timeout_keep_alive=Config.SERVER_KEEPALIVE,
+        timeout_graceful_shutdown=Config.SERVER_GRACEFUL_TIMEOUT,
+        limit_max_requests=Config.SERVER_MAX_REQUESTS or None,
+        access_log=False,
+        log_level=Config.LOG_LEVEL.lower(),
+    )
@@ -0,0 +1,116 @@
+"""Occupancy statistics over a date window.
+
+Aggregates are computed in Postgres from the active reservations that
+intersect the window: occupied days and reservations per room with one
+'GROUP BY', and per day, week or month by expanding each reservation
+into its occupied days with 'generate_series'. Only the aggregated rows
+are transferred, and both queries run on a read replica if configured.
+"""
+
+import uuid
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from .archive import list_needs_archive
+from .queries import occupancy_by_period, occupancy_by_room
+from .replicas import read_session
+
+
+def _truncate(day: date, granularity: str) -> date:
+    """Start of the period containing 'day' (like Postgres 'date_trunc')."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_period(period: date, granularity: str) -> date:
+    if granularity == "day":
+        return period + timedelta(days=1)
+    if granularity == "week":
+        return period + timedelta(days=7)
+    return (period.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _utilization(occupied_days: int, capacity_days: int) -> Optional[float]:
+    return round(occupied_days / capacity_days, 4) if capacity_days > 0 else None
+
+
+def get_occupancy(room_ids: List[uuid.UUID], window_from: date, window_to: date, granularity: str) -> Dict[str, Any]:
+    """Compute occupancy statistics for a window.
+
+    Without 'room_ids' all rooms with at least one reservation in the
+    window are included, and utilization is relative to these rooms.
+
+    Args:
+        room_ids: Rooms to report; empty for all rooms.
+        window_from: Start of the window (inclusive).
+        window_to: End of the window (exclusive).
+        granularity: 'day', 'week' or 'month'.
+
+    Returns:
+        dict: 'rooms' (per room), 'periods' (per period) and 'totals'.
+    """
+    params: Dict[str, Any] = {"window_from": window_from, "window_to": window_to}
+    if room_ids:
+        params["room_ids"] = room_ids
+    with_archive = list_needs_archive(False, window_from)
+    session = read_session()
+
+    per_room = {
+        room_id: (reservations, occupied_days)
+        for room_id, reservations, occupied_days in session.execute(
+            occupancy_by_room(bool(room_ids), with_archive), params
+        )
+    }
+    per_period = {
+        period: (reservations, occupied_days)
+        for period, reservations, occupied_days in session.execute(
+            occupancy_by_period(granularity, bool(room_ids), with_archive), params
+        )
+    }
+
+    window_days = (window_to - window_from).days
+    rooms = list(room_ids) if room_ids else list(per_room)
+    room_stats = []
+    for room_id in rooms:
+        reservations, occupied_days = per_room.get(room_id, (0, 0))
+        room_stats.append({
+            "room_id": str(room_id),
+            "reservations": reservations,
+            "occupied_days": occupied_days,
+            "utilization": _utilization(occupied_days, window_days),
+        })
+
+    # Alle Perioden des Fensters, auch ohne Reservierungen
+    periods = []
+    period = _truncate(window_from, granularity)
+    while period < window_to:
+        next_period = _next_period(period, granularity)
+        reservations, occupied_days = per_period.get(period, (0, 0))
+        # Tage der Periode innerhalb des Fensters (Randperioden sind kürzer)
+        days = (min(next_period, window_to) - max(period, window_from)).days
+        periods.append({
+            "period": period.isoformat(),
+            "days": days,
+            "reservations": reservations,
+            "occupied_days": occupied_days,
+            "utilization": _utilization(occupied_days, days * len(rooms)),
+        })
+        period = next_period
+
+    total_occupied = sum(r["occupied_days"] for r in room_stats)
+    return {
+        "from": window_from.isoformat(),
+        "to": window_to.isoformat(),
+        "granularity": granularity,
+        "rooms": room_stats,
+        "periods": periods,
+        "totals": {
+            "rooms": len(rooms),
+            "reservations": sum(r["reservations"] for r in room_stats),
+            "occupied_days": total_occupied,
+            "utilization": _utilization(total_occupied, window_days * len(rooms)),
+        },
+    }
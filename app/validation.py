@@ -0,0 +1,185 @@
+"""Declarative validation of request input.
+
+Schemas are declared once at import time as a list of fields, each with
+a parser, and compiled into a flat tuple, so validating a request is a
+single loop over plain function calls. Routes validate the body and
+query parameters first and answer invalid input with the standard
+error response ('routes.validation_error_resp') before any database
+query or token verification.
+"""
+
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Sequence
+
+from .config import Config
+
+
+class ValidationError(ValueError):
+    """Invalid request input.
+
+    Attributes:
+        message: Error message of the response ('Invalid Input' by default).
+        more_info: Details on the offending field.
+    """
+
+    def __init__(self, more_info: str, message: str = "Invalid Input") -> None:
+        super().__init__(more_info)
+        self.message = message
+        self.more_info = more_info
+
+
+def parse_uuid(value: Any) -> uuid.UUID:
+    """Parse a UUID string."""
+    if not isinstance(value, str):
+        raise TypeError(f"expected a UUID string, got {type(value).__name__}")
+    return uuid.UUID(value)
+
+
+def parse_date(value: Any) -> date:
+    """Parse an ISO-8601 date (a datetime is truncated to its date)."""
+    if not isinstance(value, str):
+        raise TypeError(f"expected an ISO date string, got {type(value).__name__}")
+    return datetime.fromisoformat(value).date()
+
+
+def choice(*options: str) -> Callable[[Any], str]:
+    """Return a parser accepting one of 'options' (case-insensitive)."""
+    def parse(value: Any) -> str:
+        value = str(value).lower()
+        if value not in options:
+            raise ValueError(f"must be one of {', '.join(options)}")
+        return value
+    return parse
+
+
+def parse_flag(value: Any) -> bool:
+    """Parse a query flag; only 'true' (any case) is true."""
+    return str(value).lower() == "true"
+
+
+def _values(data: Mapping, name: str) -> List[Any]:
+    """All values of 'name': repeated query parameters or a JSON array."""
+    if hasattr(data, "getlist"):
+        return data.getlist(name)
+    value = data.get(name)
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class Field(NamedTuple):
+    """One input field: key, parser and whether it must be present.
+
+    Missing values ('None' or an empty string) are set to 'default' for
+    optional fields. With 'many' the field may be repeated (query
+    parameters) or be a JSON array; the parsed values are returned as a
+    list without duplicates, at most 'REQUEST_MAX_VALUES' of them.
+    """
+
+    name: str
+    parse: Callable[[Any], Any]
+    required: bool = True
+    default: Any = None
+    many: bool = False
+
+
+class Schema:
+    """A compiled set of fields plus checks across fields."""
+
+    def __init__(self, *fields: Field, checks: Sequence[Callable[[Dict[str, Any]], None]] = ()) -> None:
+        self._fields = tuple(tuple(f) for f in fields)
+        self._checks = tuple(checks)
+
+    def validate(self, data: Any) -> Dict[str, Any]:
+        """Parse 'data' (a JSON object or query parameters).
+
+        Returns:
+            dict: The parsed values by field name.
+
+        Raises:
+            ValidationError: On the first missing or invalid field.
+        """
+        if not isinstance(data, Mapping):
+            raise ValidationError("expected a JSON object")
+        values = {}
+        for name, parse, required, default, many in self._fields:
+            if many:
+                values[name] = self._parse_many(data, name, parse, required, default)
+                continue
+            raw = data.get(name)
+            if raw is None or raw == "":
+                if required:
+                    raise ValidationError(f"'{name}' is required")
+                values[name] = default
+                continue
+            try:
+                values[name] = parse(raw)
+            except (ValueError, TypeError) as e:
+                raise ValidationError(f"'{name}': {e}") from None
+        for check in self._checks:
+            check(values)
+        return values
+
+    @staticmethod
+    def _parse_many(data: Mapping, name: str, parse: Callable[[Any], Any], required: bool, default: Any) -> Any:
+        raw = [v for v in _values(data, name) if v is not None and v != ""]
+        if not raw:
+            if required:
+                raise ValidationError(f"'{name}' is required")
+            return default
+        if len(raw) > Config.REQUEST_MAX_VALUES:
+            raise ValidationError(f"'{name}': at most {Config.REQUEST_MAX_VALUES} values are allowed")
+        try:
+            return list(dict.fromkeys(parse(v) for v in raw))
+        except (ValueError, TypeError) as e:
+            raise ValidationError(f"'{name}': {e}") from None
+
+
+def _from_before_to(values: Dict[str, Any]) -> None:
+    if values["from"] >= values["to"]:
+        raise ValidationError("'from' date must be before 'to' date", "From must be before To")
+
+
+# Body von POST/PUT einer Reservierung
+RESERVATION_PROTOTYPE = Schema(
+    Field("room_id", parse_uuid),
+    Field("from", parse_date),
+    Field("to", parse_date),
+    checks=[_from_before_to],
+)
+
+# Element einer Batch (optional mit eigener ID)
+BATCH_ITEM = Schema(
+    Field("room_id", parse_uuid),
+    Field("from", parse_date),
+    Field("to", parse_date),
+    Field("id", parse_uuid, required=False),
+    checks=[_from_before_to],
+)
+
+# Fenster der Statistik
+STATISTICS_QUERY = Schema(
+    Field("from", parse_date),
+    Field("to", parse_date),
+    Field("room_id", parse_uuid, required=False, default=[], many=True),
+    Field("granularity", choice("day", "week", "month"), required=False, default="month"),
+    checks=[_from_before_to],
+)
+
+# Räume und Fenster der Verfügbarkeit
+AVAILABILITY_QUERY = Schema(
+    Field("room_id", parse_uuid, many=True),
+    Field("from", parse_date),
+    Field("to", parse_date),
+    checks=[_from_before_to],
+)
+
+# Filter der Reservierungsliste (Query-Parameter oder Body der Suche)
+LIST_QUERY = Schema(
+    Field("include_deleted", parse_flag, required=False, default=False),
+    Field("room_id", parse_uuid, required=False, many=True),
+    Field("id", parse_uuid, required=False, many=True),
+    Field("before", parse_date, required=False),
+    Field("after", parse_date, required=False),
+)
@@ -0,0 +1,469 @@
+"""Load and latency benchmarks for the reservations API.
+
+The benchmark seeds N reservations across M freshly generated rooms in
+the database configured by 'POSTGRES_RESERVATIONS_*', runs the scenarios
+below against the application and writes one JSON file per run, so runs
+can be compared across commits:
+
+    python -m benchmarks.bench run --reservations 10000 --rooms 100
+    python -m benchmarks.bench compare benchmarks/results/a.json benchmarks/results/b.json
+
+Scenarios:
+    list      GET  /reservations?room_id=...
+    get       GET  /reservations/<id>
+    create    POST /reservations (non-overlapping, exclusion constraint check)
+    update    PUT  /reservations/<id>
+    conflict  concurrent POSTs for the same room and dates; exactly one must win
+
+'python -m benchmarks.bench statements' compares the hot availability
+query built per call (expanding 'IN') with the pre-built statement from
+'app.queries', without and with psycopg server-side prepared statements.
+
+By default requests go through the WSGI app in-process (no network, one
+test client per thread). With '--base-url' a running server is measured
+instead; it then needs a valid bearer token via '--token'. Only the
+seeded rooms are touched and their rows are deleted afterwards.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, delete, insert, select
+
+load_dotenv()
+
+from app import create_app
+from app.config import Config
+from app.models import Reservation, db
+from app.queries import BOOKED_INTERVALS
+from app.schema import bootstrap_schema
+
+API = "/api/v3/reservations/reservations"
+SEED_START = date(2030, 1, 1)
+# Neue Reservierungen im "create"-Szenario liegen hinter den Seed-Daten
+CREATE_START = date(2060, 1, 1)
+CONFLICT_START = date(2090, 1, 1)
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+class InProcessTarget:
+    """Sends requests through the WSGI app with one test client per thread."""
+
+    name = "in-process"
+
+    def __init__(self, app: Any, token: str) -> None:
+        self.app = app
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> int:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client.open(path, method=method, json=body, headers=self.headers).status_code
+
+
+class HttpTarget:
+    """Sends requests to a running server with one HTTP session per thread."""
+
+    name = "http"
+
+    def __init__(self, base_url: str, token: str) -> None:
+        import requests
+
+        self._requests = requests
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> int:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        return session.request(method, self.base_url + path, json=body, headers=self.headers).status_code
+
+
+def local_token() -> Tuple[str, Dict[str, Any]]:
+    """Sign a token with a throw-away RSA key.
+
+    Returns:
+        The bearer token and the JWKS containing its public key.
+    """
+    import jwt
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jwt.algorithms import RSAAlgorithm
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk["kid"] = "benchmark"
+    token = jwt.encode(
+        {"sub": "benchmark", "exp": int(time.time()) + 24 * 3600},
+        private_key,
+        algorithm="RS256",
+        headers={"kid": "benchmark"},
+    )
+    return token, {"keys": [jwk]}
+
+
+def seed(reservations: int, rooms: int, chunk_size: int = 1000) -> Tuple[List[uuid.UUID], List[Dict[str, Any]]]:
+    """Insert 'reservations' non-overlapping reservations across 'rooms' new rooms.
+
+    Must be called inside an application context.
+
+    Returns:
+        The room ids and the inserted rows.
+    """
+    room_ids = [uuid.uuid4() for _ in range(rooms)]
+    rows: List[Dict[str, Any]] = []
+    next_free = {room_id: SEED_START for room_id in room_ids}
+    for i in range(reservations):
+        room_id = room_ids[i % rooms]
+        start = next_free[room_id]
+        end = start + timedelta(days=random.randint(1, 3))
+        next_free[room_id] = end
+        rows.append({"id": uuid.uuid4(), "room_id": room_id, "start_date": start, "end_date": end})
+
+    for offset in range(0, len(rows), chunk_size):
+        db.session.execute(insert(Reservation), rows[offset:offset + chunk_size])
+    db.session.commit()
+    return room_ids, rows
+
+
+def cleanup(room_ids: List[uuid.UUID]) -> None:
+    """Delete all reservations of the seeded rooms."""
+    db.session.execute(delete(Reservation).where(Reservation.room_id.in_(room_ids)))
+    db.session.commit()
+
+
+def measure(operations: List[Callable[[], int]], concurrency: int) -> Dict[str, Any]:
+    """Run 'operations' on 'concurrency' threads and summarize latencies.
+
+    Each operation returns the HTTP status code of its request.
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def timed(operation: Callable[[], int]) -> None:
+        start = time.perf_counter()
+        status = operation()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, operations))
+    wall = time.perf_counter() - wall_start
+
+    return summarize(latencies, wall, statuses)
+
+
+def summarize(latencies: List[float], wall: float, statuses: Dict[str, int]) -> Dict[str, Any]:
+    """Return throughput and latency percentiles (milliseconds)."""
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "requests": len(ordered),
+        "throughput_rps": round(len(ordered) / wall, 1) if wall else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": percentile(50),
+        "p90_ms": percentile(90),
+        "p99_ms": percentile(99),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "statuses": statuses,
+    }
+
+
+def run_conflicts(target: Any, room_ids: List[uuid.UUID], rounds: int, concurrency: int) -> Dict[str, Any]:
+    """Fire 'concurrency' identical creates per round; exactly one may succeed."""
+    rounds_with_one_winner = 0
+    operations: List[Callable[[], int]] = []
+    per_round: List[List[int]] = []
+
+    for i in range(rounds):
+        start = CONFLICT_START + timedelta(days=3 * (i // len(room_ids)))
+        body = {"room_id": str(room_ids[i % len(room_ids)]), "from": start.isoformat(),
+                "to": (start + timedelta(days=2)).isoformat()}
+        results: List[int] = []
+        per_round.append(results)
+
+        def attempt(body: Dict[str, Any] = body, results: List[int] = results) -> int:
+            status = target.request("POST", API, body)
+            results.append(status)
+            return status
+
+        operations.extend([attempt] * concurrency)
+
+    summary = measure(operations, concurrency)
+    for results in per_round:
+        if results.count(201) == 1:
+            rounds_with_one_winner += 1
+    summary["rounds"] = rounds
+    summary["rounds_with_exactly_one_winner"] = rounds_with_one_winner
+    return summary
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Seed the database, run all scenarios and return the results."""
+    app = create_app()
+    token = args.token
+    if args.base_url:
+        target: Any = HttpTarget(args.base_url, token or "")
+    else:
+        if not token:
+            # Lokal signiertes Token, Key Store liefert den passenden Public Key
+            import app.auth as auth
+            token, jwks = local_token()
+            auth.get_jwks_client = lambda: jwks
+        target = InProcessTarget(app, token)
+
+    with app.app_context():
+        bootstrap_schema(db.engine)
+        seed_start = time.perf_counter()
+        room_ids, rows = seed(args.reservations, args.rooms)
+        seed_seconds = time.perf_counter() - seed_start
+
+    rng = random.Random(args.seed)
+    n = args.requests
+    scenarios: Dict[str, Any] = {}
+    try:
+        for _ in range(args.warmup):
+            target.request("GET", f"{API}?room_id={rng.choice(room_ids)}")
+
+        scenarios["list"] = measure(
+            [lambda room_id=rng.choice(room_ids): target.request("GET", f"{API}?room_id={room_id}")
+             for _ in range(n)], args.concurrency)
+
+        scenarios["get"] = measure(
+            [lambda res_id=rng.choice(rows)["id"]: target.request("GET", f"{API}/{res_id}")
+             for _ in range(n)], args.concurrency)
+
+        creates = []
+        for i in range(n):
+            start = CREATE_START + timedelta(days=2 * (i // len(room_ids)))
+            body = {"room_id": str(room_ids[i % len(room_ids)]), "from": start.isoformat(),
+                    "to": (start + timedelta(days=1)).isoformat()}
+            creates.append(lambda body=body: target.request("POST", API, body))
+        scenarios["create"] = measure(creates, args.concurrency)
+
+        # Jede Reservierung höchstens einmal, damit parallele Updates sich nicht stören
+        updates = []
+        for row in rng.sample(rows, min(n, len(rows))):
+            body = {"room_id": str(row["room_id"]), "from": row["start_date"].isoformat(),
+                    "to": row["end_date"].isoformat()}
+            updates.append(lambda res_id=row["id"], body=body: target.request("PUT", f"{API}/{res_id}", body))
+        scenarios["update"] = measure(updates, args.concurrency)
+
+        scenarios["conflict"] = run_conflicts(target, room_ids, args.conflict_rounds, args.concurrency)
+    finally:
+        if not args.keep:
+            with app.app_context():
+                cleanup(room_ids)
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or target.name,
+        "parameters": {
+            "reservations": args.reservations,
+            "rooms": args.rooms,
+            "requests": n,
+            "concurrency": args.concurrency,
+            "conflict_rounds": args.conflict_rounds,
+            "seed": args.seed,
+        },
+        "seed_seconds": round(seed_seconds, 3),
+        "scenarios": scenarios,
+    }
+
+
+def _adhoc_booked_intervals(room_ids: List[uuid.UUID], window_from: date, window_to: date) -> Any:
+    # Frühere Variante: Statement pro Aufruf gebaut, IN-Liste variabler Länge
+    return (
+        select(Reservation.room_id, Reservation.start_date, Reservation.end_date)
+        .where(
+            Reservation.room_id.in_(room_ids),
+            Reservation.deleted_at == None,
+            Reservation.start_date < window_to,
+            Reservation.end_date > window_from,
+        )
+        .order_by(Reservation.room_id, Reservation.start_date)
+    )
+
+
+def run_statements(args: argparse.Namespace) -> Dict[str, Any]:
+    """Time the availability query built per call against the pre-built one.
+
+    Variants: 'adhoc' (built per call), 'prebuilt' and 'prebuilt_prepared'
+    (psycopg 'prepare_threshold=0'). Each variant uses its own engine with
+    a single connection.
+    """
+    app = create_app()
+    with app.app_context():
+        bootstrap_schema(db.engine)
+        room_ids, _ = seed(args.reservations, args.rooms)
+
+    rng = random.Random(args.seed)
+    connect_args = Config.SQLALCHEMY_ENGINE_OPTIONS["connect_args"]
+    variants = {
+        "adhoc": (None, lambda rooms, wf, wt: (_adhoc_booked_intervals(rooms, wf, wt), {})),
+        "prebuilt": (None, lambda rooms, wf, wt: (BOOKED_INTERVALS, {"room_ids": rooms, "window_from": wf, "window_to": wt})),
+        "prebuilt_prepared": (0, lambda rooms, wf, wt: (BOOKED_INTERVALS, {"room_ids": rooms, "window_from": wf, "window_to": wt})),
+    }
+    calls = []
+    for _ in range(args.iterations):
+        wf = SEED_START + timedelta(days=rng.randint(0, 300))
+        calls.append((rng.sample(room_ids, rng.randint(1, min(5, len(room_ids)))), wf, wf + timedelta(days=30)))
+
+    scenarios: Dict[str, Any] = {}
+    try:
+        for name, (threshold, build) in variants.items():
+            engine = create_engine(
+                Config.SQLALCHEMY_DATABASE_URI,
+                pool_size=1,
+                connect_args={**connect_args, "prepare_threshold": threshold},
+            )
+            latencies = []
+            with engine.connect() as connection:
+                for rooms, wf, wt in calls[:args.warmup]:
+                    connection.execute(*build(rooms, wf, wt)).all()
+                wall_start = time.perf_counter()
+                for rooms, wf, wt in calls:
+                    start = time.perf_counter()
+                    connection.execute(*build(rooms, wf, wt)).all()
+                    latencies.append(time.perf_counter() - start)
+                wall = time.perf_counter() - wall_start
+            engine.dispose()
+            scenarios[name] = summarize(latencies, wall, {})
+    finally:
+        if not args.keep:
+            with app.app_context():
+                cleanup(room_ids)
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": "statements",
+        "parameters": {
+            "reservations": args.reservations,
+            "rooms": args.rooms,
+            "iterations": args.iterations,
+            "seed": args.seed,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Return one line per scenario with throughput and p50/p99 changes."""
+
+    def change(before: float, after: float) -> str:
+        if not before:
+            return "n/a"
+        return f"{(after - before) / before * 100:+.1f}%"
+
+    lines = [f"{old.get('commit', '?')[:10]} -> {new.get('commit', '?')[:10]}"]
+    for name, after in new["scenarios"].items():
+        before = old["scenarios"].get(name)
+        if before is None:
+            continue
+        lines.append(
+            f"{name:<9} rps {before['throughput_rps']:>9} -> {after['throughput_rps']:>9} "
+            f"({change(before['throughput_rps'], after['throughput_rps'])})  "
+            f"p50 {before['p50_ms']} -> {after['p50_ms']} ms ({change(before['p50_ms'], after['p50_ms'])})  "
+            f"p99 {before['p99_ms']} -> {after['p99_ms']} ms ({change(before['p99_ms'], after['p99_ms'])})"
+        )
+    return lines
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed the database and run all scenarios")
+    run_parser.add_argument("--reservations", type=int, default=10000, help="reservations to seed (N)")
+    run_parser.add_argument("--rooms", type=int, default=100, help="rooms to spread them across (M)")
+    run_parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    run_parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    run_parser.add_argument("--conflict-rounds", type=int, default=50, help="rounds of concurrent conflicting creates")
+    run_parser.add_argument("--warmup", type=int, default=50, help="untimed requests before measuring")
+    run_parser.add_argument("--seed", type=int, default=1, help="random seed for request selection")
+    run_parser.add_argument("--base-url", help="measure a running server instead of the in-process app")
+    run_parser.add_argument("--token", help="bearer token (default: locally signed, in-process only)")
+    run_parser.add_argument("--output", help="result file (default: benchmarks/results/<time>-<commit>.json)")
+    run_parser.add_argument("--keep", action="store_true", help="keep the seeded rows")
+
+    statements_parser = commands.add_parser("statements", help="compare ad-hoc, pre-built and prepared statements")
+    statements_parser.add_argument("--reservations", type=int, default=10000, help="reservations to seed (N)")
+    statements_parser.add_argument("--rooms", type=int, default=100, help="rooms to spread them across (M)")
+    statements_parser.add_argument("--iterations", type=int, default=2000, help="executions per variant")
+    statements_parser.add_argument("--warmup", type=int, default=50, help="untimed executions per variant")
+    statements_parser.add_argument("--seed", type=int, default=1, help="random seed for the query parameters")
+    statements_parser.add_argument("--output", help="result file (default: benchmarks/results/<time>-<commit>-statements.json)")
+    statements_parser.add_argument("--keep", action="store_true", help="keep the seeded rows")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.old) as f_old, open(args.new) as f_new:
+            print("\n".join(compare(json.load(f_old), json.load(f_new))))
+        return 0
+
+    if args.command == "statements":
+        result = run_statements(args)
+        suffix = "-statements"
+    else:
+        if args.base_url and not args.token:
+            parser.error("--base-url requires --token")
+        result = run(args)
+        suffix = ""
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{time.strftime('%Y%m%dT%H%M%S')}-{result['commit'][:10]}{suffix}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    for name, stats in result["scenarios"].items():
+        print(f"{name:<17} {stats['throughput_rps']:>9} rps  p50 {stats['p50_ms']} ms  p99 {stats['p99_ms']} ms  {stats['statuses']}")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,8 @@
 """Application entrypoint used for local execution.
 
 This module loads environment variables, creates the Flask application
-using the application factory and runs the development server when the
-module is executed directly.
+using the application factory and, when executed directly, runs either
+the development server or the production server (see 'SERVER_MODE').
 """
 
 from dotenv import load_dotenv
@@ -21,12 +21,20 @@ app: Flask = create_app()
 
 
 def _run() -> NoReturn:
-    """Run the Flask development server.
+    """Run the server selected by 'Config.SERVER_MODE'.
 
-    This wrapper exists to provide a typed function that starts the
-    server when run as a script.
+    'production' serves the app with gunicorn (preforking workers),
+    'asgi' serves the asynchronous entrypoint with uvicorn, anything else
+    starts the Flask development server.
     """
-    app.run(host="0.0.0.0", port=Config.SERVER_PORT, debug=Config.DEBUG_SERVER)
+    if Config.SERVER_MODE == "production":
+        from app.server import serve
+        serve(app)
+    elif Config.SERVER_MODE == "asgi":
+        from app.server import serve_asgi
+        serve_asgi()
+    else:
+        app.run(host="0.0.0.0", port=Config.SERVER_PORT, debug=Config.DEBUG_SERVER)
 
 
 if __name__ == "__main__":
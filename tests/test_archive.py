@@ -0,0 +1,135 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+
+from app.config import Config
+from test_reservations import DummyListSession, DummyQuery, DummyReservation, _monkeypatch_list_session
+
+
+class DummyArchive(DummyReservation):
+    query = DummyQuery([])
+
+
+def test_list_needs_archive(monkeypatch):
+    from app.archive import archive_cutoff, list_needs_archive
+
+    assert not list_needs_archive(True, None)
+
+    monkeypatch.setattr(Config, "ARCHIVE_ENABLED", True)
+    assert list_needs_archive(False, None)
+    assert list_needs_archive(True, date.today())
+    assert list_needs_archive(False, archive_cutoff() - timedelta(days=1))
+    assert not list_needs_archive(False, archive_cutoff())
+
+
+def test_archive_batch_moves_rows_in_one_statement(monkeypatch, app):
+    import app.archive as archive
+
+    statements = []
+
+    class Result:
+        rowcount = 3
+
+    class Session:
+        def execute(self, stmt, params=None):
+            statements.append((stmt, params))
+            return Result()
+
+        def commit(self):
+            pass
+
+        def remove(self):
+            pass
+
+    monkeypatch.setattr(archive.db, "session", Session())
+    with app.app_context():
+        assert archive.archive_reservations(batch_size=5) == 3
+
+    # Kein Request-Timeout für die Batch
+    assert "set_config('statement_timeout'" in str(statements[0][0])
+    assert statements[0][1] == {"timeout": "0", "local": True}
+    sql = str(statements[1][0].compile(dialect=postgresql.psycopg.dialect()))
+    assert sql.startswith("WITH moved AS")
+    assert "DELETE FROM reservations" in sql and "RETURNING" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "INSERT INTO reservations_archive" in sql
+
+
+def test_archive_command_requires_archive_enabled(app):
+    result = app.test_cli_runner().invoke(args=["archive-reservations"])
+    assert result.exit_code != 0
+    assert "ARCHIVE_ENABLED" in result.output
+
+
+def test_reads_include_archive(monkeypatch, client):
+    from app import routes
+
+    active = DummyReservation(start_date=date(2030, 1, 1), end_date=date(2030, 1, 2))
+    archived = DummyArchive(start_date=date(2020, 1, 1), end_date=date(2020, 1, 2))
+    monkeypatch.setattr(Config, "ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(routes, "Reservation", DummyReservation)
+    monkeypatch.setattr(routes, "ReservationArchive", DummyArchive)
+    monkeypatch.setattr(DummyArchive, "query", DummyQuery([archived]))
+
+    def rows(stmt):
+        sql = str(stmt.compile(dialect=postgresql.psycopg.dialect()))
+        return [active, archived] if "reservations_archive" in sql else [active]
+
+    _monkeypatch_list_session(monkeypatch, DummyListSession(rows))
+
+    r = client.get("/api/v3/reservations/reservations")
+    assert {x["id"] for x in r.get_json()["reservations"]} == {str(active.id), str(archived.id)}
+
+    # Nur zukünftige Reservierungen: Archiv wird nicht abgefragt
+    r = client.get(f"/api/v3/reservations/reservations?after={date.today().isoformat()}")
+    assert [x["id"] for x in r.get_json()["reservations"]] == [str(active.id)]
+
+    r = client.get(f"/api/v3/reservations/reservations/{archived.id}")
+    assert r.status_code == 200
+    assert r.get_json()["id"] == str(archived.id)
+
+    r = client.put(f"/api/v3/reservations/reservations/{archived.id}",
+                   json={"room_id": str(archived.room_id), "from": "2020-01-01", "to": "2020-01-03"})
+    assert r.status_code == 400
+
+
+def test_restore_moves_archived_reservation_back(monkeypatch, client):
+    from app import routes
+    from app.models import Reservation
+    from test_reservations import _monkeypatch_auth, fake_token
+
+    class RecordingSession:
+        def __init__(self):
+            self.added, self.deleted = [], []
+
+        def add(self, o):
+            self.added.append(o)
+
+        def delete(self, o):
+            self.deleted.append(o)
+
+        def commit(self):
+            pass
+
+    class RecordingDB:
+        session = RecordingSession()
+
+    _monkeypatch_auth(monkeypatch)
+    archived = DummyArchive(start_date=date(2020, 1, 1), end_date=date(2020, 1, 2))
+    archived.deleted_at = datetime(2020, 1, 1)
+    monkeypatch.setattr(Config, "ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(routes, "Reservation", DummyReservation)
+    monkeypatch.setattr(routes, "ReservationArchive", DummyArchive)
+    monkeypatch.setattr(DummyArchive, "query", DummyQuery([archived]))
+    monkeypatch.setattr(routes, "db", RecordingDB())
+
+    r = client.put(f"/api/v3/reservations/reservations/{archived.id}",
+                   headers={"Authorization": f"Bearer {fake_token}"},
+                   json={"room_id": str(archived.room_id), "from": "2030-01-01", "to": "2030-01-03", "deleted_at": None})
+    assert r.status_code == 200
+    assert r.get_json()["id"] == str(archived.id)
+    assert RecordingDB.session.deleted == [archived]
+    [restored] = RecordingDB.session.added
+    assert isinstance(restored, Reservation)
+    assert restored.id == archived.id and restored.deleted_at is None
+    assert restored.start_date == date(2030, 1, 1)
@@ -0,0 +1,162 @@
+import time
+import uuid
+from datetime import date
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.asgi import create_asgi_app
+from test_reservations import _monkeypatch_auth, fake_token
+
+
+class FakeSession:
+    def __init__(self, items):
+        self.items = {item.id: item for item in items}
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, model, key):
+        return self.items.get(key)
+
+    async def commit(self):
+        self.committed = True
+
+
+class FakeReservation:
+    def __init__(self, **kwargs):
+        self.id = uuid.uuid4()
+        self.room_id = uuid.uuid4()
+        self.start_date = date(2030, 1, 1)
+        self.end_date = date(2030, 1, 3)
+        self.deleted_at = None
+        self.__dict__.update(kwargs)
+
+    def to_dict(self):
+        return {"id": str(self.id), "room_id": str(self.room_id),
+                "from": self.start_date.isoformat(), "to": self.end_date.isoformat()}
+
+
+@pytest.fixture
+def asgi(app):
+    asgi_app = create_asgi_app(app)
+    return asgi_app, TestClient(asgi_app)
+
+
+def test_status_matches_wsgi(asgi, client):
+    _, asgi_client = asgi
+    r = asgi_client.get("/api/v3/reservations/status")
+    assert r.status_code == 200
+    assert r.content == client.get("/api/v3/reservations/status").data
+
+
+def test_error_format_matches_wsgi(asgi, client):
+    _, asgi_client = asgi
+    r = asgi_client.post("/api/v3/reservations/reservations", json={"from": "2030-01-02", "to": "2030-01-01", "room_id": str(uuid.uuid4())})
+    assert r.status_code == 400
+    body = r.json()
+    assert body["errors"][0]["message"] == "From must be before To"
+    assert set(body) == {"errors", "trace"}
+
+
+def test_get_reservation_with_etag(asgi):
+    asgi_app, asgi_client = asgi
+    res = FakeReservation()
+    asgi_app.state.sessionmaker = lambda: FakeSession([res])
+
+    r = asgi_client.get(f"/api/v3/reservations/reservations/{res.id}")
+    assert r.status_code == 200
+    assert r.json()["id"] == str(res.id)
+
+    r2 = asgi_client.get(f"/api/v3/reservations/reservations/{res.id}", headers={"If-None-Match": r.headers["ETag"]})
+    assert r2.status_code == 304
+
+    r3 = asgi_client.get(f"/api/v3/reservations/reservations/{uuid.uuid4()}")
+    assert r3.status_code == 404
+
+
+def test_delete_requires_auth_and_soft_deletes(monkeypatch, asgi):
+    asgi_app, asgi_client = asgi
+    res = FakeReservation()
+    session = FakeSession([res])
+    asgi_app.state.sessionmaker = lambda: session
+
+    r = asgi_client.delete(f"/api/v3/reservations/reservations/{res.id}")
+    assert r.status_code == 401
+
+    _monkeypatch_auth(monkeypatch)
+    r = asgi_client.delete(f"/api/v3/reservations/reservations/{res.id}", headers={"Authorization": f"Bearer {fake_token}"})
+    assert r.status_code == 204
+    assert res.deleted_at is not None
+    assert session.committed
+
+
+def test_other_routes_fall_back_to_flask(asgi):
+    _, asgi_client = asgi
+    r = asgi_client.get("/metrics")
+    assert r.status_code == 200
+    assert "http_request_duration_seconds" in r.text
+
+
+def test_list_rejects_invalid_filters(asgi, client):
+    asgi_app, asgi_client = asgi
+    asgi_app.state.sessionmaker = None  # darf nicht benutzt werden
+    r = asgi_client.get("/api/v3/reservations/reservations?before=soon")
+    assert r.status_code == 400
+    expected = client.get("/api/v3/reservations/reservations?before=soon").get_json()
+    assert r.json()["errors"][0]["more_info"] == expected["errors"][0]["more_info"]
+
+
+def test_list_binds_multiple_ids_and_rooms(asgi):
+    from app import queries
+
+    asgi_app, asgi_client = asgi
+    items = [FakeReservation(), FakeReservation()]
+    calls = []
+
+    class ListSession(FakeSession):
+        async def execute(self, stmt, params=None):
+            calls.append((stmt, params))
+
+            class Result:
+                def all(self):
+                    return items
+            return Result()
+
+    asgi_app.state.sessionmaker = lambda: ListSession(items)
+    room_id = uuid.uuid4()
+    ids = "&".join(f"id={i.id}" for i in items)
+
+    r = asgi_client.get(f"/api/v3/reservations/reservations?{ids}&room_id={room_id}")
+    assert r.status_code == 200
+    assert [x["id"] for x in r.json()["reservations"]] == [str(i.id) for i in items]
+    stmt, params = calls[0]
+    assert stmt is queries.reservation_list(False, True, False, False, with_archive=False, by_id=True)
+    assert params == {"room_ids": [room_id], "ids": [i.id for i in items]}
+
+
+def test_async_health_runs_one_check_for_concurrent_probes():
+    import asyncio
+
+    from app.asgi import AsyncDatabaseHealth
+
+    health = AsyncDatabaseHealth(engine=None, interval=5)
+    checks = []
+
+    async def check():
+        checks.append(1)
+        await asyncio.sleep(0.01)
+        health._result = (True, "", time.monotonic())
+        return health._result
+
+    health.check = check
+
+    async def probes():
+        return await asyncio.gather(*(health.database_status() for _ in range(10)))
+
+    assert asyncio.run(probes()) == [(True, "")] * 10
+    assert len(checks) == 1
@@ -50,3 +50,128 @@ def test_require_auth_valid_token(monkeypatch, app, client):
     r = client.get('/protected2', headers={"Authorization": f"Bearer {fake_token}"})
     assert r.status_code == 200
     assert r.get_data(as_text=True) == "user1"
+
+
+def _rsa_jwk(kid):
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jwt.algorithms import RSAAlgorithm
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk["kid"] = kid
+    return jwk
+
+
+def test_key_store_does_not_cache_failures(monkeypatch):
+    from app.auth import JWKSKeyStore
+
+    responses = [None, {"keys": [_rsa_jwk("k1")]}]
+    monkeypatch.setattr('app.auth.get_jwks_client', lambda: responses.pop(0))
+
+    store = JWKSKeyStore(ttl=300, min_refetch_interval=0)
+    assert store.get_key("k1") is None
+    # Keycloak wieder erreichbar: nächster Aufruf lädt erneut
+    assert store.get_key("k1") is not None
+
+
+def test_key_store_refetch_unknown_kid_rate_limited(monkeypatch):
+    from app.auth import JWKSKeyStore
+
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"keys": [_rsa_jwk("k1")]}
+
+    monkeypatch.setattr('app.auth.get_jwks_client', fetch)
+
+    store = JWKSKeyStore(ttl=300, min_refetch_interval=60)
+    first = store.get_key("k1")
+    assert first is not None
+    # Bekannter kid: kein weiterer Abruf, gleiches Key-Objekt
+    assert store.get_key("k1") is first
+    # Unbekannter kid innerhalb des Intervalls: kein erneuter Abruf
+    assert store.get_key("unknown") is None
+    assert len(calls) == 1
+
+
+def test_key_store_rate_limits_failing_background_refresh(monkeypatch):
+    from app.auth import JWKSKeyStore
+
+    calls = []
+    responses = [{"keys": [_rsa_jwk("k1")]}]
+
+    def fetch():
+        calls.append(1)
+        return responses.pop(0) if responses else None
+
+    started = []
+
+    class InlineThread:
+        def __init__(self, target, **kwargs):
+            self.target = target
+            started.append(target)
+
+        def start(self):
+            self.target()
+
+    monkeypatch.setattr('app.auth.get_jwks_client', fetch)
+    monkeypatch.setattr('app.auth.threading.Thread', InlineThread)
+
+    store = JWKSKeyStore(ttl=0, min_refetch_interval=30)
+    assert store.get_key("k1") is not None
+    # TTL abgelaufen, Keycloak nicht erreichbar: höchstens ein Abruf pro Intervall
+    for _ in range(200):
+        assert store.get_key("k1") is not None
+        assert store.get_key("unknown") is None
+    assert len(calls) == 1 and started == []
+
+    store._last_attempt -= 30
+    for _ in range(200):
+        store.get_key("k1")
+    assert len(calls) == 2 and len(started) == 1
+    assert store.stats()["refresh_failures"] == 1
+
+
+def test_verified_token_cache_skips_decode(monkeypatch, app, client):
+    from app.auth import require_auth
+
+    decode_calls = []
+
+    def fake_decode(token, key, algorithms, options):
+        decode_calls.append(token)
+        return {"sub": "user1"}
+
+    monkeypatch.setattr('app.auth.get_jwks_client', lambda: {"keys": [_rsa_jwk("test-kid")]})
+    monkeypatch.setattr('app.auth.jwt.get_unverified_header', lambda token: {"kid": "test-kid"})
+    monkeypatch.setattr('app.auth.jwt.decode', fake_decode)
+
+    @app.route('/protected3')
+    @require_auth
+    def protected3():
+        return request.user_id, 200
+
+    for _ in range(3):
+        r = client.get('/protected3', headers={"Authorization": "Bearer some-token"})
+        assert r.status_code == 200
+
+    assert len(decode_calls) == 1
+    stats = app.extensions["token_cache"].stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_verified_token_cache_respects_exp():
+    import time
+    from app.auth import VerifiedTokenCache
+
+    cache = VerifiedTokenCache(max_entries=2, ttl=300)
+    cache.put("expired", {"sub": "a", "exp": time.time() - 1})
+    assert cache.get("expired") is None
+
+    cache.put("t1", {"sub": "1"})
+    cache.put("t2", {"sub": "2"})
+    cache.put("t3", {"sub": "3"})
+    # LRU: ältester Eintrag wird verdrängt
+    assert cache.get("t1") is None
+    assert cache.get("t3") == {"sub": "3"}
@@ -0,0 +1,60 @@
+import uuid
+from datetime import date
+
+from app.availability import free_intervals
+
+
+def test_free_intervals_gaps_and_edges():
+    booked = [
+        (date(2024, 12, 28), date(2025, 1, 3)),  # ragt in das Fenster
+        (date(2025, 1, 5), date(2025, 1, 7)),
+        (date(2025, 1, 7), date(2025, 1, 8)),    # direkt anschließend
+    ]
+    assert free_intervals(booked, date(2025, 1, 1), date(2025, 1, 10)) == [
+        (date(2025, 1, 3), date(2025, 1, 5)),
+        (date(2025, 1, 8), date(2025, 1, 10)),
+    ]
+
+
+def test_free_intervals_empty_room():
+    assert free_intervals([], date(2025, 1, 1), date(2025, 1, 2)) == [(date(2025, 1, 1), date(2025, 1, 2))]
+
+
+def test_availability_endpoint(monkeypatch, client):
+    from app import routes
+
+    room = uuid.uuid4()
+    calls = []
+
+    def fake_availability(room_ids, window_from, window_to):
+        calls.append((room_ids, window_from, window_to))
+        return [{"room_id": str(room), "free": []}]
+
+    monkeypatch.setattr(routes, 'get_availability', fake_availability)
+
+    r = client.get(f'/api/v3/reservations/availability?room_id={room}&room_id={room}&from=2025-01-01&to=2025-02-01')
+    assert r.status_code == 200
+    assert calls == [([room], date(2025, 1, 1), date(2025, 2, 1))]
+
+    r = client.get('/api/v3/reservations/availability?room_id=nope&from=2025-01-01&to=2025-02-01')
+    assert r.status_code == 400
+
+
+def test_availability_endpoint_limits_room_ids(monkeypatch, client):
+    from app import routes
+    from app.config import Config
+
+    monkeypatch.setattr(routes, 'get_availability', lambda room_ids, window_from, window_to: [])
+    monkeypatch.setattr(Config, 'REQUEST_MAX_VALUES', 2)
+    rooms = "&".join(f"room_id={uuid.uuid4()}" for _ in range(3))
+
+    r = client.get(f'/api/v3/reservations/availability?{rooms}&from=2025-01-01&to=2025-02-01')
+    assert r.status_code == 400
+    assert "at most 2 values" in r.get_json()["errors"][0]["more_info"]
+
+    r = client.get('/api/v3/reservations/availability?from=2025-01-01&to=2025-02-01')
+    assert r.status_code == 400
+
+    r = client.get(f'/api/v3/reservations/availability?room_id={uuid.uuid4()}&from=2025-02-01&to=2025-01-01')
+    assert r.status_code == 400
+    assert r.get_json()["errors"][0]["message"] == "From must be before To"
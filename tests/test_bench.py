@@ -0,0 +1,19 @@
+from benchmarks.bench import compare, summarize
+
+
+def test_summarize_percentiles():
+    latencies = [i / 1000 for i in range(1, 101)]
+    stats = summarize(latencies, wall=2.0, statuses={"200": 100})
+    assert stats["requests"] == 100
+    assert stats["throughput_rps"] == 50.0
+    assert stats["p50_ms"] == 50.0
+    assert stats["p99_ms"] == 99.0
+    assert stats["max_ms"] == 100.0
+
+
+def test_compare_reports_changes():
+    old = {"commit": "a" * 40, "scenarios": {"get": {"throughput_rps": 100.0, "p50_ms": 2.0, "p99_ms": 10.0}}}
+    new = {"commit": "b" * 40, "scenarios": {"get": {"throughput_rps": 150.0, "p50_ms": 1.0, "p99_ms": 10.0}}}
+    lines = compare(old, new)
+    assert "+50.0%" in lines[1]
+    assert "-50.0%" in lines[1]
@@ -0,0 +1,139 @@
+import uuid
+from datetime import date
+
+from app.bulk import check_overlaps, parse_items
+
+from test_reservations import _monkeypatch_auth, fake_token
+
+
+def test_parse_items_reports_invalid_items():
+    room = str(uuid.uuid4())
+    items, errors = parse_items([
+        {"room_id": room, "from": "2025-01-01", "to": "2025-01-03"},
+        {"room_id": room, "from": "2025-01-03"},
+        {"room_id": room, "from": "2025-01-05", "to": "2025-01-05"},
+        None,
+    ])
+    assert [i["index"] for i in items] == [0]
+    assert set(errors) == {1, 2, 3}
+
+
+def test_check_overlaps_against_db_and_batch():
+    room = uuid.uuid4()
+    other_room = uuid.uuid4()
+    items, _ = parse_items([
+        {"room_id": str(room), "from": "2025-01-02", "to": "2025-01-04"},  # overlaps DB
+        {"room_id": str(room), "from": "2025-01-10", "to": "2025-01-12"},
+        {"room_id": str(room), "from": "2025-01-11", "to": "2025-01-13"},  # overlaps item 1
+        {"room_id": str(room), "from": "2025-01-12", "to": "2025-01-14"},  # adjacent to item 1
+        {"room_id": str(other_room), "from": "2025-01-02", "to": "2025-01-04"},
+    ])
+    existing = [(uuid.uuid4(), room, date(2025, 1, 1), date(2025, 1, 3))]
+
+    errors = check_overlaps(items, existing)
+    assert set(errors) == {0, 2}
+    assert "item 1" in errors[2]["more_info"]
+
+
+def test_check_overlaps_keeps_rejected_update_occupied():
+    room = uuid.uuid4()
+    moved, blocker = uuid.uuid4(), uuid.uuid4()
+    existing = [
+        (moved, room, date(2025, 1, 1), date(2025, 1, 3)),
+        (blocker, room, date(2025, 1, 10), date(2025, 1, 12)),
+    ]
+    items, _ = parse_items([
+        # Verschiebt 'moved' auf 'blocker': abgelehnt, 'moved' bleibt belegt
+        {"id": str(moved), "room_id": str(room), "from": "2025-01-11", "to": "2025-01-13"},
+        {"room_id": str(room), "from": "2025-01-02", "to": "2025-01-04"},
+        # Eigene Zeile ist für das Update selbst frei
+        {"id": str(blocker), "room_id": str(room), "from": "2025-01-11", "to": "2025-01-14"},
+    ])
+
+    errors = check_overlaps(items, existing)
+    assert set(errors) == {0, 1}
+    assert errors[1]["more_info"] == "The requested reservation overlaps with an existing reservation."
+
+
+def test_check_overlaps_frees_interval_of_accepted_update():
+    room = uuid.uuid4()
+    moved = uuid.uuid4()
+    items, _ = parse_items([
+        {"id": str(moved), "room_id": str(room), "from": "2025-01-10", "to": "2025-01-12"},
+        {"room_id": str(room), "from": "2025-01-01", "to": "2025-01-03"},
+    ])
+
+    assert check_overlaps(items, [(moved, room, date(2025, 1, 1), date(2025, 1, 3))]) == {}
+
+
+def test_batch_endpoint_accepts_ndjson(monkeypatch, client):
+    from app import routes
+    _monkeypatch_auth(monkeypatch)
+
+    received = []
+
+    def fake_upsert(raw_items):
+        received.extend(raw_items)
+        return {"results": [], "created": len(received), "updated": 0, "failed": 0}
+
+    monkeypatch.setattr(routes, 'upsert_reservations', fake_upsert)
+
+    body = b'{"room_id": "a", "from": "2025-01-01", "to": "2025-01-02"}\n\n{"room_id": "b"}\n'
+    r = client.post('/api/v3/reservations/reservations/batch', data=body,
+                    headers={"Authorization": f"Bearer {fake_token}", "Content-Type": "application/x-ndjson"})
+    assert r.status_code == 200
+    assert len(received) == 2
+
+
+def test_batch_endpoint_rejects_non_array(monkeypatch, client):
+    _monkeypatch_auth(monkeypatch)
+    r = client.post('/api/v3/reservations/reservations/batch', json={"room_id": "a"},
+                    headers={"Authorization": f"Bearer {fake_token}"})
+    assert r.status_code == 400
+
+
+def test_batch_endpoint_rejects_too_large_batch(monkeypatch, client):
+    from app.config import Config
+    _monkeypatch_auth(monkeypatch)
+    monkeypatch.setattr(Config, 'BULK_MAX_ITEMS', 1)
+    item = {"room_id": str(uuid.uuid4()), "from": "2025-01-01", "to": "2025-01-02"}
+    r = client.post('/api/v3/reservations/reservations/batch', json=[item, item],
+                    headers={"Authorization": f"Bearer {fake_token}"})
+    assert r.status_code == 413
+    assert r.get_json()["errors"][0]["code"] == "payload_too_large"
+
+
+def test_upsert_rejects_archived_ids(monkeypatch, app):
+    from app import bulk
+    from app.config import Config
+
+    archived_id, room = uuid.uuid4(), uuid.uuid4()
+    executed = []
+
+    class Session:
+        def execute(self, stmt, params=None):
+            executed.append(stmt)
+            if stmt is bulk.KNOWN_ARCHIVED_IDS:
+                return [(archived_id,)] if archived_id in params["ids"] else []
+            return []
+
+        def commit(self):
+            pass
+
+        def remove(self):
+            pass
+
+    monkeypatch.setattr(Config, "ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(bulk.db, "session", Session())
+    with app.app_context():
+        result = bulk.upsert_reservations([
+            {"id": str(archived_id), "room_id": str(room), "from": "2025-01-01", "to": "2025-01-03"},
+            {"room_id": str(room), "from": "2025-01-05", "to": "2025-01-06"},
+        ])
+
+    assert result["failed"] == 1 and result["created"] == 1
+    assert result["results"][0]["status"] == 400
+    assert result["results"][0]["errors"][0]["more_info"] == "Reservation is archived and can no longer be modified."
+    # Das archivierte Item wird weder geprüft noch geschrieben
+    [insert] = [stmt for stmt in executed if getattr(stmt, "is_insert", False)]
+    assert archived_id not in insert.compile().params.values()
@@ -0,0 +1,75 @@
+import uuid
+
+from app.cache import InMemoryCache, ReservationCache
+
+from test_reservations import DummyDB, DummyQuery, DummyReservation, _monkeypatch_auth, fake_token
+
+
+def test_in_memory_cache_lru_and_ttl():
+    cache = InMemoryCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("expired", 4, ttl=-1)
+    assert cache.get("expired") is None
+
+
+def test_invalidate_room_lists():
+    cache = ReservationCache(InMemoryCache(100), ttl=60)
+    room, other_room = uuid.uuid4(), uuid.uuid4()
+    cache.set_room_list(cache.room_list_key(room, (False, None, None)), "[]", "e1")
+    cache.set_room_list(cache.room_list_key(other_room, (False, None, None)), "[]", "e2")
+
+    cache.invalidate([], [room])
+    assert cache.get_room_list(cache.room_list_key(room, (False, None, None))) is None
+    assert cache.get_room_list(cache.room_list_key(other_room, (False, None, None))) is not None
+
+
+def test_list_read_before_invalidation_is_not_served(monkeypatch, app, client):
+    from app import routes
+    from test_reservations import DummyListSession
+
+    cache = app.extensions["reservation_cache"] = ReservationCache(InMemoryCache(100), ttl=60)
+    room = uuid.uuid4()
+    old, new = DummyReservation(room_id=room), DummyReservation(room_id=room)
+
+    def rows(stmt):
+        # Ein Write invalidiert den Raum, während die Liste gelesen wird
+        cache.invalidate([new.id], [room])
+        return [old]
+
+    monkeypatch.setattr(routes, "read_session", lambda: DummyListSession(rows))
+    r = client.get(f'/api/v3/reservations/reservations?room_id={room}')
+    assert [x["id"] for x in r.get_json()["reservations"]] == [str(old.id)]
+
+    monkeypatch.setattr(routes, "read_session", lambda: DummyListSession([old, new]))
+    r = client.get(f'/api/v3/reservations/reservations?room_id={room}')
+    assert len(r.get_json()["reservations"]) == 2
+
+
+def test_get_reservation_cached_and_invalidated_on_delete(monkeypatch, app, client):
+    from app import routes
+    _monkeypatch_auth(monkeypatch)
+    app.extensions["reservation_cache"] = ReservationCache(InMemoryCache(100), ttl=60)
+
+    res = DummyReservation()
+    monkeypatch.setattr(routes, 'Reservation', DummyReservation)
+    monkeypatch.setattr(DummyReservation, 'query', DummyQuery([res]))
+    monkeypatch.setattr(routes, 'db', DummyDB())
+
+    r1 = client.get(f'/api/v3/reservations/reservations/{res.id}')
+    # Treffer aus dem Cache, ohne DB-Abfrage
+    monkeypatch.setattr(DummyReservation, 'query', DummyQuery([]))
+    r2 = client.get(f'/api/v3/reservations/reservations/{res.id}')
+    assert r2.status_code == 200
+    assert r2.get_json() == r1.get_json()
+    assert r2.headers['ETag'] == r1.headers['ETag']
+
+    monkeypatch.setattr(DummyReservation, 'query', DummyQuery([res]))
+    r = client.delete(f'/api/v3/reservations/reservations/{res.id}', headers={"Authorization": f"Bearer {fake_token}"})
+    assert r.status_code == 204
+    assert app.extensions["reservation_cache"].get_reservation(res.id) is None
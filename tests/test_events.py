@@ -0,0 +1,156 @@
+import threading
+import time
+import uuid
+
+from app.config import Config
+from test_reservations import DummyDB, DummyReservation
+
+
+def _event(event_id, action="create"):
+    room_id = str(uuid.uuid4())
+    return {
+        "id": event_id,
+        "action": action,
+        "reservation_id": str(uuid.uuid4()),
+        "room_id": room_id,
+        "reservation": {"room_id": room_id, "from": "2030-01-01", "to": "2030-01-02"},
+        "created_at": "2030-01-01T00:00:00",
+    }
+
+
+class FakeNotifier:
+    version = 0
+
+    def __init__(self):
+        self.waits = []
+
+    def wait(self, version, timeout):
+        self.waits.append(timeout)
+        return self.version
+
+    def stats(self):
+        return {"listening": False, "notifications": 0}
+
+
+def _patch_feed(monkeypatch, batches, latest=0):
+    from app import routes
+
+    calls = []
+
+    def fake_fetch(after, room_id=None, limit=None):
+        calls.append((after, room_id))
+        return batches.pop(0) if batches else []
+
+    notifier = FakeNotifier()
+    monkeypatch.setattr(Config, "EVENTS_ENABLED", True)
+    monkeypatch.setattr(routes, "fetch_events", fake_fetch)
+    monkeypatch.setattr(routes, "latest_event_id", lambda: latest)
+    monkeypatch.setattr(routes, "get_event_notifier", lambda: notifier)
+    return calls, notifier
+
+
+def test_record_event_writes_lock_and_outbox_row(monkeypatch, app):
+    import app.events as events
+
+    calls = []
+
+    class Session:
+        def flush(self):
+            calls.append("flush")
+
+        def execute(self, stmt, params=None):
+            calls.append((stmt, params))
+
+        def remove(self):
+            pass
+
+    monkeypatch.setattr(events.db, "session", Session())
+    res = DummyReservation()
+    with app.app_context():
+        events.record_event("create", res)
+        assert calls == []
+
+        monkeypatch.setattr(Config, "EVENTS_ENABLED", True)
+        events.record_event("create", res)
+
+    assert calls[0] == "flush"
+    assert calls[1][0] is events.EVENT_LOCK
+    assert calls[2][0].table.name == "reservation_events"
+    row = calls[2][1][0]
+    assert row["action"] == "create" and row["reservation_id"] == res.id
+    assert row["payload"] == res.to_dict()
+
+
+def test_create_records_event_before_commit(monkeypatch, client):
+    from app import routes
+
+    order = []
+    dummy_db = DummyDB()
+    dummy_db.session.commit = lambda: order.append("commit")
+    monkeypatch.setattr(routes, "Reservation", DummyReservation)
+    monkeypatch.setattr(routes, "db", dummy_db)
+    monkeypatch.setattr(routes, "record_event", lambda action, res: order.append(action))
+
+    payload = {"room_id": str(uuid.uuid4()), "from": "2030-01-01", "to": "2030-01-02"}
+    r = client.post('/api/v3/reservations/reservations', json=payload)
+    assert r.status_code == 201
+    assert order == ["create", "commit"]
+
+
+def test_events_disabled(client):
+    r = client.get('/api/v3/reservations/events')
+    assert r.status_code == 404
+
+
+def test_events_long_poll(monkeypatch, client):
+    calls, _ = _patch_feed(monkeypatch, [[_event(6), _event(7, "update")]])
+
+    r = client.get('/api/v3/reservations/events?stream=false&after=5')
+    assert r.status_code == 200
+    body = r.get_json()
+    assert [e["id"] for e in body["events"]] == [6, 7]
+    assert body["next_cursor"] == 7
+    assert calls == [(5, None)]
+
+
+def test_events_long_poll_without_cursor_starts_at_latest(monkeypatch, client):
+    calls, notifier = _patch_feed(monkeypatch, [], latest=42)
+
+    r = client.get('/api/v3/reservations/events?stream=false&timeout=0')
+    assert r.get_json() == {"events": [], "next_cursor": 42}
+    assert calls == [(42, None)]
+    assert notifier.waits == []
+
+
+def test_events_invalid_cursor(monkeypatch, client):
+    _patch_feed(monkeypatch, [])
+    r = client.get('/api/v3/reservations/events?after=abc')
+    assert r.status_code == 400
+
+
+def test_events_stream_resumes_from_last_event_id(monkeypatch, client):
+    calls, _ = _patch_feed(monkeypatch, [[_event(4)], [], [_event(5, "soft_delete")]])
+    monkeypatch.setattr(Config, "EVENTS_STREAM_MAX_SECONDS", 0.2)
+    room_id = uuid.uuid4()
+
+    r = client.get(f'/api/v3/reservations/events?room_id={room_id}', headers={"Last-Event-ID": "3"})
+    assert r.status_code == 200
+    assert r.mimetype == "text/event-stream"
+    body = r.get_data(as_text=True)
+    assert body.startswith("id: 3\n\n")
+    assert "id: 4\nevent: create\ndata: " in body
+    assert "id: 5\nevent: soft_delete\ndata: " in body
+    assert calls[:3] == [(3, room_id), (4, room_id), (4, room_id)]
+    assert calls[-1][0] == 5
+
+
+def test_notifier_wakes_waiters():
+    from app.events import EventNotifier
+
+    notifier = EventNotifier(None, poll_interval=5)
+    threading.Timer(0.05, notifier.notify).start()
+    start = time.monotonic()
+    assert notifier.wait(0, 5) == 1
+    assert time.monotonic() - start < 1
+    # Bereits verpasste Notification: kein Warten
+    assert notifier.wait(0, 5) == 1
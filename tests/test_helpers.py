@@ -1,5 +1,9 @@
 import datetime
+import uuid
 
+import pytest
+
+from app.helpers import Helpers
 from app.models import get_current_time
 
 
@@ -7,3 +11,13 @@ def test_get_current_time_is_aware():
     t = get_current_time()
     assert t.tzinfo is not None
     assert isinstance(t, datetime.datetime)
+
+
+def test_cursor_roundtrip():
+    pos = (datetime.date(2025, 1, 2), uuid.uuid4())
+    assert Helpers.decode_cursor(Helpers.encode_cursor(*pos)) == pos
+
+
+def test_decode_cursor_invalid():
+    with pytest.raises(ValueError):
+        Helpers.decode_cursor("not-a-cursor")
@@ -0,0 +1,34 @@
+import logging
+import queue
+
+from app.config import Config
+from app.logs import DroppingQueueHandler, get_logging_stats
+
+
+def test_queue_handler_drops_when_full():
+    handler = DroppingQueueHandler(queue.Queue(1), block_timeout=0)
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+    handler.handle(record)
+    handler.handle(record)
+
+    assert handler.dropped == 1
+    queued = handler.queue.get_nowait()
+    assert queued.getMessage() == "hello world"
+    assert queued.args is None
+
+
+def test_async_logging_writes_via_listener(monkeypatch):
+    from app import create_app
+    from app.logs import stop_listener
+
+    monkeypatch.setattr(Config, "LOG_ASYNC", True)
+    app = create_app()
+    records = []
+
+    # Filter am Ziel-Handler sammelt die Records, ohne sie auszugeben
+    app.extensions["log_queue"]["target"].addFilter(lambda r: records.append(r) or False)
+    app.logger.info("Reservation created", extra={"event.action": "create"})
+    stop_listener(app)
+
+    assert [r.getMessage() for r in records] == ["Reservation created"]
+    assert get_logging_stats(app) == {"async": True, "queued": 0, "dropped": 0}
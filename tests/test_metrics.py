@@ -0,0 +1,42 @@
+from flask import g
+
+from app import metrics
+
+
+class FakeContext:
+    pass
+
+
+def test_db_query_counted_per_request(app):
+    context = FakeContext()
+    with app.test_request_context('/api/v3/reservations/reservations'):
+        metrics._before_cursor_execute(None, None, "SELECT 1", {}, context, False)
+        metrics._after_cursor_execute(None, None, "SELECT 1", {}, context, False)
+        assert g.metrics_db_queries == 1
+        assert g.metrics_db_time >= 0
+
+
+def test_failed_statement_leaves_no_state_on_connection():
+    import pytest
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.exc import OperationalError
+
+    engine = create_engine("sqlite://")
+    metrics.instrument_engine(engine)
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+        assert conn.info == {}
+
+
+def test_metrics_endpoint_exposes_route_histogram(client):
+    client.get("/api/v3/reservations/status")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    body = resp.get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v3/reservations/status",status="200"}' in body
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in body
+    assert 'db_pool_connections{state="checked_out"} 0' in body
@@ -0,0 +1,43 @@
+import uuid
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from app import queries
+
+
+def _sql(stmt):
+    return str(stmt.compile(dialect=postgresql.psycopg.dialect()))
+
+
+def test_id_lists_are_bound_as_one_array():
+    sql = _sql(queries.BOOKED_INTERVALS)
+    assert "= ANY (%(room_ids)s::UUID[])" in sql
+    assert " IN " not in sql
+
+
+def test_list_statements_are_built_once_per_shape():
+    stmt = queries.reservation_list(False, True, False, True, keyset=True)
+    assert queries.reservation_list(False, True, False, True, keyset=True) is stmt
+    sql = _sql(stmt)
+    assert "= ANY (%(room_ids)s::UUID[])" in sql and "%(before)s" in sql and "%(after)s" not in sql
+    assert "LIMIT %(limit)s" in sql
+
+    compiled = stmt.compile(dialect=postgresql.psycopg.dialect())
+    params = compiled.construct_params({
+        "room_ids": [uuid.uuid4()], "before": date(2030, 1, 1),
+        "cursor_from": date.min, "cursor_id": uuid.UUID(int=0), "limit": 10,
+    })
+    assert params["limit"] == 10
+
+
+def test_list_params_select_the_statement_shape():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    filters = {"include_deleted": True, "room_id": None, "id": [a, b], "after": date(2030, 1, 1), "before": None}
+    params, shape, by_id = queries.list_params(filters)
+    assert params == {"ids": [a, b], "after": date(2030, 1, 1)}
+    assert shape == (True, False, True, False) and by_id
+
+    sql = _sql(queries.reservation_list(*shape, by_id=by_id))
+    assert "reservations.id = ANY (%(ids)s::UUID[])" in sql
+    assert "deleted_at IS NULL" not in sql
@@ -47,15 +47,6 @@ class DummyQuery:
     def __init__(self, items=None):
         self._items = items or []
 
-    def filter(self, *args, **kwargs):
-        return self
-
-    def all(self):
-        return self._items
-
-    def first(self):
-        return self._items[0] if self._items else None
-
     def get(self, id_):
         for it in self._items:
             if str(it.id) == str(id_):
@@ -63,6 +54,43 @@ class DummyQuery:
         return None
 
 
+class DummyResult:
+    def __init__(self, rows, watermark=None):
+        self._rows = rows
+        self._watermark = watermark
+
+    def all(self):
+        return self._rows
+
+    def scalar(self):
+        return self._watermark
+
+    def partitions(self):
+        yield self._rows
+
+
+class DummyListSession:
+    """Records the executed statements; 'rows' may depend on the statement."""
+
+    def __init__(self, rows=None, watermark=None):
+        self.rows = rows if callable(rows) else (lambda stmt: rows or [])
+        self.watermark = watermark
+        self.calls = []
+
+    def execute(self, stmt, params=None, execution_options=None):
+        self.calls.append((stmt, params))
+        rows = self.rows(stmt)
+        if params and "limit" in params and params["limit"] is not None:
+            rows = rows[:params["limit"]]
+        return DummyResult(rows, self.watermark)
+
+
+def _monkeypatch_list_session(monkeypatch, session):
+    from app import routes
+    monkeypatch.setattr(routes, 'read_session', lambda: session)
+    return session
+
+
 class DummyReservation:
     query = DummyQuery([])
 
@@ -99,20 +127,125 @@ class DummyDBSession:
     def delete(self, o):
         pass
 
+    def rollback(self):
+        pass
+
 
 class DummyDB:
     def __init__(self):
         self.session = DummyDBSession()
 
 
+class ExclusionViolation(Exception):
+    # Mimics psycopg's ExclusionViolation (SQLSTATE 23P01)
+    sqlstate = "23P01"
+
+    class diag:
+        constraint_name = "reservations_no_overlap"
+
+
+class OverlapDBSession(DummyDBSession):
+    def commit(self):
+        from sqlalchemy.exc import IntegrityError
+        raise IntegrityError("INSERT INTO reservations ...", {}, ExclusionViolation())
+
+
+class OverlapDB:
+    def __init__(self):
+        self.session = OverlapDBSession()
+
+
 def test_get_reservations_empty(monkeypatch, client):
-    from app import routes
+    from app import queries
 
-    routes.Reservation.query = DummyQuery([])
+    session = _monkeypatch_list_session(monkeypatch, DummyListSession())
 
     r = client.get('/api/v3/reservations/reservations')
     assert r.status_code == 200
     assert r.get_json() == {"reservations": []}
+    # Vorab gebautes Statement statt pro Request gebauter Query
+    assert session.calls == [(queries.reservation_list(False, False, False, False, with_archive=False, by_id=False), {})]
+
+
+def test_get_reservations_paginated(monkeypatch, client):
+    from app import routes
+
+    items = [DummyReservation(start_date=date(2025, 1, d), end_date=date(2025, 1, d + 1)) for d in range(1, 4)]
+    session = _monkeypatch_list_session(monkeypatch, DummyListSession(items))
+
+    r = client.get('/api/v3/reservations/reservations?limit=2')
+    assert r.status_code == 200
+    body = r.get_json()
+    assert [x["id"] for x in body["reservations"]] == [str(i.id) for i in items[:2]]
+    assert routes.Helpers.decode_cursor(body["next_cursor"]) == (items[1].start_date, items[1].id)
+    assert session.calls[0][1] == {"cursor_from": date.min, "cursor_id": uuid.UUID(int=0), "limit": 3}
+
+    # Letzte Seite: kein weiterer Cursor
+    session = _monkeypatch_list_session(monkeypatch, DummyListSession(items[2:]))
+    r = client.get(f'/api/v3/reservations/reservations?limit=2&cursor={body["next_cursor"]}')
+    assert r.status_code == 200
+    assert "next_cursor" not in r.get_json()
+    assert session.calls[0][1]["cursor_id"] == items[1].id
+
+
+def test_get_reservations_page_etag_ignores_lookahead_row(monkeypatch, client):
+    from app.etags import collection_etag
+
+    items = [DummyReservation(start_date=date(2025, 1, d), end_date=date(2025, 1, d + 1)) for d in range(1, 5)]
+    _monkeypatch_list_session(monkeypatch, DummyListSession(items[:3]))
+
+    r = client.get('/api/v3/reservations/reservations?limit=2')
+    assert r.headers['ETag'] == f'"{collection_etag(items[:2])}-next"'
+
+    # Andere Zeile limit + 1: gleiche Seite, daher 304
+    _monkeypatch_list_session(monkeypatch, DummyListSession(items[:2] + items[3:]))
+    r2 = client.get('/api/v3/reservations/reservations?limit=2', headers={"If-None-Match": r.headers['ETag']})
+    assert r2.status_code == 304
+
+    # Ohne Folgeseite (kein next_cursor) ändert sich der Body und damit das ETag
+    _monkeypatch_list_session(monkeypatch, DummyListSession(items[:2]))
+    r3 = client.get('/api/v3/reservations/reservations?limit=2', headers={"If-None-Match": r.headers['ETag']})
+    assert r3.status_code == 200
+    assert r3.headers['ETag'] == f'"{collection_etag(items[:2])}"'
+
+
+def test_get_reservations_by_ids_and_rooms(monkeypatch, client):
+    from app import queries
+
+    items = [DummyReservation() for _ in range(2)]
+    session = _monkeypatch_list_session(monkeypatch, DummyListSession(items))
+    ids = "&".join(f"id={i.id}" for i in items)
+    room_ids = [uuid.uuid4(), uuid.uuid4()]
+
+    r = client.get(f'/api/v3/reservations/reservations?{ids}&room_id={room_ids[0]}&room_id={room_ids[1]}')
+    assert r.status_code == 200
+    assert [x["id"] for x in r.get_json()["reservations"]] == [str(i.id) for i in items]
+    stmt, params = session.calls[0]
+    assert stmt is queries.reservation_list(False, True, False, False, with_archive=False, by_id=True)
+    assert params == {"room_ids": room_ids, "ids": [i.id for i in items]}
+
+    r = client.post('/api/v3/reservations/reservations/search', json={"id": [str(i.id) for i in items]})
+    assert r.status_code == 200
+    assert len(r.get_json()["reservations"]) == 2
+    assert session.calls[-1][1] == {"ids": [i.id for i in items]}
+
+
+def test_get_reservations_invalid_pagination(client):
+    r = client.get('/api/v3/reservations/reservations?limit=0')
+    assert r.status_code == 400
+
+    r = client.get('/api/v3/reservations/reservations?cursor=not-a-cursor')
+    assert r.status_code == 400
+
+
+def test_get_reservations_stream(monkeypatch, client):
+    items = [DummyReservation() for _ in range(3)]
+    session = _monkeypatch_list_session(monkeypatch, DummyListSession(items))
+
+    r = client.get('/api/v3/reservations/reservations?stream=true')
+    assert r.status_code == 200
+    assert [x["id"] for x in r.get_json()["reservations"]] == [str(i.id) for i in items]
+    assert session.calls[0][1]["limit"] is None
 
 
 def test_create_reservation_bad_input_missing_fields(client):
@@ -130,13 +263,15 @@ def test_create_reservation_from_after_to(client):
 def test_create_reservation_overlap(monkeypatch, client):
     from app import routes
 
-    # Simulate overlap found
+    # Simulate overlap rejected by the exclusion constraint
     existing = DummyReservation(start_date=date(2025, 1, 1), end_date=date(2025, 1, 5))
-    routes.Reservation.query = DummyQuery([existing])
+    monkeypatch.setattr(routes, 'Reservation', DummyReservation)
+    monkeypatch.setattr(routes, 'db', OverlapDB())
 
     payload = {"room_id": str(existing.room_id), "from": "2025-01-02", "to": "2025-01-03"}
     r = client.post('/api/v3/reservations/reservations', json=payload)
     assert r.status_code == 400
+    assert r.get_json()["errors"][0]["message"] == "Overlap detected"
 
 
 def test_create_reservation_success(monkeypatch, client):
@@ -212,3 +347,51 @@ def test_delete_soft_and_permanent(monkeypatch, client):
     routes.Reservation.query = DummyQuery([res2])
     r2 = client.delete(f'/api/v3/reservations/reservations/{res2.id}?permanent=true', headers={"Authorization": f"Bearer {fake_token}"})
     assert r2.status_code == 204
+
+
+def test_get_reservation_etag_not_modified(monkeypatch, client):
+    from app import routes
+    res = DummyReservation(start_date=date(2025, 3, 1), end_date=date(2025, 3, 2))
+    monkeypatch.setattr(routes, 'Reservation', DummyReservation)
+    monkeypatch.setattr(DummyReservation, 'query', DummyQuery([res]))
+
+    r = client.get(f'/api/v3/reservations/reservations/{res.id}')
+    etag = r.headers['ETag']
+
+    r2 = client.get(f'/api/v3/reservations/reservations/{res.id}', headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.get_data() == b""
+
+    # Änderung -> neues ETag
+    res.end_date = date(2025, 3, 3)
+    r3 = client.get(f'/api/v3/reservations/reservations/{res.id}', headers={"If-None-Match": etag})
+    assert r3.status_code == 200
+
+
+def test_get_reservations_etag_watermark(monkeypatch, client):
+    from app import routes
+    from app.etags import collection_etag
+    items = [DummyReservation() for _ in range(2)]
+    session = _monkeypatch_list_session(monkeypatch, DummyListSession(items, watermark=collection_etag(items)))
+
+    r = client.get('/api/v3/reservations/reservations')
+    assert r.headers['ETag'] == f'"{collection_etag(items)}"'
+
+    r2 = client.get('/api/v3/reservations/reservations', headers={"If-None-Match": r.headers['ETag']})
+    assert r2.status_code == 304
+    # Nur das Watermark-Statement, nicht die Liste
+    assert session.calls[-1][0] is routes.queries.reservation_list_watermark(False, False, False, False, with_archive=False, by_id=False)
+
+
+def test_delete_if_match_mismatch(monkeypatch, client):
+    from app import routes
+    _monkeypatch_auth(monkeypatch)
+    res = DummyReservation()
+    monkeypatch.setattr(routes, 'Reservation', DummyReservation)
+    monkeypatch.setattr(DummyReservation, 'query', DummyQuery([res]))
+    monkeypatch.setattr(routes, 'db', DummyDB())
+
+    r = client.delete(f'/api/v3/reservations/reservations/{res.id}',
+                      headers={"Authorization": f"Bearer {fake_token}", "If-Match": '"stale"'})
+    assert r.status_code == 412
+    assert res.deleted_at is None
@@ -27,3 +27,74 @@ def test_readiness_fail(monkeypatch, client):
     assert resp.status_code == 503
     data = resp.get_json()
     assert "errors" in data
+
+
+def test_diagnostics_pool_stats(client):
+    resp = client.get("/api/v3/reservations/diagnostics")
+    assert resp.status_code == 200
+    pool = resp.get_json()["pool"]
+    assert pool["size"] == 5
+    assert pool["checked_out"] == 0
+
+
+def test_readiness_served_from_cache(monkeypatch, client):
+    calls = []
+
+    def check():
+        calls.append(1)
+        return True, ""
+
+    monkeypatch.setattr(Helpers, "getDatabaseReady", staticmethod(check))
+    for _ in range(3):
+        assert client.get("/api/v3/reservations/health/ready").status_code == 200
+    assert len(calls) == 1
+
+
+def test_readiness_fails_when_pool_saturated(monkeypatch, client):
+    monkeypatch.setattr(Helpers, "getDatabaseReady", staticmethod(lambda: (True, "")))
+    monkeypatch.setattr(Helpers, "get_pool_stats", staticmethod(
+        lambda: {"size": 5, "max_overflow": 5, "checked_in": 0, "checked_out": 10, "overflow": 5}
+    ))
+    resp = client.get("/api/v3/reservations/health/ready")
+    assert resp.status_code == 503
+    assert resp.get_json()["errors"][0]["more_info"].endswith("Connection pool saturated")
+
+
+def test_health_runs_one_check_for_concurrent_probes(monkeypatch, app):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.health import DatabaseHealthMonitor
+
+    monitor = DatabaseHealthMonitor(app, interval=3600, max_staleness=5)
+    monkeypatch.setattr(monitor, "_ensure_started", lambda: None)
+    calls = []
+    release = threading.Event()
+
+    def check():
+        calls.append(1)
+        release.wait(5)
+        return True, ""
+
+    monkeypatch.setattr(Helpers, "getDatabaseReady", staticmethod(check))
+
+    # Ohne Ergebnis warten alle Probes auf den einen Check
+    with ThreadPoolExecutor(10) as pool:
+        futures = [pool.submit(monitor.database_status) for _ in range(10)]
+        time.sleep(0.05)
+        release.set()
+        assert [f.result() for f in futures] == [(True, "")] * 10
+    assert len(calls) == 1
+
+    # Veraltetes Ergebnis: ein Probe prüft, die anderen liefern das letzte Ergebnis
+    release.clear()
+    monitor._result = (False, "old", time.monotonic() - 10)
+    with ThreadPoolExecutor(10) as pool:
+        futures = [pool.submit(monitor.database_status) for _ in range(10)]
+        time.sleep(0.05)
+        assert sum(f.done() for f in futures) == 9
+        assert all(f.result() == (False, "old") for f in futures if f.done())
+        release.set()
+    assert len(calls) == 2
+    assert monitor.database_status() == (True, "")
@@ -0,0 +1,67 @@
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import AddConstraint, CreateIndex
+
+from app.models import OVERLAP_CONSTRAINT_NAME, Reservation
+
+
+def _index_ddl():
+    dialect = postgresql.dialect()
+    return {
+        i.name: str(CreateIndex(i, if_not_exists=True).compile(dialect=dialect))
+        for i in Reservation.__table__.indexes
+    }
+
+
+def test_reservation_indexes_declared():
+    ddl = _index_ddl()
+    assert 'ON reservations (room_id, "from", "to")' in ddl["ix_reservations_room_from_to"]
+    assert ddl["ix_reservations_active_room_from_to"].endswith("WHERE deleted_at IS NULL")
+    assert 'ON reservations ("from", id)' in ddl["ix_reservations_from_id"]
+
+
+def test_overlap_exclusion_constraint_declared():
+    constraint = next(c for c in Reservation.__table__.constraints if c.name == OVERLAP_CONSTRAINT_NAME)
+    ddl = str(AddConstraint(constraint).compile(dialect=postgresql.dialect()))
+    assert 'EXCLUDE USING gist (room_id WITH =, daterange("from", "to") WITH &&) WHERE (deleted_at IS NULL)' in ddl
+
+
+def test_create_indexes_concurrently_outside_a_transaction():
+    from app.schema import create_indexes
+
+    executed = []
+    options = {}
+
+    class Result:
+        def scalars(self):
+            return self
+
+        def all(self):
+            return ["ix_reservations_from_id"]
+
+    class Connection:
+        def execution_options(self, **kwargs):
+            options.update(kwargs)
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, stmt, params=None):
+            executed.append(str(stmt.compile(dialect=postgresql.dialect())))
+            return Result()
+
+    class Engine:
+        def connect(self):
+            return Connection()
+
+    create_indexes(Engine())
+    assert options == {"isolation_level": "AUTOCOMMIT"}
+    assert "set_config('statement_timeout'" in executed[0]
+    assert executed[2] == 'DROP INDEX CONCURRENTLY IF EXISTS "ix_reservations_from_id"'
+    creates = [ddl for ddl in executed if ddl.startswith("CREATE")]
+    assert len(creates) == 7
+    assert all(ddl.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS ") for ddl in creates)
+    assert executed[-1] == "RESET statement_timeout"
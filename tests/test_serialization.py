@@ -0,0 +1,29 @@
+import json
+import uuid
+from datetime import date, datetime, timezone
+
+from flask import Flask
+
+from app.models import Reservation
+from app.serialization import OrjsonProvider, ReservationJSONProvider, reservation_row
+
+
+def _reservation(deleted_at=None):
+    return Reservation(
+        id=uuid.uuid4(),
+        room_id=uuid.uuid4(),
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 1, 3),
+        deleted_at=deleted_at,
+    )
+
+
+def test_reservation_row_matches_to_dict():
+    app = Flask(__name__)
+    res = _reservation(deleted_at=datetime(2025, 1, 2, 10, 30, 0, 123456, tzinfo=timezone.utc))
+    for provider in (OrjsonProvider(app), ReservationJSONProvider(app)):
+        assert json.loads(provider.dumps(reservation_row(res))) == res.to_dict()
+
+
+def test_app_uses_orjson_provider(app):
+    assert isinstance(app.json, OrjsonProvider)
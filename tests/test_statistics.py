@@ -0,0 +1,101 @@
+import uuid
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from app.config import Config
+
+
+class FakeSession:
+    def __init__(self, by_room, by_period):
+        self.by_room = by_room
+        self.by_period = by_period
+        self.params = []
+
+    def execute(self, stmt, params):
+        self.params.append(params)
+        return self.by_room if "GROUP BY occupancy_source.room_id" in str(stmt) else self.by_period
+
+
+def test_occupancy_statements_compile():
+    from app.queries import occupancy_by_period, occupancy_by_room
+
+    dialect = postgresql.psycopg.dialect()
+    by_room = str(occupancy_by_room(True).compile(dialect=dialect))
+    assert "sum(least(occupancy_source.end_date" in by_room
+    assert "room_id = ANY (%(room_ids)s::UUID[])" in by_room
+
+    by_period = str(occupancy_by_period("week", False, True).compile(dialect=dialect))
+    assert "generate_series(greatest(occupancy_source.start_date" in by_period
+    assert "date_trunc('week', day)" in by_period
+    assert "UNION ALL" in by_period and "reservations_archive" in by_period
+
+
+def test_get_occupancy_fills_rooms_and_periods(monkeypatch, app):
+    from app import statistics
+
+    busy, idle = uuid.uuid4(), uuid.uuid4()
+    session = FakeSession(
+        by_room=[(busy, 2, 10)],
+        by_period=[(date(2030, 1, 1), 1, 6), (date(2030, 2, 1), 1, 4)],
+    )
+    monkeypatch.setattr(statistics, "read_session", lambda: session)
+
+    with app.app_context():
+        result = statistics.get_occupancy([busy, idle], date(2030, 1, 16), date(2030, 3, 17), "month")
+
+    assert session.params[0]["room_ids"] == [busy, idle]
+    assert result["rooms"] == [
+        {"room_id": str(busy), "reservations": 2, "occupied_days": 10, "utilization": round(10 / 60, 4)},
+        {"room_id": str(idle), "reservations": 0, "occupied_days": 0, "utilization": 0.0},
+    ]
+    # Randperioden zählen nur ihre Tage im Fenster
+    assert [(p["period"], p["days"], p["occupied_days"]) for p in result["periods"]] == [
+        ("2030-01-01", 16, 6), ("2030-02-01", 28, 4), ("2030-03-01", 16, 0),
+    ]
+    assert result["periods"][0]["utilization"] == round(6 / 32, 4)
+    assert result["totals"] == {"rooms": 2, "reservations": 2, "occupied_days": 10, "utilization": round(10 / 120, 4)}
+
+
+def test_get_occupancy_weeks_start_on_monday(monkeypatch, app):
+    from app import statistics
+
+    monkeypatch.setattr(statistics, "read_session", lambda: FakeSession([], []))
+    with app.app_context():
+        # 2030-01-02 ist ein Mittwoch
+        result = statistics.get_occupancy([], date(2030, 1, 2), date(2030, 1, 15), "week")
+
+    assert [(p["period"], p["days"]) for p in result["periods"]] == [
+        ("2029-12-31", 5), ("2030-01-07", 7), ("2030-01-14", 1),
+    ]
+    assert result["totals"]["utilization"] is None
+
+
+def test_statistics_endpoint_validation(client, monkeypatch):
+    base = '/api/v3/reservations/statistics'
+    assert client.get(base).status_code == 400
+    assert client.get(f'{base}?from=2030-01-01&to=2030-02-01&granularity=year').status_code == 400
+    r = client.get(f'{base}?from=2030-01-01&to=2030-02-01&room_id=nope')
+    assert r.status_code == 400
+    assert r.get_json()["errors"][0]["more_info"].startswith("'room_id':")
+
+    monkeypatch.setattr(Config, "STATISTICS_MAX_DAYS", 10)
+    r = client.get(f'{base}?from=2030-01-01&to=2030-02-01')
+    assert r.status_code == 400
+    assert "10 days" in r.get_json()["errors"][0]["more_info"]
+
+
+def test_statistics_endpoint(client, monkeypatch):
+    from app import routes
+
+    calls = []
+
+    def fake_occupancy(room_ids, window_from, window_to, granularity):
+        calls.append((room_ids, window_from, window_to, granularity))
+        return {"rooms": []}
+
+    monkeypatch.setattr(routes, "get_occupancy", fake_occupancy)
+    room_id = uuid.uuid4()
+    r = client.get(f'/api/v3/reservations/statistics?from=2030-01-01&to=2030-02-01&granularity=DAY&room_id={room_id}&room_id={room_id}')
+    assert r.status_code == 200
+    assert calls == [([room_id], date(2030, 1, 1), date(2030, 2, 1), "day")]
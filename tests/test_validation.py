@@ -0,0 +1,106 @@
+import uuid
+from datetime import date
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from app.config import Config
+from app.validation import LIST_QUERY, RESERVATION_PROTOTYPE, ValidationError
+
+
+class FailingQuery:
+    def __getattr__(self, name):
+        raise AssertionError("database must not be queried for invalid input")
+
+
+class FailingModel:
+    query = FailingQuery()
+
+
+def test_prototype_parses_values():
+    room_id = uuid.uuid4()
+    values = RESERVATION_PROTOTYPE.validate({"room_id": str(room_id), "from": "2030-01-01", "to": "2030-01-03T00:00:00"})
+    assert values == {"room_id": room_id, "from": date(2030, 1, 1), "to": date(2030, 1, 3)}
+
+
+@pytest.mark.parametrize("data, message, detail", [
+    (None, "Invalid Input", "expected a JSON object"),
+    ({"from": "2030-01-01", "to": "2030-01-02"}, "Invalid Input", "'room_id' is required"),
+    ({"room_id": "x", "from": "2030-01-01", "to": "2030-01-02"}, "Invalid Input", "'room_id':"),
+    ({"room_id": str(uuid.uuid4()), "from": 20300101, "to": "2030-01-02"}, "Invalid Input", "'from': expected an ISO date string"),
+    ({"room_id": str(uuid.uuid4()), "from": "2030-01-02", "to": "2030-01-02"}, "From must be before To", "'from' date must be before 'to' date"),
+])
+def test_prototype_errors(data, message, detail):
+    with pytest.raises(ValidationError) as e:
+        RESERVATION_PROTOTYPE.validate(data)
+    assert e.value.message == message
+    assert e.value.more_info.startswith(detail)
+
+
+def test_list_query_defaults():
+    assert LIST_QUERY.validate({}) == {"include_deleted": False, "room_id": None, "id": None, "before": None, "after": None}
+    assert LIST_QUERY.validate({"include_deleted": "TRUE", "room_id": ""})["include_deleted"] is True
+
+
+def test_list_query_many_values(monkeypatch):
+    a, b = uuid.uuid4(), uuid.uuid4()
+    args = MultiDict([("room_id", str(a)), ("room_id", str(b)), ("room_id", str(a)), ("id", str(b))])
+    values = LIST_QUERY.validate(args)
+    assert values["room_id"] == [a, b]
+    assert values["id"] == [b]
+
+    # JSON-Body der Suche: Arrays oder Einzelwerte
+    values = LIST_QUERY.validate({"room_id": str(a), "id": [str(a), str(b)]})
+    assert values["room_id"] == [a] and values["id"] == [a, b]
+
+    with pytest.raises(ValidationError) as e:
+        LIST_QUERY.validate({"id": [str(a), 5]})
+    assert e.value.more_info.startswith("'id': expected a UUID string")
+
+    monkeypatch.setattr(Config, "REQUEST_MAX_VALUES", 1)
+    with pytest.raises(ValidationError) as e:
+        LIST_QUERY.validate({"id": [str(a), str(b)]})
+    assert e.value.more_info == "'id': at most 1 values are allowed"
+
+
+def test_list_rejects_invalid_filters_before_db(monkeypatch, client):
+    from app import routes
+
+    monkeypatch.setattr(routes, "read_session", lambda: FailingQuery())
+    r = client.get('/api/v3/reservations/reservations?room_id=not-a-uuid')
+    assert r.status_code == 400
+    body = r.get_json()
+    assert body["errors"][0]["code"] == "bad_request"
+    assert body["errors"][0]["more_info"].startswith("'room_id':")
+
+    r = client.get('/api/v3/reservations/reservations?after=yesterday')
+    assert r.status_code == 400
+
+
+def test_put_rejects_invalid_body_before_db_and_auth(monkeypatch, client):
+    from app import routes
+
+    monkeypatch.setattr(routes, "Reservation", FailingModel)
+    url = f'/api/v3/reservations/reservations/{uuid.uuid4()}'
+
+    r = client.put(url, json={"room_id": str(uuid.uuid4()), "from": "2030-01-05", "to": "2030-01-01"})
+    assert r.status_code == 400
+    assert r.get_json()["errors"][0]["message"] == "From must be before To"
+
+    r = client.put(url, json={"deleted_at": None, "from": "2030-01-01"})
+    assert r.status_code == 400
+    assert r.get_json()["errors"][0]["message"] == "Prototype required to restore (room_id, from, to)"
+
+    r = client.put(url, data="not json", content_type="text/plain")
+    assert r.status_code == 400
+    assert r.get_json()["errors"][0]["more_info"] == "expected a JSON object"
+
+
+@pytest.mark.parametrize("body", [[1, 2], {"id": ["not-a-uuid"]}, {"room_id": {"a": 1}}])
+def test_search_rejects_invalid_body_before_db(monkeypatch, client, body):
+    from app import routes
+
+    monkeypatch.setattr(routes, "read_session", lambda: FailingQuery())
+    r = client.post('/api/v3/reservations/reservations/search', json=body)
+    assert r.status_code == 400
+    assert r.get_json()["errors"][0]["code"] == "bad_request"